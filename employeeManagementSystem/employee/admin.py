@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Employee, Task, LeaveRequest
+from .models import Employee, Task, LeaveRequest, DepartmentStats, AttendanceMonthlySummary
 
 
 @admin.register(Employee)
@@ -21,5 +21,34 @@ class EmployeeAdmin(admin.ModelAdmin):
 	list_filter = ('department', 'position')
 
 
-admin.site.register(Task)
-admin.site.register(LeaveRequest)
\ No newline at end of file
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+	list_display = ('title', 'assigned_to', 'deadline', 'complete')
+	# Task.__str__ and the assigned_to column read the employee; join it once
+	list_select_related = ('assigned_to',)
+
+
+@admin.register(LeaveRequest)
+class LeaveRequestAdmin(admin.ModelAdmin):
+	list_display = ('employee', 'leave_type', 'start_date', 'end_date', 'status')
+	list_select_related = ('employee',)
+
+
+@admin.register(DepartmentStats)
+class DepartmentStatsAdmin(admin.ModelAdmin):
+	list_display = (
+		'department',
+		'headcount',
+		'active_tasks',
+		'completed_tasks',
+		'pending_leave',
+		'approved_leave',
+		'total_salary',
+	)
+
+
+@admin.register(AttendanceMonthlySummary)
+class AttendanceMonthlySummaryAdmin(admin.ModelAdmin):
+	list_display = ('employee', 'month', 'days_present', 'days_absent', 'days_on_leave', 'late_arrivals', 'total_hours')
+	list_filter = ('month',)
+	list_select_related = ('employee',)
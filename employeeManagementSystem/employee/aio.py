@@ -0,0 +1,3 @@
+async def alist(qs):
+    """Evaluate a queryset from async code; the counterpart of list(qs)."""
+    return [obj async for obj in qs]
@@ -0,0 +1,92 @@
+import asyncio
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .aio import alist
+from .models import Employee, DepartmentStats, LeaveRequest, Task
+
+ANALYTICS_CACHE_KEY = "employee:analytics_snapshot"
+ANALYTICS_CACHE_TTL = getattr(settings, "ANALYTICS_CACHE_TTL", 300)
+
+
+FLAG_COUNTS = {
+    "overdue": Count("id", filter=Q(overdue_state="overdue")),
+    "escalated": Count("id", filter=Q(overdue_state="escalated")),
+}
+
+
+def _snapshot_queries(today):
+    """The independent reads behind a snapshot, in the order _assemble() takes them."""
+    return (
+        DepartmentStats.objects.order_by("-headcount", "department"),
+        Employee.objects.values("position").annotate(count=Count("id")).order_by("-count"),
+        LeaveRequest.objects.active_on(today).values("employee").distinct(),
+        # Flags and counters written by `manage.py sweep_tasks`
+        Task.objects.filter(complete=False).exclude(overdue_state=""),
+        Employee.objects.filter(overdue_task_count__gt=0)
+        .order_by("-overdue_task_count", "id")
+        .values("id", "full_name", "department", "overdue_task_count")[:10],
+    )
+
+
+def _assemble(departments, position_distribution, on_leave_today, flagged, most_overdue):
+    totals = {
+        field: sum(getattr(stats, field) for stats in departments)
+        for field in ("headcount", "active_tasks", "completed_tasks", "pending_leave", "approved_leave")
+    }
+    return {
+        "employee_count": totals["headcount"],
+        "active_tasks": totals["active_tasks"],
+        "completed_tasks": totals["completed_tasks"],
+        "pending_leave": totals["pending_leave"],
+        "approved_leave": totals["approved_leave"],
+        "on_leave_today": on_leave_today,
+        "overdue_tasks": flagged["overdue"],
+        "escalated_tasks": flagged["escalated"],
+        "most_overdue": most_overdue,
+        "department_distribution": [
+            {"department": stats.department, "count": stats.headcount}
+            for stats in departments if stats.headcount > 0
+        ],
+        "position_distribution": position_distribution,
+    }
+
+
+def compute_snapshot():
+    """Build the admin analytics counters from the per-department stats table."""
+    departments, positions, on_leave, flagged, most_overdue = _snapshot_queries(timezone.localdate())
+    return _assemble(
+        list(departments), list(positions), on_leave.count(), flagged.aggregate(**FLAG_COUNTS), list(most_overdue),
+    )
+
+
+async def acompute_snapshot():
+    """compute_snapshot() for async views."""
+    departments, positions, on_leave, flagged, most_overdue = _snapshot_queries(timezone.localdate())
+    return _assemble(*await asyncio.gather(
+        alist(departments), alist(positions), on_leave.acount(), flagged.aaggregate(**FLAG_COUNTS), alist(most_overdue),
+    ))
+
+
+def get_snapshot():
+    """Return the cached analytics snapshot, rebuilding it when missing or expired."""
+    snapshot = cache.get(ANALYTICS_CACHE_KEY)
+    if snapshot is None:
+        snapshot = compute_snapshot()
+        cache.set(ANALYTICS_CACHE_KEY, snapshot, ANALYTICS_CACHE_TTL)
+    return snapshot
+
+
+async def aget_snapshot():
+    snapshot = await cache.aget(ANALYTICS_CACHE_KEY)
+    if snapshot is None:
+        snapshot = await acompute_snapshot()
+        await cache.aset(ANALYTICS_CACHE_KEY, snapshot, ANALYTICS_CACHE_TTL)
+    return snapshot
+
+
+def invalidate_snapshot():
+    cache.delete(ANALYTICS_CACHE_KEY)
@@ -0,0 +1,276 @@
+import hashlib
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .models import Attendance, Employee, LeaveRequest, LeaveRequestQuerySet, Task
+from .pagination import keyset_page
+
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+
+
+class ApiError(Exception):
+    """A bad request parameter; the message is returned to the client with a 400."""
+
+
+def _bool(value):
+    lowered = value.lower()
+    if lowered in ("1", "true", "yes"):
+        return True
+    if lowered in ("0", "false", "no"):
+        return False
+    raise ValueError(value)
+
+
+def _choice(model, name):
+    allowed = {value for value, _ in model._meta.get_field(name).choices}
+
+    def parse(value):
+        if value not in allowed:
+            raise ValueError(value)
+        return value
+    return parse
+
+
+@dataclass(frozen=True)
+class Resource:
+    """A read-only API collection.
+
+    `fields` maps public names to values() paths; `filters` maps query parameters
+    to (lookup or queryset method, parser). Non-staff users only see rows where
+    `owner` is themselves.
+    """
+    model: type
+    fields: dict
+    default_fields: tuple
+    filters: dict = field(default_factory=dict)
+    owner: str = "pk"
+
+    def queryset(self, user):
+        qs = self.model._default_manager.order_by("id")
+        if not user.is_staff:
+            qs = qs.filter(**{self.owner: user.pk})
+        return qs
+
+
+RESOURCES = {
+    "employees": Resource(
+        Employee,
+        fields={
+            name: name for name in (
+                "id", "employee_id", "full_name", "email", "gender", "position", "department",
+                "employment_date", "date_of_birth", "phone_number", "address", "salary", "salary_currency",
+                "date_joined", "updated_at",
+            )
+        },
+        default_fields=("id", "employee_id", "full_name", "email", "department", "position", "updated_at"),
+        filters={
+            "department": ("department", str),
+            "position": ("position", str),
+            "employee_id": ("employee_id", str),
+        },
+    ),
+    "tasks": Resource(
+        Task,
+        fields={
+            "id": "id",
+            "title": "title",
+            "description": "description",
+            "assigned_to": "assigned_to",
+            "assigned_to_employee_id": "assigned_to__employee_id",
+            "assigned_to_name": "assigned_to__full_name",
+            "assigned_date": "assigned_date",
+            "deadline": "deadline",
+            "complete": "complete",
+            "overdue_state": "overdue_state",
+            "updated_at": "updated_at",
+        },
+        default_fields=("id", "title", "assigned_to", "deadline", "complete", "overdue_state", "updated_at"),
+        filters={
+            "assigned_to": ("assigned_to", int),
+            "employee_id": ("assigned_to__employee_id", str),
+            "complete": ("complete", _bool),
+            "overdue_state": ("overdue_state", _choice(Task, "overdue_state")),
+            "deadline_after": ("deadline__gte", date.fromisoformat),
+            "deadline_before": ("deadline__lte", date.fromisoformat),
+        },
+        owner="assigned_to",
+    ),
+    "leave-requests": Resource(
+        LeaveRequest,
+        fields={
+            "id": "id",
+            "employee": "employee",
+            "employee_id": "employee__employee_id",
+            "employee_name": "employee__full_name",
+            "leave_type": "leave_type",
+            "status": "status",
+            "start_date": "start_date",
+            "end_date": "end_date",
+            "reason": "reason",
+            "applied_on": "applied_on",
+            "updated_at": "updated_at",
+        },
+        default_fields=("id", "employee", "leave_type", "status", "start_date", "end_date", "updated_at"),
+        filters={
+            "employee": ("employee", int),
+            "employee_id": ("employee__employee_id", str),
+            "status": ("status", _choice(LeaveRequest, "status")),
+            "leave_type": ("leave_type", _choice(LeaveRequest, "leave_type")),
+            "active_on": (LeaveRequestQuerySet.active_on, date.fromisoformat),
+            "start_after": ("start_date__gte", date.fromisoformat),
+            "start_before": ("start_date__lte", date.fromisoformat),
+        },
+        owner="employee",
+    ),
+    "attendance": Resource(
+        Attendance,
+        fields={
+            "id": "id",
+            "employee": "employee",
+            "employee_id": "employee__employee_id",
+            "date": "date",
+            "status": "status",
+            "check_in": "check_in",
+            "check_out": "check_out",
+            "remarks": "remarks",
+            "updated_at": "updated_at",
+        },
+        default_fields=("id", "employee", "date", "status", "check_in", "check_out", "updated_at"),
+        filters={
+            "employee": ("employee", int),
+            "employee_id": ("employee__employee_id", str),
+            "status": ("status", _choice(Attendance, "status")),
+            "date": ("date", date.fromisoformat),
+            "date_from": ("date__gte", date.fromisoformat),
+            "date_to": ("date__lte", date.fromisoformat),
+        },
+        owner="employee",
+    ),
+}
+
+
+def parse_fields(resource, raw):
+    """Public field names requested with ?fields=a,b (the resource defaults if empty)."""
+    if not raw:
+        return list(resource.default_fields)
+    names = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in names if name not in resource.fields]
+    if unknown:
+        raise ApiError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(resource.fields)}")
+    return list(dict.fromkeys(names))
+
+
+def filter_queryset(resource, qs, params):
+    for param, (lookup, parse) in resource.filters.items():
+        raw = params.get(param)
+        if raw is None or raw == "":
+            continue
+        try:
+            value = parse(raw)
+        except ValueError:
+            raise ApiError(f"Bad value for {param}: {raw!r}")
+        qs = lookup(qs, value) if callable(lookup) else qs.filter(**{lookup: value})
+    return qs
+
+
+def _page_size(params):
+    try:
+        size = int(params.get("limit", API_PAGE_SIZE))
+    except ValueError:
+        raise ApiError("limit must be an integer")
+    return min(max(size, 1), API_MAX_PAGE_SIZE)
+
+
+def _stamp_paths(resource, names):
+    """values() paths whose values change whenever the projected fields can.
+
+    Fields read through a relation (e.g. assigned_to__full_name) change with
+    the related row, so its updated_at is part of the stamp too.
+    """
+    related = {resource.fields[name].split("__")[0] for name in names if "__" in resource.fields[name]}
+    return ["id", "updated_at", *(f"{relation}__updated_at" for relation in sorted(related))]
+
+
+def _validators(names, stamps):
+    """(ETag, last modified) for a representation built from `stamps` [(id, updated_at, *related updated_at)]."""
+    digest = hashlib.md5(repr((names, stamps)).encode(), usedforsecurity=False).hexdigest()
+    last_modified = max((updated for stamp in stamps for updated in stamp[1:] if updated), default=None)
+    # HTTP dates have whole-second precision
+    return f'"{digest}"', last_modified and int(last_modified.timestamp())
+
+
+def _rows(resource, qs, names):
+    # Plain dicts straight from values(), renamed to the public field names
+    paths = [resource.fields[name] for name in names]
+    return [{name: row[path] for name, path in zip(names, paths)} for row in qs.values(*paths)]
+
+
+def _respond(data, etag, last_modified):
+    response = JsonResponse(data)
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    # Clients may keep the response but must revalidate it each time
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _not_modified(request, etag, last_modified):
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if isinstance(response, HttpResponseNotModified):
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    return None
+
+
+def list_response(request, resource):
+    """One keyset page of `resource` as JSON: {"results": [...], "next": url, "previous": url}.
+
+    The page's ids and updated_at stamps are read first (a narrow query); if
+    they match the client's ETag the rows themselves are never fetched.
+    """
+    params = request.GET
+    names = parse_fields(resource, params.get("fields"))
+    qs = filter_queryset(resource, resource.queryset(request.user), params)
+    paths = _stamp_paths(resource, names)
+    page = keyset_page(qs.values(*paths), _page_size(params), params.get("cursor"))
+    stamps = [tuple(row[path] for path in paths) for row in page]
+    etag, last_modified = _validators((names, page.next_cursor is not None), stamps)
+
+    not_modified = _not_modified(request, etag, last_modified)
+    if not_modified:
+        return not_modified
+
+    results = _rows(resource, qs.filter(pk__in=[stamp[0] for stamp in stamps]), names) if stamps else []
+
+    def link(cursor):
+        if cursor is None:
+            return None
+        query = params.copy()
+        query["cursor"] = cursor
+        return f"{request.path}?{query.urlencode()}"
+
+    data = {"results": results, "next": link(page.next_cursor), "previous": link(page.previous_cursor)}
+    return _respond(data, etag, last_modified)
+
+
+def detail_response(request, resource, pk):
+    names = parse_fields(resource, request.GET.get("fields"))
+    qs = resource.queryset(request.user).filter(pk=pk)
+    stamp = qs.values_list(*_stamp_paths(resource, names)).first()
+    if stamp is None:
+        return JsonResponse({"error": "Not found"}, status=404)
+    etag, last_modified = _validators(names, [stamp])
+
+    not_modified = _not_modified(request, etag, last_modified)
+    if not_modified:
+        return not_modified
+    rows = _rows(resource, qs, names)
+    if not rows:  # deleted since the stamp was read
+        return JsonResponse({"error": "Not found"}, status=404)
+    return _respond(rows[0], etag, last_modified)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class EmployeeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'employee'
+
+    def ready(self):
+        # Register signal handlers
+        from . import signals  # noqa: F401
@@ -0,0 +1,139 @@
+import heapq
+from dataclasses import dataclass, field
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from . import dashboard, department_stats, profiles
+from .analytics import invalidate_snapshot
+from .models import MAX_ACTIVE_TASKS, Employee, Task
+
+
+@dataclass
+class AssignmentResult:
+    tasks: list = field(default_factory=list)
+    at_capacity: list = field(default_factory=list)  # employee_ids that were skipped
+    unassigned: list = field(default_factory=list)  # tasks nobody had room for
+
+    @property
+    def created(self):
+        return len(self.tasks)
+
+
+def assign_to_department(department, title, description, deadline):
+    """Give every member of `department` with spare capacity a copy of one task.
+
+    Members are locked and filtered on active_task_count in one query, the
+    tasks go in with a single bulk_create, and the counters move with a single
+    UPDATE, so the cost doesn't grow in queries with the department's size.
+    """
+    result = AssignmentResult()
+    with transaction.atomic():
+        members = list(
+            Employee.objects.select_for_update()
+            .filter(department=department)
+            .order_by("id")
+            .values_list("id", "employee_id", "active_task_count")
+        )
+        assignees = [pk for pk, _, active in members if active < MAX_ACTIVE_TASKS]
+        result.at_capacity = [employee_id for _, employee_id, active in members if active >= MAX_ACTIVE_TASKS]
+        if not assignees:
+            return result
+
+        result.tasks = Task.objects.bulk_create(
+            Task(assigned_to_id=pk, title=title, description=description, deadline=deadline)
+            for pk in assignees
+        )
+        record_assignments(assignees, {department: len(assignees)})
+    return result
+
+
+def balance(tasks, members, capacity=MAX_ACTIVE_TASKS):
+    """Pair tasks with members in memory, least-loaded first.
+
+    `members` is [(pk, open_tasks, nearest_open_deadline or None)]. Tasks are
+    handed out earliest deadline first, each to the member with the fewest open
+    tasks; ties go to whoever has the least urgent work already (no open task,
+    then the latest nearest deadline). Members at `capacity` get nothing more.
+    Returns ([(task, pk)], unassigned_tasks). O((T + M) log M).
+    """
+    def entry(pk, load, nearest):
+        return (load, -nearest.toordinal() if nearest else float("-inf"), pk, nearest)
+
+    heap = [entry(*member) for member in members if member[1] < capacity]
+    heapq.heapify(heap)
+    pairs, unassigned = [], []
+    for task in sorted(tasks, key=lambda task: task.deadline):
+        if not heap:
+            unassigned.append(task)
+            continue
+        load, _, pk, nearest = heapq.heappop(heap)
+        pairs.append((task, pk))
+        if load + 1 < capacity:
+            nearest = min(nearest, task.deadline) if nearest else task.deadline
+            heapq.heappush(heap, entry(pk, load + 1, nearest))
+    return pairs, unassigned
+
+
+def schedule_tasks(department, tasks, capacity=MAX_ACTIVE_TASKS):
+    """Spread unsaved Task objects across `department`, balancing open load.
+
+    Reads every member's open-task count and nearest open deadline in one
+    query (locking the rows), balances in memory, then writes all tasks with
+    one bulk_create, all in a single transaction.
+    """
+    tasks = list(tasks)
+    result = AssignmentResult()
+    with transaction.atomic():
+        members = list(
+            Employee.objects.select_for_update(of=("self",))
+            .filter(department=department)
+            # A correlated subquery rather than a JOIN + GROUP BY, which FOR UPDATE doesn't allow
+            .annotate(nearest=Subquery(
+                Task.objects.filter(assigned_to=OuterRef("pk"), complete=False)
+                .order_by("deadline").values("deadline")[:1]
+            ))
+            .values_list("id", "active_task_count", "nearest")
+        )
+        pairs, result.unassigned = balance(tasks, members, capacity)
+        for task, pk in pairs:
+            task.assigned_to_id = pk
+        result.tasks = Task.objects.bulk_create([task for task, _ in pairs])
+        if pairs:
+            record_assignments([pk for _, pk in pairs], {department: len(pairs)})
+    return result
+
+
+def record_assignments(employee_ids, per_department):
+    """Bookkeeping for tasks created with bulk_create, which skips the Task signals.
+
+    `employee_ids` has one entry per new task; `per_department` counts them by department.
+    """
+    by_count = {}
+    for pk in employee_ids:
+        by_count[pk] = by_count.get(pk, 0) + 1
+    for amount in set(by_count.values()):
+        Employee.objects.filter(pk__in=[pk for pk, n in by_count.items() if n == amount]).update(
+            active_task_count=F("active_task_count") + amount
+        )
+    department_stats.apply_change({}, {dept: {"active_tasks": n} for dept, n in per_department.items() if n})
+    for pk in by_count:
+        dashboard.bump_version(pk)
+    profiles.invalidate_profile(*by_count)
+    invalidate_snapshot()
+
+
+def rebuild_active_task_counts(apps=global_apps):
+    """Recompute Employee.active_task_count from the Task table."""
+    Employee = apps.get_model("employee", "Employee")
+    Task = apps.get_model("employee", "Task")
+    active = (
+        Task.objects.filter(assigned_to=OuterRef("pk"), complete=False)
+        .order_by()
+        .values("assigned_to")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    return Employee.objects.update(active_task_count=Coalesce(Subquery(active), 0))
@@ -0,0 +1,278 @@
+import atexit
+import datetime
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, connections, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from . import attendance_rollup
+from .models import Attendance, LeaveRequest
+
+logger = logging.getLogger(__name__)
+
+ATTENDANCE_FLUSH_INTERVAL_MS = getattr(settings, "ATTENDANCE_FLUSH_INTERVAL_MS", 500)
+ATTENDANCE_FLUSH_SIZE = getattr(settings, "ATTENDANCE_FLUSH_SIZE", 500)
+# Flushes a swipe may fail (database unavailable, say) before it is dropped
+ATTENDANCE_MAX_ATTEMPTS = getattr(settings, "ATTENDANCE_MAX_ATTEMPTS", 20)
+
+
+class AttendanceWriter:
+    """Buffer badge swipes in memory and write them as multi-row upserts.
+
+    Swipes for the same (employee, date) are coalesced: the earliest check-in and
+    the latest check-out win. The buffer is flushed by a background thread every
+    `interval_ms`, or straight away once it holds `max_records` keys.
+
+    If a batch fails it is retried row by row, so one bad swipe can't hold up
+    the rest. Rows the database rejects (an employee deleted since the swipe)
+    are logged and dropped; other failures are retried up to `max_attempts`
+    flushes.
+
+    Setting `threaded` to False stops the background flushes; the caller then
+    calls flush() itself.
+    """
+    threaded = True
+
+    def __init__(
+        self, interval_ms=ATTENDANCE_FLUSH_INTERVAL_MS, max_records=ATTENDANCE_FLUSH_SIZE,
+        max_attempts=ATTENDANCE_MAX_ATTEMPTS,
+    ):
+        self.interval = interval_ms / 1000
+        self.max_records = max_records
+        self.max_attempts = max_attempts
+        self._buffer = {}  # (employee_id, date) -> {"check_in": time, "check_out": time}
+        self._attempts = {}  # (employee_id, date) -> failed flushes so far
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def record(self, employee_id, when, kind):
+        """Queue a 'check_in' or 'check_out' swipe at datetime `when` (local time)."""
+        key = (employee_id, when.date())
+        value = when.time().replace(microsecond=0)
+        with self._lock:
+            _merge(self._buffer.setdefault(key, {}), {kind: value})
+            full = len(self._buffer) >= self.max_records
+        self._ensure_thread()
+        if full:
+            self._wakeup.set()
+
+    def pending(self):
+        with self._lock:
+            return len(self._buffer)
+
+    def flush(self):
+        """Write everything buffered so far; returns the number of rows upserted."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, {}
+            if not batch:
+                return 0
+            try:
+                with transaction.atomic():
+                    _upsert(dict(batch))
+            except Exception:
+                logger.warning("Attendance batch of %d failed; retrying row by row", len(batch), exc_info=True)
+                return self._flush_rows(batch)
+            with self._lock:
+                for key in batch:
+                    self._attempts.pop(key, None)
+            return len(batch)
+
+    def _flush_rows(self, batch):
+        written, retry = 0, {}
+        for key, entry in batch.items():
+            try:
+                with transaction.atomic():
+                    _upsert({key: dict(entry)})
+            except (IntegrityError, DataError):
+                logger.error("Dropping attendance swipe %s for employee %s on %s", entry, *key, exc_info=True)
+                retry[key] = None
+            except Exception:
+                retry[key] = entry
+            else:
+                written += 1
+                retry[key] = None
+
+        with self._lock:
+            for key, entry in retry.items():
+                attempts = self._attempts.pop(key, 0) + 1
+                if entry is None:
+                    continue
+                if attempts >= self.max_attempts:
+                    logger.error(
+                        "Dropping attendance swipe %s for employee %s on %s after %d attempts", entry, *key, attempts,
+                    )
+                    continue
+                # Put the swipe back so the next flush retries it
+                self._attempts[key] = attempts
+                _merge(self._buffer.setdefault(key, {}), entry)
+        return written
+
+    def _ensure_thread(self):
+        if not self.threaded or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="attendance-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if not self.threaded:
+                continue
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Attendance flush failed; will retry")
+            finally:
+                connections.close_all()
+
+
+def _merge(entry, other):
+    for kind, value in other.items():
+        current = entry.get(kind)
+        if current is None or (value < current if kind == "check_in" else value > current):
+            entry[kind] = value
+
+
+def _stored(keys):
+    # Times already stored for the (employee_id, date) pairs in `keys`
+    existing = Q()
+    by_date = defaultdict(list)
+    for employee_id, day in keys:
+        by_date[day].append(employee_id)
+    for day, employee_ids in by_date.items():
+        existing |= Q(date=day, employee_id__in=employee_ids)
+    return Attendance.objects.filter(existing).values_list("employee_id", "date", "check_in", "check_out")
+
+
+def _upsert(batch):
+    # Fold in times already stored so an earlier check-in isn't pushed later
+    # and a check-out-only swipe doesn't wipe the morning's check-in.
+    for employee_id, day, check_in, check_out in _stored(batch):
+        stored = {kind: value for kind, value in (("check_in", check_in), ("check_out", check_out)) if value}
+        _merge(stored, batch[(employee_id, day)])
+        batch[(employee_id, day)] = stored
+
+    # Rows are grouped by which columns they set, so each upsert only overwrites those
+    groups = defaultdict(list)
+    for (employee_id, day), entry in batch.items():
+        fields = tuple(sorted(entry))
+        groups[fields].append(Attendance(employee_id=employee_id, date=day, status="Present", **entry))
+    for fields, rows in groups.items():
+        update_fields = list(fields) + (["status"] if "check_in" in fields else []) + ["updated_at"]
+        Attendance.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["employee", "date"],
+            update_fields=update_fields,
+        )
+
+
+def _leave_days(leave):
+    day = leave.start_date
+    while day <= leave.end_date:
+        yield day
+        day += datetime.timedelta(days=1)
+
+
+def _leave_filter(leaves):
+    q = Q()
+    for leave in leaves:
+        q |= Q(employee_id=leave.employee_id, date__range=(leave.start_date, leave.end_date))
+    return q
+
+
+def _leave_remark(leave):
+    return f"{leave.get_leave_type_display().title()} leave"
+
+
+# What apply_leave() writes into remarks; anything else is a note someone added
+LEAVE_REMARKS = {f"{label.title()} leave" for _, label in LeaveRequest.LEAVE_TYPE}
+
+
+def apply_leave(leaves):
+    """Mark every day of the given approved leave requests 'On Leave' in one upsert.
+
+    Check-in/out times and remarks already recorded for those days are kept.
+    """
+    leaves = list(leaves)
+    rows = {}
+    for leave in leaves:
+        for day in _leave_days(leave):
+            rows[(leave.employee_id, day)] = Attendance(
+                employee_id=leave.employee_id,
+                date=day,
+                status="On Leave",
+                remarks=_leave_remark(leave),
+            )
+    if not rows:
+        return 0
+    noted = set(
+        Attendance.objects.filter(_leave_filter(leaves))
+        .exclude(remarks__isnull=True).exclude(remarks="").exclude(remarks__in=LEAVE_REMARKS)
+        .values_list("employee_id", "date")
+    )
+    for keep_remarks, update_fields in ((False, ["status", "remarks", "updated_at"]), (True, ["status", "updated_at"])):
+        group = [row for key, row in rows.items() if (key in noted) == keep_remarks]
+        if group:
+            Attendance.objects.bulk_create(
+                group,
+                update_conflicts=True,
+                unique_fields=["employee", "date"],
+                update_fields=update_fields,
+            )
+    return len(rows)
+
+
+def revoke_leave(leaves):
+    """Undo apply_leave() for leave requests that are no longer approved.
+
+    Days another approved leave still covers stay 'On Leave'. Of the rest,
+    days the employee still swiped in on go back to 'Present' and the others
+    are removed. Returns the number of rows deleted.
+    """
+    leaves = list(leaves)
+    if not leaves:
+        return 0
+    on_leave = Attendance.objects.filter(_leave_filter(leaves), status="On Leave")
+    overlapping = Q()
+    for leave in leaves:
+        overlapping |= Q(employee_id=leave.employee_id, start_date__lte=leave.end_date, end_date__gte=leave.start_date)
+    still_approved = list(
+        LeaveRequest.objects.filter(overlapping, status="Approved").exclude(pk__in=[leave.pk for leave in leaves])
+        .only("employee_id", "start_date", "end_date")
+    )
+    if still_approved:
+        on_leave = on_leave.exclude(_leave_filter(still_approved))
+
+    on_leave.filter(check_in__isnull=False).update(
+        status="Present",
+        # Only clear the remark apply_leave() wrote, not a note added since
+        remarks=Case(When(remarks__in=LEAVE_REMARKS, then=Value(None)), default=F("remarks")),
+        updated_at=timezone.now(),
+    )
+    unswiped = on_leave.filter(check_in__isnull=True)
+    removed = list(unswiped.values_list("employee_id", "date"))
+    if removed:
+        unswiped.delete()
+        # The incremental rollup can't see deleted rows
+        attendance_rollup.refresh(removed)
+    return len(removed)
+
+
+writer = AttendanceWriter()
+
+
+@atexit.register
+def _flush_on_exit():
+    if writer.pending():
+        writer.flush()
@@ -0,0 +1,157 @@
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Max, Q, Sum
+from django.utils import timezone
+
+from .models import Attendance, AttendanceMonthlySummary, Employee
+
+ATTENDANCE_LATE_AFTER = getattr(settings, "ATTENDANCE_LATE_AFTER", datetime.time(9, 0))
+ROLLUP_CHUNK_SIZE = 500
+
+SUMMARY_FIELDS = ["days_present", "days_absent", "days_on_leave", "late_arrivals", "total_hours", "computed_at"]
+# Django's week_day lookup: 1 is Sunday, 7 is Saturday
+WORKING_WEEK_DAYS = (2, 3, 4, 5, 6)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def month_end(month):
+    return (month + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
+
+
+def working_days(start, end):
+    """Monday-to-Friday days from `start` to `end` inclusive."""
+    return sum((start + datetime.timedelta(days=n)).weekday() < 5 for n in range((end - start).days + 1))
+
+
+def last_run():
+    """Start time of the newest rollup run, or None if nothing has been rolled up yet."""
+    return AttendanceMonthlySummary.objects.aggregate(last=Max("computed_at"))["last"]
+
+
+def _changed_rows(since):
+    qs = Attendance.objects.all()
+    if since is not None:
+        qs = qs.filter(updated_at__gte=since)
+    # order_by() drops Meta.ordering so the updated_at index drives the scan
+    return qs.order_by().values_list("employee_id", "date").distinct()
+
+
+def changed_months(since=None):
+    """{month: {employee_id, ...}} for attendance rows written after `since` (everything if None)."""
+    changed = defaultdict(set)
+    for employee_id, day in _changed_rows(since).iterator(chunk_size=2000):
+        changed[month_start(day)].add(employee_id)
+    return changed
+
+
+def summarize(month, employee_ids, computed_at, today=None):
+    """Aggregate one month of attendance for `employee_ids` into unsaved summary rows.
+
+    Nothing records an absence, so days absent are the working days from the
+    employment date up to yesterday that have neither a swipe nor leave.
+    """
+    today = today or timezone.localdate()
+    # Today only counts against anyone once it's over
+    last_day = min(month_end(month), today - datetime.timedelta(days=1))
+    worked = ExpressionWrapper(F("check_out") - F("check_in"), output_field=DurationField())
+    rows = (
+        Attendance.objects.filter(employee_id__in=employee_ids, date__range=(month, month_end(month)))
+        .values("employee_id")
+        .annotate(
+            days_present=Count("id", filter=Q(status="Present")),
+            days_accounted=Count("id", filter=Q(
+                status__in=("Present", "On Leave"),
+                date__lte=last_day,
+                date__gte=F("employee__employment_date"),
+                date__week_day__in=WORKING_WEEK_DAYS,
+            )),
+            days_on_leave=Count("id", filter=Q(status="On Leave")),
+            late_arrivals=Count("id", filter=Q(status="Present", check_in__gt=ATTENDANCE_LATE_AFTER)),
+            worked=Sum(worked, filter=Q(check_in__isnull=False, check_out__gt=F("check_in"))),
+        )
+    )
+    summaries = {}
+    for employee_id, employed in Employee.objects.filter(pk__in=employee_ids).values_list("id", "employment_date"):
+        summaries[employee_id] = AttendanceMonthlySummary(
+            employee_id=employee_id, month=month, computed_at=computed_at, total_hours=Decimal("0.00"),
+            days_absent=working_days(max(month, employed), last_day),
+        )
+    for row in rows:
+        summary = summaries[row["employee_id"]]
+        summary.days_present = row["days_present"]
+        summary.days_absent = max(0, summary.days_absent - row["days_accounted"])
+        summary.days_on_leave = row["days_on_leave"]
+        summary.late_arrivals = row["late_arrivals"]
+        if row["worked"]:
+            hours = Decimal(row["worked"].total_seconds()) / 3600
+            summary.total_hours = hours.quantize(Decimal("0.01"))
+    return list(summaries.values())
+
+
+def rollup(full=False, today=None):
+    """Recompute monthly summaries for the (employee, month) pairs whose attendance changed.
+
+    Only attendance written since the previous run is read, so a nightly run
+    touches a day's worth of rows. Absences pile up without any rows being
+    written, so every month that was still open at the previous run is also
+    recomputed for all active employees. Deleted attendance is only noticed by
+    a `full` run, which also drops summaries with nothing left behind them.
+    Returns the number of summary rows written.
+    """
+    computed_at = timezone.now()
+    today = today or timezone.localdate()
+    since = None if full else last_run()
+    changed = changed_months(since)
+    month = month_start(timezone.localdate(since)) if since else min(changed, default=month_start(today))
+    while month <= today:
+        changed[month].update(
+            Employee.objects.filter(is_active=True, employment_date__lte=month_end(month)).values_list("id", flat=True)
+        )
+        month = month_end(month) + datetime.timedelta(days=1)
+
+    written = 0
+    for month, employee_ids in sorted(changed.items()):
+        employee_ids = sorted(employee_ids)
+        for i in range(0, len(employee_ids), ROLLUP_CHUNK_SIZE):
+            summaries = summarize(month, employee_ids[i:i + ROLLUP_CHUNK_SIZE], computed_at, today)
+            with transaction.atomic():
+                AttendanceMonthlySummary.objects.bulk_create(
+                    summaries,
+                    update_conflicts=True,
+                    unique_fields=["employee", "month"],
+                    update_fields=SUMMARY_FIELDS,
+                )
+            written += len(summaries)
+    if full:
+        AttendanceMonthlySummary.objects.filter(computed_at__lt=computed_at).delete()
+    return written
+
+
+def refresh(pairs):
+    """Recompute existing summaries for (employee_id, day) pairs straight away.
+
+    Used after attendance rows are deleted, which the incremental rollup can't
+    see. `computed_at` is left alone so the rollup watermark doesn't move.
+    """
+    by_month = defaultdict(set)
+    for employee_id, day in pairs:
+        by_month[month_start(day)].add(employee_id)
+    fields = [field for field in SUMMARY_FIELDS if field != "computed_at"]
+    for month, employee_ids in by_month.items():
+        existing = dict(
+            AttendanceMonthlySummary.objects.filter(month=month, employee_id__in=employee_ids)
+            .values_list("employee_id", "id")
+        )
+        if not existing:
+            continue
+        summaries = summarize(month, sorted(existing), computed_at=None)
+        for summary in summaries:
+            summary.pk = existing[summary.employee_id]
+        AttendanceMonthlySummary.objects.bulk_update(summaries, fields)
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .models import Employee
+
+# Kept short: with a per-process cache, a save in one worker only clears that
+# worker's copy and the others catch up when their entry expires
+AUTH_USER_CACHE_TTL = getattr(settings, "AUTH_USER_CACHE_TTL", 60)
+# What request.user needs for login checks, templates and the admin. The
+# password hash is kept so the session auth hash can still be verified.
+AUTH_USER_FIELDS = (
+    "password", "last_login", "is_superuser", "is_staff", "is_active", "email",
+    "first_name", "last_name", "full_name", "employee_id",
+)
+
+
+def _user_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def invalidate_user(user_id):
+    """Drop the cached request.user; called when an employee is saved or deleted."""
+    cache.delete(_user_key(user_id))
+
+
+def _slim_users():
+    return Employee._default_manager.only(*AUTH_USER_FIELDS)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend that serves get_user() from the cache.
+
+    Every authenticated request resolves request.user; this keeps a slim
+    Employee (AUTH_USER_FIELDS only) in the cache so that costs no query.
+    Anything else read off request.user is loaded on first access.
+    """
+
+    def get_user(self, user_id):
+        key = _user_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = _slim_users().filter(pk=user_id).first()
+            if user is None:
+                return None
+            cache.set(key, user, AUTH_USER_CACHE_TTL)
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        key = _user_key(user_id)
+        user = await cache.aget(key)
+        if user is None:
+            user = await _slim_users().filter(pk=user_id).afirst()
+            if user is None:
+                return None
+            await cache.aset(key, user, AUTH_USER_CACHE_TTL)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,409 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection, transaction
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from . import attendance, reports
+from .models import Attendance, Employee, LeaveRequest, Task
+from .perfdata import PERF_ADMIN_EMAIL
+from .querybudget import get_query_budget
+from .urls import urlpatterns
+
+PERCENTILES = (50, 90, 95, 99)
+PDF_RENDER_TIMEOUT = 120
+
+
+@dataclass
+class Endpoint:
+    name: str
+    path: str
+    method: str = "get"
+    data: str = None  # request body, already encoded
+    content_type: str = None
+    anonymous: bool = False  # login/logout/register pages
+    writes: bool = False  # run inside a transaction that is rolled back
+
+
+@dataclass
+class Timings:
+    durations: list = field(default_factory=list)  # seconds
+    queries: list = field(default_factory=list)
+    statuses: set = field(default_factory=set)
+
+
+def percentile(values, p):
+    """Linear-interpolated percentile of a sorted, non-empty list."""
+    k = (len(values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def _count_queries(captured):
+    # Savepoints come from running writes inside our rollback transaction, not from the view
+    return sum(
+        1 for query in captured
+        if not query["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT"))
+    )
+
+
+def _host():
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != "*" and not host.startswith(".")]
+    if "*" in settings.ALLOWED_HOSTS or not hosts:
+        return "testserver"
+    return "localhost" if "localhost" in hosts else hosts[0]
+
+
+def prepare_pdf_report():
+    """Render the employee PDF up front so the status/download views have a finished job."""
+    job_id = reports.request_employee_report()
+    deadline = time.monotonic() + PDF_RENDER_TIMEOUT
+    while reports.job_status(job_id) == "running" and time.monotonic() < deadline:
+        time.sleep(0.2)
+    return job_id
+
+
+def endpoints(user):
+    """One Endpoint per URL name in employee.urls, with targets taken from the seeded data.
+
+    Returns (endpoints, {url name: reason}) for URLs that could not be built.
+    """
+    employee = Employee.objects.exclude(pk=user.pk).order_by("id").first() or user
+    task = Task.objects.filter(complete=False).order_by("id").first()
+    pending = list(LeaveRequest.objects.filter(status="Pending").order_by("id").values_list("id", flat=True)[:50])
+    swipes = list(Employee.objects.order_by("id").values_list("employee_id", flat=True)[:50])
+    month = timezone.localdate().strftime("%Y-%m")
+    prefix = (employee.full_name or "a")[:3]
+    job_id = prepare_pdf_report()
+    leave_id = LeaveRequest.objects.order_by("id").values_list("id", flat=True).first()
+    attendance_id = Attendance.objects.order_by("id").values_list("id", flat=True).first()
+
+    builders = {
+        "login": lambda: Endpoint("login", reverse("login"), anonymous=True),
+        "logout": lambda: Endpoint("logout", reverse("logout"), anonymous=True),
+        "register": lambda: Endpoint("register", reverse("register"), anonymous=True),
+        "complete_task": task and (lambda: Endpoint(
+            "complete_task", reverse("complete_task", args=[task.pk]), method="post", writes=True,
+        )),
+        "employee_autocomplete": lambda: Endpoint(
+            "employee_autocomplete", reverse("employee_autocomplete") + f"?q={prefix}",
+        ),
+        "update-leave": pending and (lambda: Endpoint(
+            "update-leave", reverse("update-leave", args=[pending[0], "approve"]), writes=True,
+        )),
+        "bulk-update-leave": pending and (lambda: Endpoint(
+            "bulk-update-leave", reverse("bulk-update-leave"), method="post",
+            data=json.dumps({"ids": pending, "action": "approve"}), content_type="application/json",
+            writes=True,
+        )),
+        "employee_detail": lambda: Endpoint("employee_detail", reverse("employee_detail", args=[employee.pk])),
+        "delete_employee": lambda: Endpoint("delete_employee", reverse("delete_employee", args=[employee.pk])),
+        "update_employee": lambda: Endpoint("update_employee", reverse("update_employee", args=[employee.pk])),
+        "export_pdf_status": lambda: Endpoint("export_pdf_status", reverse("export_pdf_status", args=[job_id])),
+        "export_pdf_download": lambda: Endpoint(
+            "export_pdf_download", reverse("export_pdf_download", args=[job_id]),
+        ),
+        "attendance_check_in": lambda: Endpoint(
+            "attendance_check_in", reverse("attendance_check_in"), method="post",
+            data=json.dumps({"swipes": [{"employee_id": badge} for badge in swipes]}),
+            content_type="application/json",
+        ),
+        "attendance_check_out": lambda: Endpoint(
+            "attendance_check_out", reverse("attendance_check_out"), method="post",
+            data=json.dumps({"swipes": [{"employee_id": badge} for badge in swipes]}),
+            content_type="application/json",
+        ),
+        "attendance_report": lambda: Endpoint("attendance_report", reverse("attendance_report") + f"?month={month}"),
+        "attendance_report_csv": lambda: Endpoint(
+            "attendance_report_csv", reverse("attendance_report_csv") + f"?month={month}",
+        ),
+        "api_employee_detail": lambda: Endpoint("api_employee_detail", reverse("api_employee_detail", args=[employee.pk])),
+        "api_task_detail": task and (lambda: Endpoint("api_task_detail", reverse("api_task_detail", args=[task.pk]))),
+        "api_leave_detail": leave_id and (lambda: Endpoint("api_leave_detail", reverse("api_leave_detail", args=[leave_id]))),
+        "api_attendance_detail": attendance_id and (lambda: Endpoint(
+            "api_attendance_detail", reverse("api_attendance_detail", args=[attendance_id]),
+        )),
+    }
+
+    found, skipped = [], {}
+    for pattern in urlpatterns:
+        name = pattern.name
+        if name in builders:
+            if builders[name]:
+                found.append(builders[name]())
+            else:
+                skipped[name] = "no suitable rows in the database"
+        elif pattern.pattern.regex.groups:
+            skipped[name] = "needs URL arguments; add it to benchmark.endpoints()"
+        else:
+            found.append(Endpoint(name, reverse(name)))
+    # Writes go last: even rolled back, they bump cache versions the read views depend on
+    found.sort(key=lambda endpoint: endpoint.writes)
+    return found, skipped
+
+
+def _request(client, endpoint):
+    kwargs = {}
+    if endpoint.data is not None:
+        kwargs = {"data": endpoint.data, "content_type": endpoint.content_type}
+    with CaptureQueriesContext(connection) as captured:
+        started = time.perf_counter()
+        if endpoint.writes:
+            with transaction.atomic():
+                response = getattr(client, endpoint.method)(endpoint.path, **kwargs)
+                transaction.set_rollback(True)
+        else:
+            response = getattr(client, endpoint.method)(endpoint.path, **kwargs)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        elapsed = time.perf_counter() - started
+    response.close()
+    return elapsed, _count_queries(captured), response.status_code
+
+
+def run(requests=20, user_email=PERF_ADMIN_EMAIL, only=None):
+    """Time every employee URL `requests` times through the test client.
+
+    The first request to each URL is reported separately as `cold_ms` (empty
+    caches); percentiles cover the rest. Write endpoints are rolled back after
+    each request, except the attendance swipes, which are idempotent upserts.
+    """
+    user = Employee.objects.get(email=user_email)
+    client, anonymous = (Client(HTTP_HOST=_host(), raise_request_exception=False) for _ in range(2))
+    # Log in before endpoints() renders the PDF report, so nothing the login
+    # writes can expire it
+    client.force_login(user)
+    found, skipped = endpoints(user)
+    if only:
+        found = [endpoint for endpoint in found if endpoint.name in only]
+
+    views = {}
+    # Swipes are written here, between requests, rather than by the writer's
+    # thread racing the next request for the database (SQLite locks the file)
+    attendance.writer.threaded = False
+    try:
+        # Budgets are reported, not enforced, while benchmarking
+        with override_settings(QUERY_BUDGET_RAISE=False):
+            for endpoint in found:
+                browser = anonymous if endpoint.anonymous else client
+                cold_ms, cold_queries, cold_status = _request(browser, endpoint)
+                attendance.writer.flush()
+                timings = Timings()
+                for _ in range(requests):
+                    elapsed, queries, status = _request(browser, endpoint)
+                    attendance.writer.flush()
+                    timings.durations.append(elapsed)
+                    timings.queries.append(queries)
+                    timings.statuses.add(status)
+                views[endpoint.name] = summarize(endpoint, cold_ms, cold_queries, timings)
+                statuses = sorted(timings.statuses | {cold_status})
+                views[endpoint.name]["status"] = statuses
+                if statuses[-1] >= 400:
+                    # Timings of an error page say nothing about the view
+                    views[endpoint.name]["error"] = f"returned HTTP {statuses[-1]}"
+    finally:
+        attendance.writer.threaded = True
+
+    return {
+        "meta": {
+            "database": connection.vendor,
+            "requests": requests,
+            "user": user_email,
+            "date": date.today().isoformat(),
+            "dataset": {
+                "employees": Employee.objects.count(),
+                "tasks": Task.objects.count(),
+                "leave_requests": LeaveRequest.objects.count(),
+            },
+        },
+        "views": views,
+        "skipped": skipped,
+    }
+
+
+def summarize(endpoint, cold_seconds, cold_queries, timings):
+    durations = sorted(timings.durations)
+    queries = sorted(timings.queries)
+    result = {
+        "method": endpoint.method.upper(),
+        "path": endpoint.path,
+        "query_budget": get_query_budget(resolve(endpoint.path.split("?")[0]).func),
+        "cold_ms": round(cold_seconds * 1000, 2),
+        "cold_queries": cold_queries,
+    }
+    if durations:
+        result.update({f"p{p}_ms": round(percentile(durations, p) * 1000, 2) for p in PERCENTILES})
+        result.update({
+            "mean_ms": round(sum(durations) / len(durations) * 1000, 2),
+            "max_ms": round(durations[-1] * 1000, 2),
+            "queries_median": percentile(queries, 50),
+            "queries_max": queries[-1],
+        })
+    return result
+
+
+def compare(baseline, current):
+    """Rows of (view, old p50, new p50, old p95, new p95, old queries, new queries) for views in both runs."""
+    rows = []
+    for name, new in current["views"].items():
+        old = baseline["views"].get(name)
+        if old is None or "p50_ms" not in old or "p50_ms" not in new or "error" in old or "error" in new:
+            continue
+        rows.append((
+            name, old["p50_ms"], new["p50_ms"], old["p95_ms"], new["p95_ms"],
+            old["queries_median"], new["queries_median"],
+        ))
+    return rows
+
+
+# The views converted to async; what bench_concurrency requests
+ASYNC_VIEWS = ("dashboard", "employee_list", "employee_detail", "analytics")
+
+
+class InFlight:
+    """Track how many requests are being served at once."""
+
+    def __init__(self):
+        self.current = self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.current -= 1
+
+
+def _concurrency_result(mode, durations, statuses, wall, peak):
+    durations.sort()
+    return {
+        "mode": mode,
+        "requests": len(durations),
+        "wall_s": round(wall, 3),
+        "requests_per_s": round(len(durations) / wall, 1),
+        "peak_in_flight": peak,
+        "p50_ms": round(percentile(durations, 50) * 1000, 1),
+        "p95_ms": round(percentile(durations, 95) * 1000, 1),
+        "status": sorted(set(statuses)),
+    }
+
+
+def run_wsgi(paths, cookies, total, threads, client_delay):
+    """Serve `total` requests through WSGIHandler with `threads` workers, like one gunicorn process.
+
+    Each response is held for `client_delay` seconds after the body is produced,
+    standing in for a slow client reading it; a sync worker can't serve anyone
+    else meanwhile.
+    """
+    handler = WSGIHandler()
+    factory = RequestFactory(HTTP_HOST=_host(), HTTP_COOKIE=cookies)
+    in_flight = InFlight()
+
+    def serve(i):
+        environ = factory.get(paths[i % len(paths)]).environ
+        status = []
+        started = time.perf_counter()
+        with in_flight:
+            body = handler(environ, lambda s, headers, exc_info=None: status.append(s))
+            try:
+                for _ in body:
+                    pass
+                time.sleep(client_delay)
+            finally:
+                body.close()
+        return time.perf_counter() - started, int(status[0].split()[0])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(serve, range(total)))
+    wall = time.perf_counter() - started
+    return _concurrency_result(
+        f"wsgi ({threads} thread{'s' if threads > 1 else ''})",
+        [d for d, _ in results], [s for _, s in results], wall, in_flight.peak,
+    )
+
+
+def run_asgi(paths, cookies, total, clients, client_delay):
+    """Serve `total` requests through ASGIHandler from `clients` concurrent connections on one event loop.
+
+    The slow client is modelled the same way as in run_wsgi(): the final body
+    send takes `client_delay` seconds, but here it only suspends the request.
+    """
+    handler = ASGIHandler()
+    host = _host().encode()
+    in_flight = InFlight()
+
+    async def serve(i):
+        path, _, query = paths[i % len(paths)].partition("?")
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+            "root_path": "", "headers": [(b"host", host), (b"cookie", cookies.encode())],
+            "client": ("127.0.0.1", 50000 + i % 10000), "server": ("testserver", 80),
+        }
+        request_sent = False
+        status = []
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Nothing more from the client; Django cancels this wait when the response is done
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+            elif not message.get("more_body"):
+                await asyncio.sleep(client_delay)
+
+        started = time.perf_counter()
+        with in_flight:
+            await handler(scope, receive, send)
+        return time.perf_counter() - started, status[0]
+
+    async def main():
+        gate = asyncio.Semaphore(clients)
+
+        async def client(i):
+            async with gate:
+                return await serve(i)
+
+        return await asyncio.gather(*(client(i) for i in range(total)))
+
+    started = time.perf_counter()
+    results = asyncio.run(main())
+    wall = time.perf_counter() - started
+    return _concurrency_result(
+        f"asgi ({clients} clients)", [d for d, _ in results], [s for _, s in results], wall, in_flight.peak,
+    )
+
+
+def concurrency_targets(user):
+    """Paths for ASYNC_VIEWS and a session cookie for `user`."""
+    client = Client(HTTP_HOST=_host())
+    client.force_login(user)
+    employee = Employee.objects.exclude(pk=user.pk).order_by("id").first() or user
+    paths = [
+        reverse(name, args=[employee.pk]) if name == "employee_detail" else reverse(name)
+        for name in ASYNC_VIEWS
+    ]
+    cookies = "; ".join(f"{name}={morsel.value}" for name, morsel in client.cookies.items())
+    return paths, cookies
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from .aio import alist
+from .models import Task, LeaveRequest
+
+DASHBOARD_CACHE_TTL = getattr(settings, "DASHBOARD_CACHE_TTL", 60)
+# Overdue tasks stay on the dashboard this long past their deadline, then the
+# sweeper escalates them
+OVERDUE_GRACE_DAYS = 3
+# Rejected leaves are highlighted, then hidden, after this long
+REJECTED_VISIBLE_DAYS = 3
+
+
+def _version_key(user_id):
+    return f"dashboard:version:{user_id}"
+
+
+def bump_version(user_id):
+    """Invalidate a user's cached dashboard; called when their tasks or leaves change."""
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), time.time_ns(), None)
+
+
+def _dashboard_key(user_id, version, today):
+    # The date is part of the key so buckets roll over at midnight
+    return f"dashboard:{user_id}:{version}:{today.isoformat()}"
+
+
+def load_dashboard(user):
+    """Task and leave buckets for the dashboard, cached per user."""
+    today = timezone.now().date()
+    version = cache.get_or_set(_version_key(user.pk), time.time_ns, None)
+    key = _dashboard_key(user.pk, version, today)
+    data = cache.get(key)
+    if data is None:
+        data = build_dashboard(user.pk, today)
+        cache.set(key, data, DASHBOARD_CACHE_TTL)
+    return data
+
+
+async def aload_dashboard(user):
+    """load_dashboard() for async views."""
+    today = timezone.now().date()
+    version = await cache.aget_or_set(_version_key(user.pk), time.time_ns, None)
+    key = _dashboard_key(user.pk, version, today)
+    data = await cache.aget(key)
+    if data is None:
+        data = await abuild_dashboard(user.pk, today)
+        await cache.aset(key, data, DASHBOARD_CACHE_TTL)
+    return data
+
+
+def _open_tasks(user_id):
+    # Escalated tasks are past the grace window and followed up by admins, so
+    # they are left off the dashboard
+    return Task.objects.filter(
+        assigned_to_id=user_id, complete=False
+    ).exclude(overdue_state='escalated').order_by('deadline', 'id')
+
+
+def _visible_leaves(user_id):
+    # All visible leaves (expired rejections excluded)
+    rejected_cutoff = timezone.now() - timedelta(days=REJECTED_VISIBLE_DAYS)
+    return LeaveRequest.objects.filter(employee_id=user_id).exclude(
+        Q(status='Rejected') & Q(updated_at__lt=rejected_cutoff)
+    )
+
+
+def _buckets(open_tasks, leave_requests, today):
+    # One query for both task buckets, split on the flag set by `manage.py sweep_tasks`
+    # (or a deadline that slipped since the last sweep)
+    tasks, overdue_tasks = [], []
+    for task in open_tasks:
+        late = task.overdue_state == 'overdue' or task.deadline < today
+        (overdue_tasks if late else tasks).append(task)
+    return {
+        'tasks': tasks,
+        'overdue_tasks': overdue_tasks,
+        'leave_requests': leave_requests,
+        # Recent rejections are a subset of the visible leaves
+        'recent_rejected_leaves': [leave for leave in leave_requests if leave.status == 'Rejected'],
+    }
+
+
+def build_dashboard(user_id, today):
+    return _buckets(_open_tasks(user_id), list(_visible_leaves(user_id)), today)
+
+
+async def abuild_dashboard(user_id, today):
+    open_tasks, leave_requests = await asyncio.gather(
+        alist(_open_tasks(user_id)), alist(_visible_leaves(user_id)),
+    )
+    return _buckets(open_tasks, leave_requests, today)
@@ -0,0 +1,97 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+COUNTER_FIELDS = ("headcount", "active_tasks", "completed_tasks", "pending_leave", "approved_leave", "total_salary")
+LEAVE_COUNTERS = {"Pending": "pending_leave", "Approved": "approved_leave"}
+
+
+def employee_contribution(department, salary):
+    return {department: {"headcount": 1, "total_salary": salary}}
+
+
+def task_contribution(department, complete):
+    return {department: {"completed_tasks" if complete else "active_tasks": 1}}
+
+
+def leave_contribution(department, status):
+    field = LEAVE_COUNTERS.get(status)
+    return {department: {field: 1}} if field else {}
+
+
+def apply_change(old, new):
+    """Move a row's contribution from `old` to `new` ({department: {field: amount}})."""
+    deltas = defaultdict(lambda: defaultdict(int))
+    for department, fields in old.items():
+        for field, amount in fields.items():
+            deltas[department][field] -= amount
+    for department, fields in new.items():
+        for field, amount in fields.items():
+            deltas[department][field] += amount
+
+    for department, fields in deltas.items():
+        updates = {field: F(field) + amount for field, amount in fields.items() if amount}
+        if updates:
+            apply_delta(department, **updates)
+
+
+def apply_delta(department, **updates):
+    from .models import DepartmentStats
+
+    # Incrementing with F() keeps concurrent writers from overwriting each other
+    DepartmentStats.objects.get_or_create(department=department or "")
+    DepartmentStats.objects.filter(department=department or "").update(**updates)
+
+
+def employee_workload(employee_id, department):
+    """Task and leave counters an employee carries with them between departments."""
+    from .models import Task, LeaveRequest
+
+    tasks = Task.objects.filter(assigned_to_id=employee_id).aggregate(
+        active_tasks=Count("id", filter=Q(complete=False)),
+        completed_tasks=Count("id", filter=Q(complete=True)),
+    )
+    leaves = LeaveRequest.objects.filter(employee_id=employee_id).aggregate(
+        pending_leave=Count("id", filter=Q(status="Pending")),
+        approved_leave=Count("id", filter=Q(status="Approved")),
+    )
+    return {department: {**tasks, **leaves}}
+
+
+def rebuild(apps=global_apps):
+    """Recompute every department's counters from scratch."""
+    Employee = apps.get_model("employee", "Employee")
+    Task = apps.get_model("employee", "Task")
+    LeaveRequest = apps.get_model("employee", "LeaveRequest")
+    DepartmentStats = apps.get_model("employee", "DepartmentStats")
+
+    stats = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+    for row in Employee.objects.values("department").annotate(
+        headcount=Count("id"), total_salary=Sum("salary")
+    ):
+        stats[row["department"]].update(headcount=row["headcount"], total_salary=row["total_salary"])
+    for row in Task.objects.values("assigned_to__department").annotate(
+        active_tasks=Count("id", filter=Q(complete=False)),
+        completed_tasks=Count("id", filter=Q(complete=True)),
+    ):
+        stats[row["assigned_to__department"]].update(
+            active_tasks=row["active_tasks"], completed_tasks=row["completed_tasks"]
+        )
+    for row in LeaveRequest.objects.values("employee__department").annotate(
+        pending_leave=Count("id", filter=Q(status="Pending")),
+        approved_leave=Count("id", filter=Q(status="Approved")),
+    ):
+        stats[row["employee__department"]].update(
+            pending_leave=row["pending_leave"], approved_leave=row["approved_leave"]
+        )
+
+    with transaction.atomic():
+        DepartmentStats.objects.all().delete()
+        DepartmentStats.objects.bulk_create(
+            DepartmentStats(department=department, **{**counters, "total_salary": counters["total_salary"] or Decimal("0")})
+            for department, counters in stats.items()
+        )
+    return len(stats)
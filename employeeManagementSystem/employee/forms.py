@@ -1,7 +1,10 @@
+import codecs
+
 from django import forms
 from django.forms import ModelForm
+from django.urls import reverse
 from django.contrib.auth.forms import UserCreationForm
-from .models import Employee, Task, LeaveRequest
+from .models import Employee, Task, LeaveRequest, DepartmentStats
 from django.utils import timezone
 from datetime import timedelta
 
@@ -42,10 +45,42 @@ class EmployeeCreationForm(UserCreationForm):
         if commit:
             user.save()
         return user
+class EmployeeAutocompleteWidget(forms.Widget):
+    """Hidden employee pk plus a search box that queries `employee_autocomplete` as you type."""
+    template_name = 'employee/widgets/employee_autocomplete.html'
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['url'] = reverse('employee_autocomplete')
+        context['widget']['label'] = ''
+        if value:
+            # Only the selected employee is looked up, never the whole table
+            employee = Employee.objects.filter(pk=value).values('full_name', 'employee_id').first()
+            if employee:
+                context['widget']['label'] = f"{employee['full_name']} ({employee['employee_id']})"
+        return context
+
+
+class EmployeeChoiceField(forms.ModelChoiceField):
+    """ModelChoiceField that never renders its choices; the submitted pk is checked with one lookup."""
+    widget = EmployeeAutocompleteWidget
+
+    def __init__(self, queryset=None, **kwargs):
+        super().__init__(Employee.objects.all() if queryset is None else queryset, **kwargs)
+
+
+def validate_deadline(deadline):
+    """Reject deadlines before today; shared by the single and bulk task forms."""
+    if deadline < timezone.localdate():
+        raise forms.ValidationError("The deadline can't be in the past.")
+    return deadline
+
+
 class TaskForm(ModelForm):
     class Meta:
         model = Task
         fields = ['assigned_to','title', 'description', 'deadline', 'complete' ]
+        field_classes = {'assigned_to': EmployeeChoiceField}
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -54,6 +89,10 @@ class TaskForm(ModelForm):
             field.widget.attrs.update({
                 "class": "w-full px-3 py-2 border border-gray-300 rounded focus:ring-blue-500 focus:border-blue-500 mb-3"
             })
+
+    def clean_deadline(self):
+        return validate_deadline(self.cleaned_data['deadline'])
+
     widgets = {
             'deadline': forms.DateInput(attrs={
                 'type': 'date',
@@ -61,7 +100,67 @@ class TaskForm(ModelForm):
             })
         }        
 
+class BulkTaskAssignmentForm(forms.Form):
+    department = forms.ChoiceField(choices=())
+    title = forms.CharField(max_length=100)
+    description = forms.CharField(widget=forms.Textarea)
+    deadline = forms.DateField(widget=forms.DateInput(attrs={'type': 'date'}))
+    copies = forms.IntegerField(
+        required=False, min_value=1,
+        help_text="Leave blank to give every member a copy, or spread this many copies over the least-loaded members.",
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['department'].choices = [
+            (dept, dept) for dept in
+            DepartmentStats.objects.filter(headcount__gt=0).order_by('department').values_list('department', flat=True)
+        ]
+        for field in self.fields.values():
+            field.widget.attrs.update({
+                "class": "w-full px-3 py-2 border border-gray-300 rounded focus:ring-blue-500 focus:border-blue-500 mb-3"
+            })
+
+    def clean_deadline(self):
+        return validate_deadline(self.cleaned_data['deadline'])
+
+
+class EmployeeImportForm(forms.Form):
+    file = forms.FileField(
+        help_text="CSV or JSON Lines file with Employee field names as columns.",
+        widget=forms.ClearableFileInput(attrs={
+            "accept": ".csv,.jsonl,.json,.ndjson",
+            "class": "w-full px-3 py-2 border border-gray-300 rounded focus:ring-blue-500 focus:border-blue-500 mb-3"
+        }),
+    )
+
+    def clean_file(self):
+        # Check the whole file decodes before any rows are imported
+        upload = self.cleaned_data['file']
+        decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        try:
+            for chunk in upload.chunks():
+                decoder.decode(chunk)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            raise forms.ValidationError("The file must be UTF-8 encoded text.")
+        upload.seek(0)
+        return upload
+
+
 MAX_LEAVES_PER_MONTH = 2
+def monthly_leave_requests(employee, today):
+    """Leave requests `employee` applied for in the month containing `today`."""
+    month_start = today.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    # A date range rather than __month/__year so (employee, applied_on) is usable
+    return LeaveRequest.objects.filter(
+        employee=employee,
+        applied_on__gte=month_start,
+        applied_on__lt=next_month,
+    )
+
+
 class LeaveRequestForm(ModelForm):
     class Meta:
         model = LeaveRequest
@@ -78,14 +177,7 @@ class LeaveRequestForm(ModelForm):
         if not self.employee:
             return cleaned_data
 
-        today = timezone.now().date()
-        month_start = today.replace(day=1)
-
-        monthly_leave_count = LeaveRequest.objects.filter(
-            employee=self.employee,
-            applied_on__month=timezone.now().month,
-            applied_on__year=timezone.now().year
-        ).count()
+        monthly_leave_count = monthly_leave_requests(self.employee, timezone.now().date()).count()
 
         if monthly_leave_count >= MAX_LEAVES_PER_MONTH:
             raise forms.ValidationError(
@@ -0,0 +1,70 @@
+from django.db import connection, transaction
+from django.db.models import F
+
+EMPLOYEE_ID_PREFIX = "EMP"
+# Postgres sequence created by migration 0009; nextval() never blocks and is not rolled back
+EMPLOYEE_ID_SEQUENCE = "employee_employee_id_seq"
+EMPLOYEE_ID_COUNTER = "employee_id"
+
+
+def format_employee_id(num):
+    return f"{EMPLOYEE_ID_PREFIX}{num:04d}"
+
+
+def parse_employee_id(employee_id):
+    """Numeric part of an `EMP0001`-style ID, or None for anything else."""
+    if employee_id and employee_id.startswith(EMPLOYEE_ID_PREFIX):
+        try:
+            return int(employee_id[len(EMPLOYEE_ID_PREFIX):])
+        except ValueError:
+            return None
+    return None
+
+
+def allocate_employee_ids(count):
+    """Reserve `count` unique employee IDs in the `EMP0001` format."""
+    if count <= 0:
+        return []
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                [EMPLOYEE_ID_SEQUENCE, count],
+            )
+            return [format_employee_id(row[0]) for row in cursor.fetchall()]
+    return [format_employee_id(num) for num in _allocate_from_counter(count)]
+
+
+def next_employee_id():
+    return allocate_employee_ids(1)[0]
+
+
+def _allocate_from_counter(count):
+    # Fallback for backends without sequences (SQLite in development/tests): bump a
+    # single counter row with F() so only that row is locked, never the Employee table.
+    from .models import IdCounter
+
+    with transaction.atomic():
+        IdCounter.objects.get_or_create(name=EMPLOYEE_ID_COUNTER)
+        IdCounter.objects.filter(name=EMPLOYEE_ID_COUNTER).update(value=F("value") + count)
+        last = IdCounter.objects.filter(name=EMPLOYEE_ID_COUNTER).values_list("value", flat=True).get()
+    return range(last - count + 1, last + 1)
+
+
+def legacy_next_employee_id():
+    """The previous allocator: lock the newest employee row and parse its ID.
+
+    Only kept so `manage.py bench_employee_ids` can compare against it. Must be
+    called inside transaction.atomic() together with the INSERT.
+    """
+    from .models import Employee
+
+    last_emp = Employee.objects.select_for_update().order_by('-id').first()
+    if last_emp and last_emp.employee_id and last_emp.employee_id.startswith('EMP'):
+        try:
+            num = int(last_emp.employee_id.replace('EMP', '')) + 1
+        except ValueError:
+            num = last_emp.id + 1
+    else:
+        num = 1
+    return format_employee_id(num)
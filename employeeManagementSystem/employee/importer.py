@@ -0,0 +1,222 @@
+import csv
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from . import department_stats
+from .analytics import invalidate_snapshot
+from .ids import allocate_employee_ids
+from .models import Employee
+
+IMPORT_FIELDS = (
+    "full_name",
+    "email",
+    "gender",
+    "date_of_birth",
+    "employment_date",
+    "phone_number",
+    "address",
+    "department",
+    "position",
+)
+IMPORT_BATCH_SIZE = getattr(settings, "IMPORT_BATCH_SIZE", 1000)
+IMPORT_HASH_WORKERS = getattr(settings, "IMPORT_HASH_WORKERS", None)
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    errors: list = field(default_factory=list)  # (line number, message)
+
+
+def read_records(stream, fmt):
+    """Yield (line number, dict) pairs from a CSV or JSON Lines text stream."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == "jsonl":
+        for line_num, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                record = exc
+            yield line_num, record
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def detect_format(filename):
+    return "jsonl" if os.path.splitext(filename)[1].lower() in (".jsonl", ".json", ".ndjson") else "csv"
+
+
+def _choice_lookup(model_field):
+    # Accept either the stored value or the display label, case-insensitively
+    lookup = {}
+    for value, label in model_field.choices or ():
+        lookup[str(value).lower()] = value
+        lookup[str(label).lower()] = value
+    return lookup
+
+
+class RowValidator:
+    def __init__(self):
+        self.fields = {name: Employee._meta.get_field(name) for name in IMPORT_FIELDS}
+        self.choices = {name: _choice_lookup(f) for name, f in self.fields.items() if f.choices}
+        self.instance = Employee()
+
+    def clean(self, record):
+        """Return model field values for one record or raise ValidationError."""
+        if not isinstance(record, dict):
+            raise ValidationError("Row is not a JSON object")
+        values, errors = {}, []
+        for name, model_field in self.fields.items():
+            raw = record.get(name)
+            raw = raw.strip() if isinstance(raw, str) else raw
+            if raw in (None, ""):
+                if model_field.has_default():
+                    values[name] = model_field.get_default()
+                    continue
+                raw = None if model_field.null else ""
+            if name in self.choices and raw:
+                raw = self.choices[name].get(str(raw).lower(), raw)
+            try:
+                values[name] = model_field.clean(raw, self.instance)
+            except ValidationError as exc:
+                errors.append(f"{name}: {' '.join(exc.messages)}")
+        if errors:
+            raise ValidationError(errors)
+        values["email"] = Employee.objects.normalize_email(values["email"])
+        return values, record.get("password") or None
+
+
+def _hash_passwords(passwords, pool):
+    # PBKDF2 is deliberately slow; spread it over processes. Rows without a
+    # password get an unusable one, which costs nothing to "hash".
+    to_hash = [(i, pw) for i, pw in enumerate(passwords) if pw]
+    hashed = [make_password(None)] * len(passwords)
+    if not to_hash:
+        return hashed
+    if pool is None or len(to_hash) == 1:
+        results = map(make_password, (pw for _, pw in to_hash))
+    else:
+        results = pool.map(make_password, (pw for _, pw in to_hash), chunksize=16)
+    for (i, _), value in zip(to_hash, results):
+        hashed[i] = value
+    return hashed
+
+
+def _write_batch(line_nums, employees, result):
+    try:
+        with transaction.atomic():
+            Employee.objects.bulk_create(employees)
+        return employees
+    except IntegrityError:
+        pass
+    # Something in the batch collided (e.g. an email registered meanwhile);
+    # fall back to per-row savepoints so one bad row doesn't sink the rest.
+    written = []
+    for line_num, employee in zip(line_nums, employees):
+        try:
+            with transaction.atomic():
+                Employee.objects.bulk_create([employee])
+            written.append(employee)
+        except IntegrityError as exc:
+            result.errors.append((line_num, f"database: {exc}"))
+    return written
+
+
+def import_employees(stream, fmt, batch_size=IMPORT_BATCH_SIZE, hash_workers=IMPORT_HASH_WORKERS):
+    """Validate and insert employees from `stream` chunk by chunk.
+
+    Invalid rows are reported in the result and skipped; valid rows are still written.
+    Pass hash_workers=0 to hash passwords in-process.
+    """
+    pool = ProcessPoolExecutor(max_workers=hash_workers) if hash_workers != 0 else None
+    try:
+        return _import(stream, fmt, batch_size, pool)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def _import(stream, fmt, batch_size, pool):
+    result = ImportResult()
+    validator = RowValidator()
+    seen_emails = set()
+    records = read_records(stream, fmt)
+
+    while True:
+        chunk = list(islice(records, batch_size))
+        if not chunk:
+            break
+
+        rows = []
+        for line_num, record in chunk:
+            if isinstance(record, Exception):
+                result.errors.append((line_num, f"invalid JSON: {record}"))
+                continue
+            try:
+                values, password = validator.clean(record)
+            except ValidationError as exc:
+                result.errors.append((line_num, "; ".join(exc.messages)))
+                continue
+            if values["email"].lower() in seen_emails:
+                result.errors.append((line_num, "email: duplicated earlier in the file"))
+                continue
+            seen_emails.add(values["email"].lower())
+            rows.append((line_num, values, password))
+
+        # One lookup per chunk for addresses that are already registered, in
+        # any letter case
+        existing = set(
+            Employee.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=[values["email"].lower() for _, values, _ in rows])
+            .values_list("email_lower", flat=True)
+        )
+        fresh = []
+        for row in rows:
+            if row[1]["email"].lower() in existing:
+                result.errors.append((row[0], "email: an employee with this email already exists"))
+            else:
+                fresh.append(row)
+        if not fresh:
+            continue
+
+        employee_ids = allocate_employee_ids(len(fresh))
+        passwords = _hash_passwords([password for _, _, password in fresh], pool)
+        employees = [
+            Employee(employee_id=employee_id, password=password, **values)
+            for (_, values, _), employee_id, password in zip(fresh, employee_ids, passwords)
+        ]
+        written = _write_batch([line_num for line_num, _, _ in fresh], employees, result)
+        result.created += len(written)
+        _record_stats(written)
+
+    result.errors.sort()
+    return result
+
+
+def _record_stats(employees):
+    # bulk_create skips post_save, so apply what the signal handlers would have
+    if not employees:
+        return
+    headcount, salary = Counter(), Counter()
+    for employee in employees:
+        headcount[employee.department] += 1
+        salary[employee.department] += employee.salary
+    department_stats.apply_change(
+        {}, {dept: {"headcount": headcount[dept], "total_salary": salary[dept]} for dept in headcount}
+    )
+    invalidate_snapshot()
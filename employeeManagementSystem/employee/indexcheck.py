@@ -0,0 +1,105 @@
+import re
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+
+from . import analytics, attendance, attendance_rollup, dashboard, overdue, views
+from .forms import monthly_leave_requests
+from .models import Employee, Task
+from .pagination import cursor_after, page_query
+
+# Full scans in each backend's plan output. SQLite reports "SCAN t USING INDEX i"
+# when it walks a whole index (often just to honour Meta.ordering); that's only
+# acceptable for an ORDER BY ... LIMIT page.
+SEQ_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)()"),
+    "sqlite": re.compile(r"\bSCAN (\w+)( USING (?:COVERING )?INDEX)?"),
+}
+# Queries only a partial index can serve. SQLite can't match a partial index
+# against bound parameters (status = ?), so these are only checked on PostgreSQL.
+PARTIAL_INDEX_QUERIES = {"leave_approve pending", "on leave today", "sweep clear"}
+
+
+def _view_queryset(view_class, **params):
+    # A ListView's own get_queryset() for a request with `params` in the query string
+    request = HttpRequest()
+    request.GET = QueryDict(mutable=True)
+    request.GET.update(params)
+    view = view_class()
+    view.setup(request)
+    return view.get_queryset()
+
+
+def _first_page(qs, per_page):
+    return page_query(qs, per_page)
+
+
+def _second_page(qs, per_page):
+    # Page 2 of a keyset walk, i.e. the row-value comparison on top of the ordering
+    fields = [str(field).lstrip("-") for field in qs.query.order_by]
+    first = qs.values_list(*fields).first() or [0] * len(fields)
+    return page_query(qs, per_page, cursor_after(qs, first))
+
+
+def hot_queries():
+    """(name, queryset) for the main query of each view, built the way the view builds it."""
+    today = timezone.localdate()
+    employee = Employee.objects.order_by("id").values("id", "department").first() or {"id": 1, "department": "IT"}
+    pk = employee["id"]
+    employees = Employee.objects.order_by(*views.EmployeeListView.ordering)
+    per_page = views.EmployeeListView.paginate_by
+    sweep = overdue._candidates(today)
+
+    return [
+        ("employee_list", _first_page(views.filter_employees(employees, {}), per_page)),
+        ("employee_list next page", _second_page(views.filter_employees(employees, {}), per_page)),
+        ("employee_list by department",
+         _first_page(views.filter_employees(employees, {"department": employee["department"]}), per_page)),
+        ("employee_detail tasks",
+         _first_page(views.EmployeeDetailView.task_queryset(pk), views.EmployeeDetailView.tasks_per_page)),
+        ("dashboard tasks", dashboard._open_tasks(pk)),
+        ("dashboard leaves", dashboard._visible_leaves(pk)),
+        ("leave_request monthly limit", monthly_leave_requests(pk, today)),
+        ("leave_approve",
+         _first_page(_view_queryset(views.ApproveLeaveRequestView), views.ApproveLeaveRequestView.paginate_by)),
+        ("leave_approve pending",
+         _first_page(_view_queryset(views.ApproveLeaveRequestView, status="Pending"),
+                     views.ApproveLeaveRequestView.paginate_by)),
+        ("on leave today", analytics._snapshot_queries(today)[2]),
+        ("capacity check", Task(assigned_to_id=pk)._capacity_query()),
+        ("sweep escalated", overdue._chunk(sweep["escalated"], None, overdue.SWEEP_CHUNK_SIZE)),
+        ("sweep overdue", overdue._chunk(sweep["overdue"], None, overdue.SWEEP_CHUNK_SIZE)),
+        ("sweep clear", overdue._chunk(sweep[""], None, overdue.SWEEP_CHUNK_SIZE)),
+        ("attendance day", attendance._stored([(pk, today)])),
+        ("attendance rollup changes", attendance_rollup._changed_rows(timezone.now() - timedelta(hours=1))),
+        ("attendance_report",
+         _first_page(_view_queryset(views.AttendanceReportView), views.AttendanceReportView.paginate_by)),
+    ]
+
+
+def find_seq_scans(queries=None):
+    """Run EXPLAIN on each hot query; return [(name, tables_scanned or None if skipped, plan)].
+
+    On Postgres sequential scans are disabled for the check, so a "Seq Scan" in
+    the plan means no index can serve the query at all, however small the
+    tables are.
+    """
+    pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+    if pattern is None:
+        raise NotImplementedError(f"No plan parser for {connection.vendor}")
+    results = []
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        for name, qs in queries or hot_queries():
+            if connection.vendor == "sqlite" and name in PARTIAL_INDEX_QUERIES:
+                results.append((name, None, ""))
+                continue
+            plan = qs.explain()
+            paged = qs.query.high_mark is not None and qs.query.order_by
+            tables = {table for table, via_index in pattern.findall(plan) if not (via_index and paged)}
+            results.append((name, sorted(tables), plan))
+    return results
@@ -0,0 +1,59 @@
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import attendance, dashboard, department_stats, profiles
+from .analytics import invalidate_snapshot
+from .models import LeaveRequest
+
+LEAVE_ACTIONS = {"approve": "Approved", "reject": "Rejected"}
+LEAVE_OUTCOMES = {"approve": "approved", "reject": "rejected"}
+
+
+def bulk_set_status(ids, action):
+    """Approve or reject many pending leave requests with a single UPDATE.
+
+    Returns {id: outcome} where outcome is "approved"/"rejected", "not_pending"
+    or "not_found". Requests that were not Pending are left untouched.
+    """
+    status = LEAVE_ACTIONS[action]
+    ids = set(ids)
+    with transaction.atomic():
+        # Lock the rows we are about to flip so the stats deltas match the UPDATE
+        pending = list(
+            LeaveRequest.objects.select_for_update(of=("self",))
+            .filter(pk__in=ids, status="Pending")
+            .only("id", "employee", "leave_type", "start_date", "end_date", "employee__department")
+            .select_related("employee")
+        )
+        LeaveRequest.objects.filter(pk__in=[leave.pk for leave in pending], status="Pending").update(
+            status=status, updated_at=timezone.now()
+        )
+        _record_status_change(pending, status)
+
+    outcomes = {leave.pk: LEAVE_OUTCOMES[action] for leave in pending}
+    rest = ids - outcomes.keys()
+    if rest:
+        existing = set(LeaveRequest.objects.filter(pk__in=rest).values_list("id", flat=True))
+        outcomes.update({pk: "not_pending" if pk in existing else "not_found" for pk in rest})
+    return outcomes
+
+
+def _record_status_change(leaves, status):
+    # update() skips the LeaveRequest signals, so do what they would have
+    if not leaves:
+        return
+    moved = Counter(leave.employee.department for leave in leaves)
+    field = department_stats.LEAVE_COUNTERS.get(status)
+    department_stats.apply_change(
+        {dept: {"pending_leave": count} for dept, count in moved.items()},
+        {dept: {field: count} for dept, count in moved.items()} if field else {},
+    )
+    if status == "Approved":
+        attendance.apply_leave(leaves)
+    employee_ids = {leave.employee_id for leave in leaves}
+    for employee_id in employee_ids:
+        dashboard.bump_version(employee_id)
+    profiles.invalidate_profile(*employee_ids)
+    invalidate_snapshot()
@@ -0,0 +1,83 @@
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+
+from employee import department_stats
+from employee.attendance import AttendanceWriter
+from employee.ids import allocate_employee_ids
+from employee.models import Attendance, Employee
+
+
+def swipe_naive(employee_id, when):
+    # What a straightforward view would do: one transaction per swipe
+    Attendance.objects.update_or_create(
+        employee_id=employee_id, date=when.date(),
+        defaults={"check_in": when.time().replace(microsecond=0), "status": "Present"},
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate the morning check-in rush: replay swipes from parallel workers "
+        "once with one upsert per swipe and once through the batching AttendanceWriter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=2000)
+        parser.add_argument("--swipes", type=int, default=5000, help="Total swipes, duplicates included.")
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--seed", type=int, default=9)
+
+    def handle(self, *args, employees, swipes, workers, seed, **options):
+        rng = random.Random(seed)
+        prefix = f"bench-att-{uuid.uuid4().hex[:8]}-"
+        people = Employee.objects.bulk_create(
+            Employee(email=f"{prefix}{i}@bench.invalid", employee_id=employee_id, password="!")
+            for i, employee_id in enumerate(allocate_employee_ids(employees))
+        )
+        ids = [p.pk for p in people]
+        try:
+            for label, days_ago, run in (
+                ("per-swipe upsert", 1, self.run_naive),
+                ("batched writer", 2, self.run_batched),
+            ):
+                # Everyone arrives between 8:30 and 9:30; some swipe twice
+                start = timezone.localtime().replace(hour=8, minute=30, second=0, microsecond=0) - timedelta(days=days_ago)
+                events = [(rng.choice(ids), start + timedelta(seconds=rng.randrange(3600))) for _ in range(swipes)]
+                started = time.perf_counter()
+                run(events, workers)
+                elapsed = time.perf_counter() - started
+                rows = Attendance.objects.filter(employee_id__in=ids, date=start.date()).count()
+                self.stdout.write(
+                    f"{label:>16}: {swipes} swipes -> {rows} rows in {elapsed:.2f}s "
+                    f"({swipes / elapsed:.0f} swipes/s)"
+                )
+        finally:
+            Employee.objects.filter(email__startswith=prefix).delete()
+            # bulk_create skipped the signals that add to DepartmentStats, but the
+            # delete above ran the ones that subtract, so recount from the table.
+            # The swipes come from other threads' connections, which rules out
+            # wrapping the run in a rolled-back transaction.
+            department_stats.rebuild()
+
+    def run_naive(self, events, workers):
+        def work(event):
+            try:
+                swipe_naive(*event)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(work, events))
+
+    def run_batched(self, events, workers):
+        writer = AttendanceWriter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda event: writer.record(event[0], event[1], "check_in"), events))
+        writer.flush()
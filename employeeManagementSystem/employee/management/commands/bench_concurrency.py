@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from employee.benchmark import concurrency_targets, run_asgi, run_wsgi
+from employee.models import Employee
+from employee.perfdata import PERF_ADMIN_EMAIL
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare how many slow-client requests one process serves at once under WSGI "
+        "(sync worker threads) and ASGI (one event loop) for the async views: dashboard, "
+        "employee list/detail and analytics. Run `manage.py seed_perf_data` first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per mode.")
+        parser.add_argument("--clients", type=int, default=50, help="Concurrent ASGI clients.")
+        parser.add_argument(
+            "--threads", type=int, nargs="+", default=[1, 4],
+            help="WSGI worker threads to try (1 = gunicorn sync worker, more = gthread).",
+        )
+        parser.add_argument("--client-delay-ms", type=float, default=100, help="Time a slow client takes to read a response.")
+        parser.add_argument("--user", default=PERF_ADMIN_EMAIL, help="Staff account to request pages as.")
+        parser.add_argument("--output", help="Also write the results to this JSON file.")
+
+    def handle(self, *args, requests, clients, threads, client_delay_ms, user, output, **options):
+        account = Employee.objects.filter(email=user, is_staff=True).first()
+        if account is None:
+            raise CommandError(f"No staff account {user}; run `manage.py seed_perf_data` or pass --user.")
+        paths, cookies = concurrency_targets(account)
+        delay = client_delay_ms / 1000
+
+        # Budgets are reported by bench_views; here they'd only add noise
+        with override_settings(QUERY_BUDGET_RAISE=False):
+            results = [run_wsgi(paths, cookies, requests, n, delay) for n in threads]
+            results.append(run_asgi(paths, cookies, requests, clients, delay))
+
+        self.stdout.write(f"{'mode':<22} {'req/s':>8} {'peak':>5} {'p50':>9} {'p95':>9}  status")
+        for result in results:
+            self.stdout.write(
+                f"{result['mode']:<22} {result['requests_per_s']:>8.1f} {result['peak_in_flight']:>5} "
+                f"{result['p50_ms']:>7.1f}ms {result['p95_ms']:>7.1f}ms  {','.join(map(str, result['status']))}"
+            )
+        if output:
+            with open(output, "w") as f:
+                json.dump({"paths": paths, "client_delay_ms": client_delay_ms, "results": results}, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {output}."))
@@ -0,0 +1,71 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections, transaction
+
+from employee.ids import legacy_next_employee_id
+from employee.models import Employee
+
+
+def register_legacy(email):
+    with transaction.atomic():
+        employee = Employee(email=email, employee_id=legacy_next_employee_id())
+        employee.set_unusable_password()
+        employee.save()
+
+
+def register_sequence(email):
+    employee = Employee(email=email)
+    employee.set_unusable_password()
+    employee.save()
+
+
+IMPLEMENTATIONS = {
+    "legacy": register_legacy,
+    "sequence": register_sequence,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run N parallel registrations with the old select_for_update allocator and the "
+        "sequence allocator and report throughput. Creates and then deletes bench users; "
+        "meant for Postgres (SQLite serializes all writes)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent registrations.")
+        parser.add_argument("--count", type=int, default=500, help="Registrations per implementation.")
+        parser.add_argument("--retries", type=int, default=5, help="Retries after a duplicate-key or lock error.")
+
+    def handle(self, *args, workers, count, retries, **options):
+        for name, register in IMPLEMENTATIONS.items():
+            prefix = f"bench-{name}-{uuid.uuid4().hex[:8]}-"
+
+            def run(i):
+                # Returns (registered, errors) for one registration
+                try:
+                    for attempt in range(retries + 1):
+                        try:
+                            register(f"{prefix}{i}@bench.invalid")
+                            return 1, attempt
+                        except DatabaseError:  # duplicate key, lock timeout, "database is locked"
+                            pass
+                    return 0, retries + 1
+                finally:
+                    connections.close_all()
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(run, range(count)))
+            created = sum(ok for ok, _ in results)
+            errors = sum(failed for _, failed in results)
+            elapsed = time.perf_counter() - started
+
+            self.stdout.write(
+                f"{name:>8}: {created}/{count} registered in {elapsed:.2f}s "
+                f"({created / elapsed:.0f}/s, {workers} workers, {errors} retried errors)"
+            )
+            Employee.objects.filter(email__startswith=prefix).delete()
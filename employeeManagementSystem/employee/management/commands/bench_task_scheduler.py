@@ -0,0 +1,81 @@
+import random
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from employee.assignment import schedule_tasks
+from employee.ids import allocate_employee_ids
+from employee.models import MAX_ACTIVE_TASKS, Employee, Task
+
+
+class Rollback(Exception):
+    pass
+
+
+def assign_naive(department, tasks):
+    # One least-loaded lookup and one save() per task
+    for task in sorted(tasks, key=lambda task: task.deadline):
+        task.assigned_to = (
+            Employee.objects.filter(department=department, active_task_count__lt=MAX_ACTIVE_TASKS)
+            .order_by("active_task_count", "id").first()
+        )
+        if task.assigned_to is None:
+            break
+        task.save()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure task scheduling throughput: spread a batch of tasks over a department "
+        "with the heap-based scheduler and with a per-task lookup + save. Everything "
+        "runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=2000)
+        parser.add_argument("--tasks", type=int, default=5000)
+        parser.add_argument("--naive-tasks", type=int, default=500, help="The per-task path is slow; use a smaller batch.")
+        parser.add_argument("--seed", type=int, default=17)
+
+    def handle(self, *args, employees, tasks, naive_tasks, seed, **options):
+        rng = random.Random(seed)
+        department = f"bench-{uuid.uuid4().hex[:8]}"
+        today = timezone.localdate()
+
+        def batch(count):
+            return [
+                Task(title=f"Task {i}", description="bench", deadline=today + timedelta(days=rng.randrange(1, 60)))
+                for i in range(count)
+            ]
+
+        for label, count, run in (
+            ("heap scheduler", tasks, schedule_tasks),
+            ("per-task save", naive_tasks, assign_naive),
+        ):
+            try:
+                with transaction.atomic():
+                    Employee.objects.bulk_create(
+                        Employee(
+                            email=f"{department}-{i}@bench.invalid", employee_id=employee_id, password="!",
+                            department=department, active_task_count=rng.randrange(0, 4),
+                        )
+                        for i, employee_id in enumerate(allocate_employee_ids(employees))
+                    )
+                    work = batch(count)
+                    with CaptureQueriesContext(connection) as queries:
+                        started = time.perf_counter()
+                        run(department, work)
+                        elapsed = time.perf_counter() - started
+                    assigned = Task.objects.filter(assigned_to__department=department).count()
+                    raise Rollback
+            except Rollback:
+                pass
+            self.stdout.write(
+                f"{label:>15}: {assigned}/{count} tasks over {employees} employees in {elapsed:.2f}s "
+                f"({assigned / elapsed:.0f} tasks/s, {len(queries)} queries)"
+            )
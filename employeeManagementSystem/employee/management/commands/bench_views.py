@@ -0,0 +1,59 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employee.benchmark import compare, run
+from employee.models import Employee
+from employee.perfdata import PERF_ADMIN_EMAIL
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every URL in employee/urls.py through the test client and report latency "
+        "percentiles and query counts per view. Run `manage.py seed_perf_data` first. "
+        "Results are written as JSON; pass --compare to diff against an earlier run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20, help="Timed requests per URL (after one cold request).")
+        parser.add_argument("--output", default="bench-views.json", help="Where to write the JSON results.")
+        parser.add_argument("--compare", metavar="BASELINE", help="A previous --output file to compare against.")
+        parser.add_argument("--only", nargs="+", metavar="URL_NAME", help="Only benchmark these URL names.")
+        parser.add_argument("--user", default=PERF_ADMIN_EMAIL, help="Staff account to request pages as.")
+
+    def handle(self, *args, requests, output, only, user, **options):
+        if not Employee.objects.filter(email=user, is_staff=True).exists():
+            raise CommandError(f"No staff account {user}; run `manage.py seed_perf_data` or pass --user.")
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)
+
+        results = run(requests=requests, user_email=user, only=only)
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+
+        self.stdout.write(f"{'view':<24} {'status':<10} {'cold':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8}")
+        for name, view in results["views"].items():
+            status = ",".join(map(str, view["status"]))
+            queries = view.get("queries_median", view["cold_queries"])
+            over = " !" if view["query_budget"] is not None and view.get("queries_max", 0) > view["query_budget"] else ""
+            line = (
+                f"{name:<24} {status:<10} {view['cold_ms']:>7.1f}ms {view.get('p50_ms', 0):>7.1f}ms "
+                f"{view.get('p95_ms', 0):>7.1f}ms {view.get('p99_ms', 0):>7.1f}ms {queries:>8g}{over}"
+            )
+            if "error" in view:
+                line = self.style.ERROR(f"{line}  {view['error']}, timings not valid")
+            self.stdout.write(line)
+        for name, reason in results["skipped"].items():
+            self.stdout.write(f"skipped {name}: {reason}")
+
+        if baseline:
+            self.stdout.write(f"\nCompared with {options['compare']}:")
+            self.stdout.write(f"{'view':<24} {'p50':>21} {'p95':>21} {'queries':>11}")
+            for name, old_p50, new_p50, old_p95, new_p95, old_q, new_q in compare(baseline, results):
+                self.stdout.write(
+                    f"{name:<24} {old_p50:>8.1f} -> {new_p50:>7.1f}ms {old_p95:>8.1f} -> {new_p95:>7.1f}ms "
+                    f"{old_q:>4g} -> {new_q:<4g}"
+                )
+        self.stdout.write(self.style.SUCCESS(f"Wrote {output}."))
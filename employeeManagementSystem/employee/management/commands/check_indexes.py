@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from employee.indexcheck import find_seq_scans
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the main query of each view and fail if any of them needs a full table "
+        "scan. Supports PostgreSQL and SQLite."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan, not just the failures.")
+
+    def handle(self, *args, verbose_plans, **options):
+        try:
+            results = find_seq_scans()
+        except NotImplementedError as exc:
+            raise CommandError(exc)
+
+        failures = 0
+        for name, tables, plan in results:
+            if tables is None:
+                self.stdout.write(f"skipped   {name} (needs a partial index; check on PostgreSQL)")
+                continue
+            if tables:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"SEQ SCAN  {name}: {', '.join(tables)}"))
+            else:
+                self.stdout.write(f"ok        {name}")
+            if tables or verbose_plans:
+                self.stdout.write("    " + plan.replace("\n", "\n    "))
+
+        if failures:
+            raise CommandError(f"{failures} of {len(results)} queries fall back to a sequential scan.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(results)} queries use an index."))
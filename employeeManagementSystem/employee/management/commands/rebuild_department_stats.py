@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from employee.department_stats import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the DepartmentStats table from Employee, Task and LeaveRequest rows."
+
+    def handle(self, *args, **options):
+        count = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {count} departments."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from employee.attendance_rollup import rollup
+
+
+class Command(BaseCommand):
+    help = "Refresh AttendanceMonthlySummary for attendance changed since the last run."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full", action="store_true",
+            help="Recompute every month from scratch (also picks up deleted attendance).",
+        )
+
+    def handle(self, *args, **options):
+        count = rollup(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(f"Updated {count} monthly summaries."))
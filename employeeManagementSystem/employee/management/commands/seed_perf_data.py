@@ -0,0 +1,60 @@
+import os
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from employee import perfdata
+from employee.models import Employee
+from employee.perfdata import PERF_ADMIN_EMAIL, PERF_EMAIL_DOMAIN
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create a synthetic, reproducible dataset (employees, tasks, leave requests, "
+        "attendance) for benchmarking. Generated accounts use @" + PERF_EMAIL_DOMAIN + " addresses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=1000)
+        parser.add_argument("--tasks", type=float, default=6, help="Mean tasks per employee.")
+        parser.add_argument("--leaves", type=float, default=3, help="Mean leave requests per employee.")
+        parser.add_argument("--attendance-days", type=int, default=30, help="Days of attendance history.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument(
+            "--today", type=date.fromisoformat, default=None,
+            help="Anchor date (YYYY-MM-DD) for deadlines, leave and attendance; defaults to today.",
+        )
+        parser.add_argument("--clear", action="store_true", help="Delete previously seeded data first.")
+        parser.add_argument("--clear-only", action="store_true", help="Delete previously seeded data and stop.")
+        parser.add_argument(
+            "--password", default=os.environ.get("PERF_PASSWORD"),
+            help="Password for the seeded accounts (default: $PERF_PASSWORD). Without one they can't log in.",
+        )
+        parser.add_argument("--force", action="store_true", help="Run even though DEBUG is off.")
+
+    def handle(self, *args, employees, tasks, leaves, attendance_days, seed, today, password, **options):
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError("DEBUG is off, so this may be a production database; pass --force to seed it anyway.")
+        if options["clear"] or options["clear_only"]:
+            self.stdout.write(f"Deleted {perfdata.clear()} seeded rows.")
+            if options["clear_only"]:
+                return
+        elif Employee.objects.filter(email=PERF_ADMIN_EMAIL).exists():
+            raise CommandError("Seeded data already exists; pass --clear to replace it.")
+        if employees < 1:
+            raise CommandError("--employees must be at least 1.")
+
+        started = time.perf_counter()
+        created = perfdata.seed(
+            employees=employees, tasks=tasks, leaves=leaves,
+            attendance_days=attendance_days, seed=seed, today=today, password=password,
+        )
+        elapsed = time.perf_counter() - started
+        summary = ", ".join(f"{count} {name}" for name, count in created.items())
+        self.stdout.write(self.style.SUCCESS(f"Created {summary} in {elapsed:.1f}s."))
+        if password:
+            self.stdout.write(f"Log in as {PERF_ADMIN_EMAIL} with the given password (staff).")
+        else:
+            self.stdout.write(f"No password given, so {PERF_ADMIN_EMAIL} (staff) and the others can't log in.")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from employee.overdue import SWEEP_CHUNK_SIZE, sweep
+
+
+class Command(BaseCommand):
+    help = (
+        "Flag overdue and escalated tasks and refresh per-employee overdue counters. "
+        "Run it periodically (e.g. hourly, and just after midnight) from cron or a scheduler."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=SWEEP_CHUNK_SIZE, help="Tasks updated per statement.")
+
+    def handle(self, *args, chunk_size, **options):
+        counts = sweep(chunk_size=chunk_size)
+        self.stdout.write(self.style.SUCCESS(
+            f"Escalated {counts['escalated']}, marked {counts['overdue']} overdue, cleared {counts['cleared']}."
+        ))
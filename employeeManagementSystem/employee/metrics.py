@@ -0,0 +1,189 @@
+import heapq
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .querybudget import awrap_connections, wrap_connections
+
+logger = logging.getLogger(__name__)
+
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000)
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram, one series per view name."""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = defaultdict(lambda: [[0] * (len(buckets) + 1), 0.0])
+        self._lock = threading.Lock()
+
+    def observe(self, view, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, _ = series = self._series[view]
+            counts[index] += 1
+            series[1] += value
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {view: (list(counts), total) for view, (counts, total) in self._series.items()}
+        for view, (counts, total) in sorted(snapshot.items()):
+            label = _escape(view)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{view="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{view="{label}"}} {total}')
+            lines.append(f'{self.name}_count{{view="{label}"}} {cumulative}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def inc(self, view, status):
+        with self._lock:
+            self._values[(view, status)] += 1
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = dict(self._values)
+        for (view, status), value in sorted(snapshot.items()):
+            lines.append(f'{self.name}{{view="{_escape(view)}",status="{status}"}} {value}')
+        return lines
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUESTS = Counter("ems_requests_total", "Requests served, by view and status code.")
+REQUEST_DURATION = Histogram("ems_request_duration_seconds", "Wall time spent handling the request.", TIME_BUCKETS)
+DB_QUERIES = Histogram("ems_db_queries", "SQL queries run per request.", COUNT_BUCKETS)
+DB_DURATION = Histogram("ems_db_duration_seconds", "Time spent in SQL per request.", TIME_BUCKETS)
+TEMPLATE_DURATION = Histogram("ems_template_render_seconds", "Template rendering time per request.", TIME_BUCKETS)
+RESPONSE_SIZE = Histogram("ems_response_size_bytes", "Size of non-streaming response bodies.", SIZE_BUCKETS)
+ALL_METRICS = (REQUESTS, REQUEST_DURATION, DB_QUERIES, DB_DURATION, TEMPLATE_DURATION, RESPONSE_SIZE)
+
+
+def render_metrics():
+    """All metrics in the Prometheus text exposition format (this process only)."""
+    lines = []
+    for metric in ALL_METRICS:
+        lines.extend(metric.expose())
+    return "\n".join(lines) + "\n"
+
+
+class QueryTimer:
+    def __init__(self, keep_statements):
+        self.count = 0
+        self.duration = 0.0
+        self.keep_statements = keep_statements
+        self.slowest = []  # min-heap of (duration, sql)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            if self.keep_statements:
+                entry = (elapsed, sql)
+                if len(self.slowest) < self.keep_statements:
+                    heapq.heappush(self.slowest, entry)
+                elif entry > self.slowest[0]:
+                    heapq.heapreplace(self.slowest, entry)
+
+
+class RequestMetricsMiddleware:
+    """Record per-view wall time, query count, DB time, template time and response size.
+
+    Controlled by METRICS_ENABLED (default True). Requests slower than
+    METRICS_SLOW_REQUEST_MS are logged with their METRICS_SLOW_SQL_COUNT slowest
+    statements; leave METRICS_SLOW_REQUEST_MS unset to skip the bookkeeping.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "METRICS_ENABLED", True)
+        self.slow_ms = getattr(settings, "METRICS_SLOW_REQUEST_MS", None)
+        self.slow_sql_count = getattr(settings, "METRICS_SLOW_SQL_COUNT", 5) if self.slow_ms is not None else 0
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        timer = QueryTimer(self.slow_sql_count)
+        started = time.perf_counter()
+        with wrap_connections(timer):
+            response = self.get_response(request)
+        self.record(request, response, timer, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        timer = QueryTimer(self.slow_sql_count)
+        started = time.perf_counter()
+        async with awrap_connections(timer):
+            response = await self.get_response(request)
+        self.record(request, response, timer, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, timer, elapsed):
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        REQUESTS.inc(view, response.status_code)
+        REQUEST_DURATION.observe(view, elapsed)
+        DB_QUERIES.observe(view, timer.count)
+        DB_DURATION.observe(view, timer.duration)
+        render_time = getattr(request, "_metrics_render_time", None)
+        if render_time is not None:
+            TEMPLATE_DURATION.observe(view, render_time)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(view, len(response.content))
+
+        if self.slow_ms is not None and elapsed * 1000 >= self.slow_ms:
+            statements = "\n".join(
+                f"  {duration * 1000:.1f}ms {sql}" for duration, sql in sorted(timer.slowest, reverse=True)
+            )
+            logger.warning(
+                "Slow request %s %s (%s): %.0fms, %d queries in %.0fms\n%s",
+                request.method, request.path, view, elapsed * 1000, timer.count, timer.duration * 1000, statements,
+            )
+
+    def process_template_response(self, request, response):
+        if self.enabled:
+            started = time.perf_counter()
+
+            def rendered(response):
+                request._metrics_render_time = time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
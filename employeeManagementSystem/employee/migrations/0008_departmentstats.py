@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:20
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def populate_department_stats(apps, schema_editor):
+    from employee.department_stats import rebuild
+    rebuild(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0007_alter_employee_managers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepartmentStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('department', models.CharField(max_length=100, unique=True)),
+                ('headcount', models.IntegerField(default=0)),
+                ('active_tasks', models.IntegerField(default=0)),
+                ('completed_tasks', models.IntegerField(default=0)),
+                ('pending_leave', models.IntegerField(default=0)),
+                ('approved_leave', models.IntegerField(default=0)),
+                ('total_salary', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18)),
+            ],
+            options={
+                'verbose_name': 'Department Stats',
+                'verbose_name_plural': 'Department Stats',
+                'ordering': ['department'],
+            },
+        ),
+        migrations.RunPython(populate_department_stats, migrations.RunPython.noop),
+    ]
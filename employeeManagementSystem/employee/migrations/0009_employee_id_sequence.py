@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:21
+
+from django.db import migrations, models
+
+from employee.ids import EMPLOYEE_ID_COUNTER, EMPLOYEE_ID_SEQUENCE, parse_employee_id
+
+
+def seed_employee_id_sequence(apps, schema_editor):
+    Employee = apps.get_model('employee', 'Employee')
+    IdCounter = apps.get_model('employee', 'IdCounter')
+    last = max(
+        (parse_employee_id(emp_id) or 0 for emp_id in Employee.objects.values_list('employee_id', flat=True)),
+        default=0,
+    )
+    if schema_editor.connection.vendor == 'postgresql':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(f'CREATE SEQUENCE IF NOT EXISTS {EMPLOYEE_ID_SEQUENCE}')
+            # is_called=false makes the next nextval() return `last + 1` even when last is 0
+            cursor.execute('SELECT setval(%s, %s, false)', [EMPLOYEE_ID_SEQUENCE, last + 1])
+    else:
+        IdCounter.objects.update_or_create(name=EMPLOYEE_ID_COUNTER, defaults={'value': last})
+
+
+def drop_employee_id_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(f'DROP SEQUENCE IF EXISTS {EMPLOYEE_ID_SEQUENCE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0008_departmentstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_employee_id_sequence, drop_employee_id_sequence),
+    ]
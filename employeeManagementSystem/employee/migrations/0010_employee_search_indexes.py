@@ -0,0 +1,45 @@
+from django.db import migrations
+
+# Fixed here rather than imported from employee.search, so later changes to
+# the app can't change what this migration does
+SEARCH_INDEX_FIELDS = ('full_name', 'employee_id', 'email', 'department', 'position')
+
+
+def search_indexes():
+    """GIN trigram indexes on UPPER(field), matching Django's `icontains` SQL on Postgres."""
+    from django.contrib.postgres.indexes import GinIndex, OpClass
+    from django.db.models.functions import Upper
+
+    return [
+        GinIndex(OpClass(Upper(field), name='gin_trgm_ops'), name=f'employee_{field}_trgm')
+        for field in SEARCH_INDEX_FIELDS
+    ]
+
+
+def add_search_indexes(apps, schema_editor):
+    # GIN/pg_trgm only exist on Postgres; other backends use the in-memory search index
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    Employee = apps.get_model('employee', 'Employee')
+    for index in search_indexes():
+        schema_editor.add_index(Employee, index)
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Employee = apps.get_model('employee', 'Employee')
+    for index in search_indexes():
+        schema_editor.remove_index(Employee, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0009_employee_id_sequence'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_indexes, remove_search_indexes),
+    ]
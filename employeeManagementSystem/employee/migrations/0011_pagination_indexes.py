@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('employee', '0010_employee_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['full_name', 'id'], name='employee_name_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['-applied_on', '-id'], name='leave_applied_on_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'complete', 'deadline', 'id'], name='task_assignee_order_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:31
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0011_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.CreateModel(
+            name='AttendanceMonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('days_present', models.PositiveIntegerField(default=0)),
+                ('days_absent', models.PositiveIntegerField(default=0)),
+                ('days_on_leave', models.PositiveIntegerField(default=0)),
+                ('late_arrivals', models.PositiveIntegerField(default=0)),
+                ('total_hours', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=7)),
+                ('computed_at', models.DateTimeField()),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Attendance Monthly Summary',
+                'verbose_name_plural': 'Attendance Monthly Summaries',
+                'indexes': [models.Index(fields=['month', 'employee'], name='attendance_summary_month_idx')],
+                'unique_together': {('employee', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0012_attendance_monthly_summary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(condition=models.Q(('status', 'Approved')), fields=['start_date', 'end_date'], name='leave_approved_range_idx'),
+        ),
+    ]
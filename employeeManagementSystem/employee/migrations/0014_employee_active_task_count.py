@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:41
+
+from django.db import migrations, models
+
+
+def populate_active_task_counts(apps, schema_editor):
+    from employee.assignment import rebuild_active_task_counts
+    rebuild_active_task_counts(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0013_leave_active_on_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='active_task_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_active_task_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0014_employee_active_task_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='overdue_task_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='overdue_state',
+            field=models.CharField(blank=True, choices=[('', 'On time'), ('overdue', 'Overdue'), ('escalated', 'Escalated')], default='', editable=False, max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['complete', 'deadline', 'id'], name='task_complete_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('overdue_state', ''), _negated=True), fields=['overdue_state'], name='task_flagged_idx'),
+        ),
+    ]
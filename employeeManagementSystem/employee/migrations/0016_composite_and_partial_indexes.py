@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('employee', '0015_task_overdue_state'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['department', 'full_name', 'id'], name='employee_dept_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(condition=models.Q(('status', 'Pending')), fields=['-applied_on', '-id'], name='leave_pending_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['employee', 'status', 'updated_at'], name='leave_employee_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['employee', 'applied_on'], name='leave_employee_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('complete', False)), fields=['assigned_to', 'deadline', 'id'], name='task_open_assignee_idx'),
+        ),
+    ]
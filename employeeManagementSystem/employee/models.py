@@ -3,6 +3,7 @@ from django.contrib.auth.models import AbstractUser, BaseUserManager
 from datetime import date
 from decimal import Decimal
 from django.core.exceptions import ValidationError
+from .ids import next_employee_id
 
 # Create your models here.
 class EmployeeManager(BaseUserManager):
@@ -82,6 +83,13 @@ class Employee(AbstractUser):
     salary = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('100000.00'))
     # Currency code for clarity; keep non-editable since app uses NGN only
     salary_currency = models.CharField(max_length=3, default='NGN', editable=False)
+    # Incomplete tasks assigned to this employee, kept in step by the Task signals
+    # (see employee.signals) so capacity checks don't need a COUNT
+    active_task_count = models.PositiveIntegerField(default=0, editable=False)
+    # Overdue + escalated tasks as of the last `manage.py sweep_tasks` run
+    overdue_task_count = models.PositiveIntegerField(default=0, editable=False)
+    # Version stamp for the JSON API's ETag/Last-Modified; the counters above don't bump it
+    updated_at = models.DateTimeField(auto_now=True)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
@@ -89,20 +97,37 @@ class Employee(AbstractUser):
     # Attach the custom manager so Django uses it for create_user/create_superuser
     objects = EmployeeManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Keyset pagination of the employee list (full_name, id)
+            models.Index(fields=['full_name', 'id'], name='employee_name_order_idx'),
+            # Department filter on the employee list, same ordering
+            models.Index(fields=['department', 'full_name', 'id'], name='employee_dept_name_idx'),
+        ]
+
     def save(self, *args, **kwargs):
-        # Only generate employee_id if it doesn’t exist
+        # Only generate employee_id if it doesn’t exist. IDs come from a sequence
+        # (see employee.ids) so concurrent sign-ups don't queue on a row lock.
         if not self.employee_id:
-            with transaction.atomic():
-                last_emp = Employee.objects.select_for_update().order_by('-id').first()
-                if last_emp and last_emp.employee_id and last_emp.employee_id.startswith('EMP'):
-                    try:
-                        num = int(last_emp.employee_id.replace('EMP', '')) + 1
-                    except ValueError:
-                        num = last_emp.id + 1
-                else:
-                    num = 1
-                self.employee_id = f"EMP{num:04d}"
+            self.employee_id = next_employee_id()
+        if getattr(self, '_row_known', False) and not self._state.adding and kwargs.get('update_fields') is None:
+            # The row was loaded or written by this instance, so it exists: never
+            # write back stale copies of the task counters maintained elsewhere,
+            # and don't load deferred fields just to rewrite them
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred
+                and field.name not in ('active_task_count', 'overdue_task_count')
+            ]
         super().save(*args, **kwargs)
+        self._row_known = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._row_known = True
+        return instance
 
     def __str__(self):
         return f"{self.full_name} ({self.employee_id})"
@@ -118,6 +143,8 @@ class Attendance(models.Model):
         default='Present'
     )
     remarks = models.TextField(blank=True, null=True)  # for custom notes like "Medical leave" or "Arrived 1hr late"
+    # Lets the monthly rollup pick up only rows changed since its last run
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     class Meta:
         unique_together = ('employee', 'date')
         ordering = ['-date']
@@ -126,6 +153,29 @@ class Attendance(models.Model):
         # Use the employee's __str__ to avoid relying on username attribute
         return f"{self.employee} - {self.date} ({self.status})"
 
+class AttendanceMonthlySummary(models.Model):
+    """Precomputed attendance totals per employee per month (see employee.attendance_rollup)."""
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='attendance_summaries')
+    month = models.DateField()  # first day of the month
+    days_present = models.PositiveIntegerField(default=0)
+    days_absent = models.PositiveIntegerField(default=0)
+    days_on_leave = models.PositiveIntegerField(default=0)
+    late_arrivals = models.PositiveIntegerField(default=0)
+    total_hours = models.DecimalField(max_digits=7, decimal_places=2, default=Decimal('0.00'))
+    # Start of the rollup run that wrote this row; Attendance changed after it is picked up next time
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('employee', 'month')
+        indexes = [
+            models.Index(fields=['month', 'employee'], name='attendance_summary_month_idx'),
+        ]
+        verbose_name = "Attendance Monthly Summary"
+        verbose_name_plural = "Attendance Monthly Summaries"
+
+    def __str__(self):
+        return f"{self.employee} - {self.month:%Y-%m}"
+
 MAX_ACTIVE_TASKS = 5
 class Task(models.Model):
     assigned_to = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name="assigned_tasks")
@@ -134,26 +184,95 @@ class Task(models.Model):
     assigned_date = models.DateField(auto_now_add=True) #date field for assigned date
     deadline = models.DateField() #date field for deadline
     complete = models.BooleanField(default=False)
+    # Set in bulk by `manage.py sweep_tasks` (see employee.overdue); '' means on time
+    OVERDUE_STATES = [
+        ('', 'On time'),
+        ('overdue', 'Overdue'),
+        ('escalated', 'Escalated'),
+    ]
+    overdue_state = models.CharField(max_length=10, choices=OVERDUE_STATES, default='', blank=True, editable=False)
+    # Version stamp for the JSON API; bulk update() callers must set it too
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta():
         ordering = ['complete']
+        indexes = [
+            # Keyset pagination of an employee's task list (complete, deadline, id)
+            models.Index(fields=['assigned_to', 'complete', 'deadline', 'id'], name='task_assignee_order_idx'),
+            # The sweeper's scan of incomplete tasks by deadline
+            models.Index(fields=['complete', 'deadline', 'id'], name='task_complete_deadline_idx'),
+            # Only flagged tasks; what the sweeper clears and analytics counts
+            models.Index(fields=['overdue_state'], condition=~models.Q(overdue_state=''), name='task_flagged_idx'),
+            # Open tasks per assignee by deadline: dashboard, scheduler, capacity lookups
+            models.Index(
+                fields=['assigned_to', 'deadline', 'id'],
+                condition=models.Q(complete=False),
+                name='task_open_assignee_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.assigned_to.full_name})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what was loaded so save() knows whether it adds an active task
+        instance._loaded_active = (instance.__dict__.get('assigned_to_id'), instance.__dict__.get('complete'))
+        return instance
+
+    def adds_active_task(self):
+        if self.complete:
+            return False
+        if self._state.adding:
+            return True
+        loaded = getattr(self, '_loaded_active', None)
+        return loaded is None or loaded != (self.assigned_to_id, False)
+
+    def _capacity_query(self):
+        employees = Employee.objects.all()
+        if transaction.get_connection().in_atomic_block:
+            employees = employees.select_for_update()
+        return employees.filter(pk=self.assigned_to_id).values_list('active_task_count', flat=True)
+
+    def check_capacity(self):
+        """Raise ValidationError if the assignee is already at MAX_ACTIVE_TASKS.
+
+        Inside a transaction (as in save()) the employee row is locked, so two
+        concurrent assignments can't both take the last slot.
+        """
+        active_tasks = self._capacity_query().first()
+        if active_tasks is not None and active_tasks >= MAX_ACTIVE_TASKS:
+            raise ValidationError(
+                f"This employee already has {MAX_ACTIVE_TASKS} active tasks."
+            )
+
+    def clean_fields(self, exclude=None):
+        if Task.assigned_to.is_cached(self):
+            # The assignee was already fetched by pk, so don't query again to prove it exists
+            exclude = set(exclude or ()) | {'assigned_to'}
+        super().clean_fields(exclude=exclude)
+
     def clean(self):
-        if not self.complete:
-            active_tasks = Task.objects.filter(
-                assigned_to=self.assigned_to,
-                complete=False
-            ).exclude(pk=self.pk).count()
-
-            if active_tasks >= MAX_ACTIVE_TASKS:
-                raise ValidationError(
-                    f"This employee already has {MAX_ACTIVE_TASKS} active tasks."
-                )
+        # Completing or editing an already-active task never needs the capacity check
+        if self.assigned_to_id and self.adds_active_task():
+            self.check_capacity()
+
     def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        with transaction.atomic():
+            if update_fields is None:
+                self.full_clean()
+            elif {'assigned_to', 'complete'} & set(update_fields) and self.adds_active_task():
+                self.check_capacity()
+            super().save(*args, **kwargs)
+        self._loaded_active = (self.assigned_to_id, self.complete)
+
+
+class LeaveRequestQuerySet(models.QuerySet):
+    def active_on(self, day):
+        """Approved leave covering `day`; served by the leave_approved_range_idx partial index."""
+        return self.filter(status='Approved', start_date__lte=day, end_date__gte=day)
 
 
 class LeaveRequest(models.Model):
@@ -183,8 +302,30 @@ class LeaveRequest(models.Model):
     # Use auto_now so it updates on every save.
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = LeaveRequestQuerySet.as_manager()
+
     class Meta:
         ordering = ['-applied_on']
+        indexes = [
+            # Keyset pagination of the approval queue (-applied_on, -id)
+            models.Index(fields=['-applied_on', '-id'], name='leave_applied_on_idx'),
+            # The pending-only approval queue, same ordering
+            models.Index(
+                fields=['-applied_on', '-id'],
+                condition=models.Q(status='Pending'),
+                name='leave_pending_queue_idx',
+            ),
+            # Dashboard: an employee's leaves minus old rejections
+            models.Index(fields=['employee', 'status', 'updated_at'], name='leave_employee_status_idx'),
+            # LeaveRequestForm's monthly limit
+            models.Index(fields=['employee', 'applied_on'], name='leave_employee_applied_idx'),
+            # "Who is on leave on <date>" (LeaveRequest.objects.active_on)
+            models.Index(
+                fields=['start_date', 'end_date'],
+                condition=models.Q(status='Approved'),
+                name='leave_approved_range_idx',
+            ),
+        ]
         verbose_name = "Leave Request"
         verbose_name_plural = "Leave Requests"
 
@@ -196,3 +337,31 @@ class LeaveRequest(models.Model):
 
     def __str__(self):
         return f"{self.employee} - {self.status}"
+
+
+class DepartmentStats(models.Model):
+    """Per-department counters kept up to date by signal handlers (see employee.department_stats)."""
+    department = models.CharField(max_length=100, unique=True)
+    headcount = models.IntegerField(default=0)
+    active_tasks = models.IntegerField(default=0)
+    completed_tasks = models.IntegerField(default=0)
+    pending_leave = models.IntegerField(default=0)
+    approved_leave = models.IntegerField(default=0)
+    total_salary = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal('0.00'))
+
+    class Meta:
+        ordering = ['department']
+        verbose_name = "Department Stats"
+        verbose_name_plural = "Department Stats"
+
+    def __str__(self):
+        return f"{self.department or 'No department'} ({self.headcount})"
+
+
+class IdCounter(models.Model):
+    """Named counter used to hand out IDs on databases without sequences."""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}={self.value}"
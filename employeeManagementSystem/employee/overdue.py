@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import dashboard
+from .analytics import invalidate_snapshot
+from .models import Employee, Task
+
+SWEEP_CHUNK_SIZE = 5000
+
+
+def _candidates(today):
+    """{state: tasks that should move to it} for a sweep on `today`."""
+    grace_cutoff = today - timedelta(days=dashboard.OVERDUE_GRACE_DAYS)
+    incomplete = Task.objects.filter(complete=False)
+    return {
+        "escalated": incomplete.filter(deadline__lt=grace_cutoff).exclude(overdue_state="escalated"),
+        "overdue": incomplete.filter(deadline__gte=grace_cutoff, deadline__lt=today).exclude(overdue_state="overdue"),
+        # Completed or rescheduled since the last sweep
+        "": Task.objects.exclude(overdue_state="").filter(Q(complete=True) | Q(deadline__gte=today)),
+    }
+
+
+def _chunk(candidates, last, chunk_size):
+    # The next (deadline, id) keyset chunk of `candidates` after `last`
+    chunk = candidates.order_by("deadline", "id")
+    if last is not None:
+        chunk = chunk.filter(Q(deadline__gt=last[0]) | Q(deadline=last[0], id__gt=last[1]))
+    return chunk.values_list("deadline", "id", "assigned_to_id")[:chunk_size]
+
+
+def _flag(candidates, state, chunk_size, touched):
+    """Set `overdue_state` on `candidates` one (deadline, id) keyset chunk at a time."""
+    flagged = 0
+    last = None
+    while True:
+        rows = list(_chunk(candidates, last, chunk_size))
+        if not rows:
+            return flagged
+        flagged += Task.objects.filter(pk__in=[pk for _, pk, _ in rows]).update(overdue_state=state, updated_at=timezone.now())
+        touched.update(assignee for _, _, assignee in rows)
+        last = rows[-1][:2]
+
+
+def sweep(today=None, chunk_size=SWEEP_CHUNK_SIZE):
+    """Flag overdue and escalated tasks and refresh Employee.overdue_task_count.
+
+    A task is overdue once its deadline has passed and escalated once it is more
+    than OVERDUE_GRACE_DAYS late. Only rows whose state changes are written, in
+    chunks of `chunk_size`, so memory stays flat however many tasks there are.
+    Returns {"escalated": n, "overdue": n, "cleared": n}.
+    """
+    today = today or timezone.localdate()
+    candidates = _candidates(today)
+    touched = set()
+
+    counts = {
+        "escalated": _flag(candidates["escalated"], "escalated", chunk_size, touched),
+        "overdue": _flag(candidates["overdue"], "overdue", chunk_size, touched),
+        "cleared": _flag(candidates[""], "", chunk_size, touched),
+    }
+
+    flagged = (
+        Task.objects.filter(assigned_to=OuterRef("pk"), complete=False)
+        .exclude(overdue_state="")
+        .order_by()
+        .values("assigned_to")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    # Besides the assignees touched above, recount everyone who has or should
+    # have a non-zero counter: deleting or reassigning a flagged task changes
+    # counts without changing any task's state
+    candidates = touched | set(Employee.objects.filter(overdue_task_count__gt=0).values_list("id", flat=True))
+    candidates.update(
+        Task.objects.filter(complete=False).exclude(overdue_state="")
+        .order_by().values_list("assigned_to_id", flat=True).distinct()
+    )
+    candidate_ids = sorted(candidates)
+    recounted = set()
+    for start in range(0, len(candidate_ids), chunk_size):
+        drifted = list(
+            Employee.objects.filter(pk__in=candidate_ids[start:start + chunk_size])
+            .annotate(actual=Coalesce(Subquery(flagged), 0))
+            .exclude(overdue_task_count=F("actual"))
+            .values_list("id", flat=True)
+        )
+        if drifted:
+            Employee.objects.filter(pk__in=drifted).update(overdue_task_count=Coalesce(Subquery(flagged), 0))
+            recounted.update(drifted)
+
+    for employee_id in touched:
+        dashboard.bump_version(employee_id)
+    if touched or recounted:
+        invalidate_snapshot()
+    return counts
@@ -0,0 +1,152 @@
+import datetime
+from decimal import Decimal
+from functools import reduce
+
+from django.core import signing
+from django.db.models import Q
+from django.http import Http404
+
+from .aio import alist
+
+CURSOR_SALT = "employee.pagination"
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset, exposed like Django's Page for templates."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def _ordering(qs):
+    ordering = [str(field) for field in qs.query.order_by]
+    if not ordering or ordering[-1].lstrip("-") not in ("id", "pk"):
+        raise ValueError("Keyset pagination needs an explicit ordering ending in the primary key")
+    return [(field.lstrip("-"), field.startswith("-")) for field in ordering]
+
+
+def _to_json(value):
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _salt(ordering):
+    # Cursors only verify against the ordering they were made for, so one taken
+    # from a view with a different ordering is rejected rather than misread
+    return ":".join([CURSOR_SALT, *(f"{'-' if descending else ''}{field}" for field, descending in ordering)])
+
+
+def _encode(values, direction, salt):
+    return signing.dumps({"v": [_to_json(v) for v in values], "d": direction}, salt=salt, compress=True)
+
+
+def _after(ordering, values):
+    """Q for rows strictly after `values` in `ordering` (row-value comparison, spelled out)."""
+    clauses = []
+    for i, (field, descending) in enumerate(ordering):
+        equal = {f: v for (f, _), v in zip(ordering[:i], values[:i])}
+        clauses.append(Q(**equal, **{f"{field}__{'lt' if descending else 'gt'}": values[i]}))
+    return reduce(lambda a, b: a | b, clauses)
+
+
+def _page_query(qs, per_page, cursor):
+    # (query to read, its ordering, direction, cursor salt) for the page after/before `cursor`;
+    # the query fetches one extra row to tell whether there is another page
+    ordering = _ordering(qs)
+    salt = _salt(ordering)
+    direction = "next"
+    if cursor:
+        try:
+            token = signing.loads(cursor, salt=salt)
+        except signing.BadSignature:
+            raise Http404("Invalid page cursor")
+        if token.get("d") not in ("next", "prev") or len(token.get("v", ())) != len(ordering):
+            raise Http404("Invalid page cursor")
+        direction = token["d"]
+        if direction == "prev":
+            # Walk backwards from the cursor, then put the rows back in order
+            ordering = [(field, not descending) for field, descending in ordering]
+            qs = qs.order_by(*[f"{'-' if d else ''}{f}" for f, d in ordering])
+        qs = qs.filter(_after(ordering, token["v"]))
+    return qs[:per_page + 1], ordering, direction, salt
+
+
+def page_query(qs, per_page, cursor=None):
+    """The unevaluated query keyset_page() runs for the page at `cursor`."""
+    return _page_query(qs, per_page, cursor)[0]
+
+
+def cursor_after(qs, values):
+    """A next-page cursor for `qs` positioned after the row whose ordering fields are `values`."""
+    return _encode(values, "next", _salt(_ordering(qs)))
+
+
+def _make_page(rows, per_page, ordering, direction, cursor, salt):
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == "prev":
+        rows.reverse()
+    if not rows:
+        return KeysetPage(rows)
+
+    def key(obj):
+        if isinstance(obj, dict):  # values() rows
+            return [obj[field] for field, _ in ordering]
+        # Related orderings like "employee__full_name" are read through the relation
+        return [reduce(getattr, field.split("__"), obj) for field, _ in ordering]
+
+    if direction == "prev":
+        next_cursor = _encode(key(rows[-1]), "next", salt)
+        previous_cursor = _encode(key(rows[0]), "prev", salt) if has_more else None
+    else:
+        next_cursor = _encode(key(rows[-1]), "next", salt) if has_more else None
+        previous_cursor = _encode(key(rows[0]), "prev", salt) if cursor else None
+    return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+def keyset_page(qs, per_page, cursor=None):
+    """Return a KeysetPage of `qs`, which must be ordered by unique keys ending in `id`.
+
+    Each page is a single indexed range scan on the ordering columns, so later
+    pages cost the same as the first. `cursor` is a token from a previous page.
+    """
+    query, ordering, direction, salt = _page_query(qs, per_page, cursor)
+    return _make_page(list(query), per_page, ordering, direction, cursor, salt)
+
+
+async def akeyset_page(qs, per_page, cursor=None):
+    """keyset_page() for async views."""
+    query, ordering, direction, salt = _page_query(qs, per_page, cursor)
+    return _make_page(await alist(query), per_page, ordering, direction, cursor, salt)
+
+
+class KeysetPaginationMixin:
+    """ListView mixin replacing OFFSET pagination with `?cursor=` keyset pagination.
+
+    The view's queryset must be ordered by unique keys ending in `id`.
+    """
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset, page_size):
+        page = keyset_page(queryset, page_size, self.request.GET.get(self.cursor_kwarg))
+        return (None, page, page.object_list, page.has_other_pages())
@@ -0,0 +1,228 @@
+import datetime
+import math
+import random
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from . import assignment, attendance_rollup, department_stats, overdue
+from .analytics import invalidate_snapshot
+from .ids import allocate_employee_ids
+from .models import MAX_ACTIVE_TASKS, Attendance, Employee, LeaveRequest, Task
+
+# Everything seed() creates has an address at this domain, so clear() can find it
+PERF_EMAIL_DOMAIN = "perf.invalid"
+PERF_ADMIN_EMAIL = f"admin@{PERF_EMAIL_DOMAIN}"
+PERF_BATCH_SIZE = 2000
+
+FIRST_NAMES = (
+    "Ada", "Bola", "Chidi", "Dayo", "Emeka", "Funke", "Gbenga", "Halima", "Ifeoma", "Jide",
+    "Kemi", "Lanre", "Musa", "Ngozi", "Obi", "Precious", "Quadri", "Rukayat", "Segun", "Tolu",
+    "Uche", "Victoria", "Wale", "Yemi", "Zainab",
+)
+LAST_NAMES = (
+    "Adeyemi", "Bello", "Chukwu", "Danjuma", "Eze", "Fashola", "Garba", "Ibrahim", "Johnson",
+    "Kalu", "Lawal", "Mohammed", "Nwosu", "Okafor", "Okonkwo", "Olawale", "Sani", "Taiwo",
+    "Usman", "Williams",
+)
+# (value, weight): most staff are in software, few in legal
+DEPARTMENT_WEIGHTS = (
+    ("software development", 30), ("resarch & development", 12), ("product research", 8),
+    ("sales", 15), ("marketing", 10), ("customer service", 15), ("human resource", 6), ("legal", 4),
+)
+POSITION_WEIGHTS = (
+    ("software engineer", 25), ("developer", 15), ("intern", 8), ("designer", 6), ("tester", 6),
+    ("manager", 8), ("business analyst", 6), ("technical support", 8), ("devops engineer", 4),
+    ("data scientist", 4), ("product manager", 4), ("hr manager", 2), ("other", 4),
+)
+BASE_SALARY = {"intern": 80_000, "manager": 450_000, "product manager": 420_000, "hr manager": 350_000}
+LEAVE_TYPE_WEIGHTS = (
+    ("annual", 45), ("sick", 30), ("other", 10), ("unpaid", 6), ("bereavement", 4),
+    ("maternity", 3), ("paternity", 2),
+)
+LEAVE_DAYS = {"sick": (1, 3), "maternity": (60, 90), "paternity": (5, 10), "bereavement": (2, 5)}
+
+
+def _weighted(rng, weights):
+    values, cum = zip(*weights)
+    return rng.choices(values, weights=cum)[0]
+
+
+def _poisson(rng, mean):
+    # Knuth's method; fine for the small means used here
+    limit, k, p = math.exp(-mean), 0, rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def _batched(objs, size=PERF_BATCH_SIZE):
+    objs = iter(objs)
+    while batch := list(islice(objs, size)):
+        yield batch
+
+
+def _time(minutes):
+    minutes = max(0, min(int(minutes), 24 * 60 - 1))
+    return datetime.time(minutes // 60, minutes % 60)
+
+
+def _make_employees(rng, count, today, password):
+    # make_password(None) is an unusable password
+    password = make_password(password)
+    for i, employee_id in enumerate(allocate_employee_ids(count)):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        position = _weighted(rng, POSITION_WEIGHTS)
+        salary = rng.lognormvariate(math.log(BASE_SALARY.get(position, 200_000)), 0.25)
+        is_admin = i == 0
+        yield Employee(
+            email=PERF_ADMIN_EMAIL if is_admin else f"{first}.{last}.{i}@{PERF_EMAIL_DOMAIN}".lower(),
+            password=password,
+            employee_id=employee_id,
+            full_name=f"{first} {last}",
+            gender=rng.choice(("male", "female")),
+            position=position,
+            department=_weighted(rng, DEPARTMENT_WEIGHTS),
+            salary=Decimal(round(salary, -3)),
+            date_of_birth=today - datetime.timedelta(days=rng.randint(21 * 365, 60 * 365)),
+            employment_date=today - datetime.timedelta(days=rng.randint(30, 10 * 365)),
+            phone_number=f"080{rng.randrange(10 ** 8):08d}",
+            address=f"{rng.randint(1, 200)} {rng.choice(LAST_NAMES)} Street, Lagos",
+            is_staff=is_admin,
+            is_superuser=is_admin,
+        )
+
+
+def _make_tasks(rng, employees, mean, today):
+    for employee in employees:
+        open_tasks = 0
+        for n in range(_poisson(rng, mean)):
+            # Roughly 60% done; open tasks never exceed the assignee's capacity
+            complete = rng.random() < 0.6 or open_tasks >= MAX_ACTIVE_TASKS
+            open_tasks += not complete
+            deadline = today + datetime.timedelta(days=rng.randint(-30, 45))
+            task = Task(
+                assigned_to_id=employee.pk,
+                title=f"Task {n + 1} for {employee.full_name}",
+                description="Generated by seed_perf_data",
+                deadline=deadline,
+                complete=complete,
+            )
+            task.assigned_date = min(today, deadline) - datetime.timedelta(days=rng.randint(1, 30))
+            yield task
+
+
+def _make_leaves(rng, employees, mean, today):
+    for employee in employees:
+        for _ in range(_poisson(rng, mean)):
+            leave_type = _weighted(rng, LEAVE_TYPE_WEIGHTS)
+            start = today + datetime.timedelta(days=rng.randint(-90, 60))
+            length = rng.randint(*LEAVE_DAYS.get(leave_type, (1, 10)))
+            if start > today:
+                status = rng.choices(("Pending", "Approved", "Rejected"), weights=(60, 30, 10))[0]
+            else:
+                status = rng.choices(("Pending", "Approved", "Rejected"), weights=(5, 75, 20))[0]
+            leave = LeaveRequest(
+                employee_id=employee.pk,
+                start_date=start,
+                end_date=start + datetime.timedelta(days=length - 1),
+                reason=f"{leave_type.title()} leave",
+                leave_type=leave_type,
+                status=status,
+            )
+            leave.applied_on = min(today, start - datetime.timedelta(days=rng.randint(1, 30)))
+            yield leave
+
+
+def _make_attendance(rng, employees, leaves, days, today):
+    on_leave = set()
+    for leave in leaves:
+        if leave.status == "Approved":
+            day = leave.start_date
+            while day <= leave.end_date:
+                on_leave.add((leave.employee_id, day))
+                day += datetime.timedelta(days=1)
+
+    workdays = [
+        today - datetime.timedelta(days=n) for n in range(days, 0, -1)
+        if (today - datetime.timedelta(days=n)).weekday() < 5
+    ]
+    for employee in employees:
+        for day in workdays:
+            if day < employee.employment_date:
+                continue
+            if (employee.pk, day) in on_leave:
+                yield Attendance(employee_id=employee.pk, date=day, status="On Leave", remarks="Approved leave")
+            elif rng.random() < 0.06:
+                yield Attendance(employee_id=employee.pk, date=day, status="Absent")
+            else:
+                # Arrivals cluster around 8:45, about one in five after 9:00
+                arrived = rng.gauss(8 * 60 + 45, 20)
+                yield Attendance(
+                    employee_id=employee.pk, date=day, status="Present",
+                    check_in=_time(arrived), check_out=_time(arrived + rng.gauss(8.5 * 60, 45)),
+                )
+
+
+def seed(employees=1000, tasks=6, leaves=3, attendance_days=30, seed=1, today=None, password=None):
+    """Bulk-create a synthetic dataset; returns {model name: rows created}.
+
+    `tasks` and `leaves` are per-employee means. Every account gets `password`,
+    or an unusable one if it is None (the benchmarks use force_login). The same `seed` and `today`
+    always produce the same rows, apart from the employee IDs, which come
+    from the shared allocator. Rows are written with bulk_create, so the
+    counters the signals would maintain are rebuilt at the end.
+    """
+    rng = random.Random(seed)
+    today = today or timezone.localdate()
+    created = {}
+    with transaction.atomic():
+        people = []
+        for batch in _batched(_make_employees(rng, employees, today, password)):
+            people += Employee.objects.bulk_create(batch)
+        created["employees"] = len(people)
+
+        created["tasks"] = 0
+        for batch in _batched(_make_tasks(rng, people, tasks, today)):
+            # assigned_date is auto_now_add, so backdate it after the insert
+            dates = [task.assigned_date for task in batch]
+            Task.objects.bulk_create(batch)
+            for task, assigned in zip(batch, dates):
+                task.assigned_date = assigned
+            Task.objects.bulk_update(batch, ["assigned_date"])
+            created["tasks"] += len(batch)
+
+        leave_rows = []
+        for batch in _batched(_make_leaves(rng, people, leaves, today)):
+            dates = [leave.applied_on for leave in batch]
+            LeaveRequest.objects.bulk_create(batch)
+            for leave, applied in zip(batch, dates):
+                leave.applied_on = applied
+            LeaveRequest.objects.bulk_update(batch, ["applied_on"])
+            leave_rows += batch
+        created["leave_requests"] = len(leave_rows)
+
+        created["attendance"] = 0
+        for batch in _batched(_make_attendance(rng, people, leave_rows, attendance_days, today)):
+            Attendance.objects.bulk_create(batch)
+            created["attendance"] += len(batch)
+
+        department_stats.rebuild()
+        assignment.rebuild_active_task_counts()
+        overdue.sweep(today)
+    attendance_rollup.rollup()
+    invalidate_snapshot()
+    return created
+
+
+def clear():
+    """Delete everything seed() created (tasks, leave and attendance go with the employees)."""
+    with transaction.atomic():
+        deleted, _ = Employee.objects.filter(email__endswith=f"@{PERF_EMAIL_DOMAIN}").delete()
+        department_stats.rebuild()
+    invalidate_snapshot()
+    return deleted
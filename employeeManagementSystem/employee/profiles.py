@@ -0,0 +1,88 @@
+from collections import Counter
+from dataclasses import dataclass, field
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Prefetch, Q
+
+from .models import Employee, LeaveRequest
+
+# Kept short: with a per-process cache, invalidate_profile() only clears the
+# calling worker's copy and the others catch up when their entry expires
+PROFILE_CACHE_TTL = getattr(settings, "PROFILE_CACHE_TTL", 60)
+# What the employee detail page shows; the password hash never goes into the cache
+PROFILE_FIELDS = (
+    "full_name", "email", "gender", "position", "department", "employee_id", "phone_number",
+    "address", "salary", "salary_currency", "date_joined",
+)
+
+
+@dataclass
+class Profile:
+    """An employee with their task and leave summaries, as cached for the detail page."""
+    employee: Employee
+    task_count: int
+    completed_tasks: int
+    leave_requests: list
+    leave_summary: dict = field(default_factory=dict)
+
+    @property
+    def leave_count(self):
+        return len(self.leave_requests)
+
+
+def _profile_key(employee_id):
+    return f"profile:{employee_id}"
+
+
+def invalidate_profile(*employee_ids):
+    """Drop cached profiles; called when an employee, their tasks or their leaves change."""
+    cache.delete_many([_profile_key(pk) for pk in employee_ids if pk is not None])
+
+
+def build_profile(employee_id):
+    """Two queries: the employee with task counts annotated, then their leave requests."""
+    employee = (
+        Employee.objects.only(*PROFILE_FIELDS)
+        .annotate(
+            task_count=Count("assigned_tasks"),
+            completed_tasks=Count("assigned_tasks", filter=Q(assigned_tasks__complete=True)),
+        )
+        .prefetch_related(Prefetch(
+            "leave_requests", queryset=LeaveRequest.objects.order_by("-applied_on", "-id"), to_attr="leave_list",
+        ))
+        .filter(pk=employee_id)
+        .first()
+    )
+    if employee is None:
+        return None
+    return Profile(
+        employee=employee,
+        task_count=employee.task_count,
+        completed_tasks=employee.completed_tasks,
+        leave_requests=employee.leave_list,
+        leave_summary=dict(Counter(leave.status for leave in employee.leave_list)),
+    )
+
+
+def load_profile(employee_id):
+    """The cached Profile for `employee_id`, or None if there is no such employee."""
+    key = _profile_key(employee_id)
+    profile = cache.get(key)
+    if profile is None:
+        profile = build_profile(employee_id)
+        if profile is not None:
+            cache.set(key, profile, PROFILE_CACHE_TTL)
+    return profile
+
+
+async def aload_profile(employee_id):
+    """load_profile() for async views."""
+    key = _profile_key(employee_id)
+    profile = await cache.aget(key)
+    if profile is None:
+        profile = await sync_to_async(build_profile)(employee_id)
+        if profile is not None:
+            await cache.aset(key, profile, PROFILE_CACHE_TTL)
+    return profile
@@ -0,0 +1,105 @@
+import logging
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(max_queries):
+    """Declare how many SQL queries a function view may run per request.
+
+    Class-based views set a `query_budget` attribute instead.
+    """
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+def get_query_budget(view_func):
+    view_class = getattr(view_func, "view_class", None)
+    if view_class is not None:
+        return getattr(view_class, "query_budget", None)
+    return getattr(view_func, "query_budget", None)
+
+
+@contextmanager
+def wrap_connections(wrapper):
+    """Install an execute_wrapper on every database connection for the duration."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(wrapper))
+        yield
+
+
+@asynccontextmanager
+async def awrap_connections(wrapper):
+    """wrap_connections() for async code.
+
+    The async ORM runs queries through sync_to_async, on connections that are
+    not the ones visible from the event loop, so install the wrapper there.
+    """
+    stack = ExitStack()
+    await sync_to_async(stack.enter_context)(wrap_connections(wrapper))
+    try:
+        yield
+    finally:
+        await sync_to_async(stack.close)()
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMiddleware:
+    """Count queries per request and flag views that run more than their declared budget.
+
+    Over-budget requests raise QueryBudgetExceeded when QUERY_BUDGET_RAISE is on
+    (use override_settings in tests) and are logged as warnings otherwise. Queries
+    made while a StreamingHttpResponse is consumed are not counted. Works under
+    WSGI and ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = QueryCounter()
+        with wrap_connections(counter):
+            response = self.get_response(request)
+        self.check(request, counter.count)
+        return response
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        async with awrap_connections(counter):
+            response = await self.get_response(request)
+        self.check(request, counter.count)
+        return response
+
+    def check(self, request, count):
+        match = request.resolver_match
+        budget = get_query_budget(match.func) if match else None
+        if budget is not None and count > budget:
+            message = f"{match.view_name} ran {count} queries (budget {budget}) for {request.path}"
+            if getattr(settings, "QUERY_BUDGET_RAISE", settings.DEBUG):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
@@ -0,0 +1,153 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Max
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from .models import Employee
+
+# Reports live on disk so any worker process can serve a finished file.
+REPORTS_ROOT = getattr(settings, "REPORTS_ROOT", os.path.join(tempfile.gettempdir(), "ems_reports"))
+REPORT_WORKERS = getattr(settings, "REPORT_WORKERS", 2)
+# A report older than this is removed once a newer one is ready; the wait lets
+# downloads of it that are already under way finish
+REPORT_RETENTION_SECONDS = getattr(settings, "REPORT_RETENTION_SECONDS", 600)
+
+TOP = 750
+BOTTOM = 50
+LINE_HEIGHT = 20
+
+_executor = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix="pdf-report")
+_jobs = {}
+_lock = threading.Lock()
+
+
+def employee_data_stamp():
+    """(row count, highest id, latest updated_at) of the employee table.
+
+    Read from the database so every worker process agrees on it: an insert
+    moves the highest id, a delete the count and a save() updated_at. Logins
+    and the task counters don't touch updated_at, so they leave it alone.
+    """
+    stats = Employee.objects.aggregate(count=Count("id"), last_id=Max("id"), last_change=Max("updated_at"))
+    return stats["count"], stats["last_id"], stats["last_change"]
+
+
+def data_version():
+    """Stamp that changes whenever the rows in the employee report could change."""
+    raw = ":".join(str(part) for part in employee_data_stamp())
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def report_path(job_id):
+    return os.path.join(REPORTS_ROOT, f"employees-{job_id}.pdf")
+
+
+def job_status(job_id):
+    """One of 'ready', 'running', 'failed' or 'missing'."""
+    if os.path.exists(report_path(job_id)):
+        return "ready"
+    with _lock:
+        future = _jobs.get(job_id)
+    if future is None:
+        return "missing"
+    if not future.done():
+        return "running"
+    return "failed" if future.exception() else "ready"
+
+
+def request_employee_report():
+    """Return the job id for the current data, starting a render only if needed."""
+    job_id = data_version()
+    if os.path.exists(report_path(job_id)):
+        return job_id
+    with _lock:
+        future = _jobs.get(job_id)
+        if future is None or (future.done() and future.exception()):
+            _jobs[job_id] = _executor.submit(_run_job, job_id)
+    return job_id
+
+
+def _run_job(job_id):
+    try:
+        os.makedirs(REPORTS_ROOT, exist_ok=True)
+        path = report_path(job_id)
+        # Render to a scratch file and rename, so readers never see a partial PDF
+        fd, tmp_path = tempfile.mkstemp(dir=REPORTS_ROOT, suffix=".part")
+        os.close(fd)
+        try:
+            render_employee_report(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        _remove_stale_reports(keep=path)
+        return path
+    finally:
+        # Worker threads get their own DB connections; don't leak them
+        connections.close_all()
+
+
+def _remove_stale_reports(keep):
+    # Other workers may still be serving older reports, so only old ones go
+    cutoff = time.time() - REPORT_RETENTION_SECONDS
+    for name in os.listdir(REPORTS_ROOT):
+        path = os.path.join(REPORTS_ROOT, name)
+        if name.startswith("employees-") and name.endswith(".pdf") and path != keep:
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+    with _lock:
+        for job_id, future in list(_jobs.items()):
+            if future.done() and report_path(job_id) != keep:
+                del _jobs[job_id]
+
+
+def render_employee_report(path):
+    """Write the employee report grouped by department, one text object per page."""
+    rows = (
+        Employee.objects.order_by("department", "full_name", "id")
+        .values_list("department", "full_name", "email", "salary", "salary_currency")
+        .iterator(chunk_size=2000)
+    )
+    department_labels = dict(Employee.DEPARTMENT_CHOICES)
+
+    p = canvas.Canvas(path, pagesize=letter)
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(50, 770, "Employee Report")
+    text = p.beginText(50, TOP)
+    y = TOP
+
+    def new_page():
+        nonlocal text, y
+        p.drawText(text)
+        p.showPage()
+        text = p.beginText(50, TOP)
+        y = TOP
+
+    for department, employees in groupby(rows, key=lambda row: row[0]):
+        if y - 2 * LINE_HEIGHT < BOTTOM:
+            new_page()
+        text.setFont("Helvetica-Bold", 12, LINE_HEIGHT)
+        text.textLine(department_labels.get(department, department) or "No department")
+        y -= LINE_HEIGHT
+        text.setFont("Helvetica", 10, LINE_HEIGHT)
+        for _, full_name, email, salary, currency in employees:
+            if y < BOTTOM:
+                new_page()
+                text.setFont("Helvetica", 10, LINE_HEIGHT)
+            text.textLine(f"{full_name} | {email} | {salary:,.2f} {currency}")
+            y -= LINE_HEIGHT
+
+    p.drawText(text)
+    p.save()
@@ -0,0 +1,157 @@
+import re
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, DecimalField, IntegerField, Q, When
+from django.db.models.functions import Cast
+from django.utils.module_loading import import_string
+
+from .reports import employee_data_stamp
+
+# Field -> weight used for ranking; the columns with trigram indexes (migration 0010)
+SEARCH_FIELDS = {
+    "full_name": 4,
+    "employee_id": 4,
+    "email": 2,
+    "department": 1,
+    "position": 1,
+}
+TOKEN_RE = re.compile(r"[\w&]+")
+# Most matches the in-memory backend ranks; each one is a branch of the ORDER BY CASE
+SEARCH_MAX_RESULTS = getattr(settings, "EMPLOYEE_SEARCH_MAX_RESULTS", 500)
+RANK_FIELD = DecimalField(max_digits=12, decimal_places=6)
+
+
+def _contains_any(q):
+    matches = Q()
+    for field in SEARCH_FIELDS:
+        matches |= Q(**{f"{field}__icontains": q})
+    return matches
+
+
+class PostgresSearchBackend:
+    """Substring match served by pg_trgm indexes, ranked with full-text and trigram scores."""
+
+    def search(self, qs, q, limit=None):
+        from django.contrib.postgres.search import (
+            SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity,
+        )
+
+        vector = (
+            SearchVector("full_name", "employee_id", weight="A", config="simple")
+            + SearchVector("email", weight="B", config="simple")
+            + SearchVector("department", "position", weight="C", config="simple")
+        )
+        query = SearchQuery(q, search_type="websearch", config="simple")
+        # The score is a float4; a fixed-point rank survives the round trip
+        # through a page cursor exactly, so ties compare equal on the next page
+        score = SearchRank(vector, query) + TrigramWordSimilarity(q, "full_name")
+        qs = (
+            qs.filter(_contains_any(q))
+            .annotate(rank=Cast(score, RANK_FIELD))
+            .order_by("-rank", "full_name", "id")
+        )
+        return qs[:limit] if limit is not None else qs
+
+
+class InMemorySearchBackend:
+    """Substring-matching inverted index kept in process; for SQLite and tests.
+
+    Each query token matches the indexed words that contain it, like the
+    Postgres backend's icontains. The index is rebuilt lazily whenever the
+    employee table's data stamp (see reports.employee_data_stamp) changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._postings = {}
+        self._terms = []
+
+    def _ensure_index(self, model):
+        version = employee_data_stamp()
+        if version == self._version:
+            return
+        with self._lock:
+            postings = defaultdict(dict)
+            fields = list(SEARCH_FIELDS)
+            for pk, *values in model.objects.values_list("pk", *fields).iterator(chunk_size=2000):
+                for field, value in zip(fields, values):
+                    for token in TOKEN_RE.findall((value or "").lower()):
+                        postings[token][pk] = max(postings[token].get(pk, 0), SEARCH_FIELDS[field])
+            self._postings = dict(postings)
+            self._terms = sorted(postings)
+            self._version = version
+
+    def _matches(self, token):
+        # (term, boost): exact words rank above prefixes, prefixes above other substrings
+        for term in self._terms:
+            if token in term:
+                yield term, 3 if term == token else 2 if term.startswith(token) else 1
+
+    def rank(self, model, q):
+        """Return primary keys matching every token of `q`, best first."""
+        self._ensure_index(model)
+        scores = None
+        for token in TOKEN_RE.findall(q.lower()):
+            token_scores = {}
+            for term, boost in self._matches(token):
+                for pk, weight in self._postings[term].items():
+                    token_scores[pk] = max(token_scores.get(pk, 0), weight * boost)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {pk: score + token_scores[pk] for pk, score in scores.items() if pk in token_scores}
+            if not scores:
+                return []
+        return sorted(scores, key=lambda pk: (-scores[pk], pk)) if scores else []
+
+    def search(self, qs, q, limit=None):
+        """Matching rows of `qs`, best first; `limit` keeps only the top rows.
+
+        At most SEARCH_MAX_RESULTS (or `limit`) matches are kept, which bounds
+        the ORDER BY CASE. `qs`'s own filters are applied to the ranked ids
+        first, one chunk at a time, so the cut never hides a row `qs` allows.
+        """
+        cap = min(limit or SEARCH_MAX_RESULTS, SEARCH_MAX_RESULTS)
+        ranked = self.rank(qs.model, q)
+        if qs.query.where:
+            kept = self._allowed(qs, ranked, cap)
+        else:
+            # The index is rebuilt whenever rows change, so an unfiltered qs allows every ranked id
+            kept = ranked[:cap]
+        if not kept:
+            return qs.none()
+        order = Case(*[When(pk=pk, then=pos) for pos, pk in enumerate(kept)], output_field=IntegerField())
+        return qs.filter(pk__in=kept).annotate(rank=order).order_by("rank", "id")
+
+    @staticmethod
+    def _allowed(qs, ranked, cap):
+        # The first `cap` of `ranked` that `qs` allows, checked one chunk at a time
+        kept = []
+        for start in range(0, len(ranked), 2 * cap):
+            chunk = ranked[start:start + 2 * cap]
+            allowed = set(qs.filter(pk__in=chunk).order_by().values_list("pk", flat=True))
+            kept += [pk for pk in chunk if pk in allowed][:cap - len(kept)]
+            if len(kept) == cap:
+                break
+        return kept
+
+
+_backend = None
+
+
+def get_search_backend():
+    """Backend named by EMPLOYEE_SEARCH_BACKEND, else one suited to the database."""
+    global _backend
+    if _backend is None:
+        path = getattr(settings, "EMPLOYEE_SEARCH_BACKEND", None)
+        if path:
+            _backend = import_string(path)()
+        elif connection.vendor == "postgresql":
+            _backend = PostgresSearchBackend()
+        else:
+            _backend = InMemorySearchBackend()
+    return _backend
@@ -0,0 +1,184 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import attendance, backends, dashboard, department_stats, profiles
+from .analytics import invalidate_snapshot
+from .models import Employee, Task, LeaveRequest
+
+EMPLOYEE_STATS_FIELDS = {"department", "salary"}
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def employee_changed(sender, instance, update_fields=None, **kwargs):
+    backends.invalidate_user(instance.pk)
+    # Logins only touch last_login, which neither analytics nor the profile
+    # page show
+    if update_fields == frozenset({"last_login"}):
+        return
+    invalidate_snapshot()
+    profiles.invalidate_profile(instance.pk)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=LeaveRequest)
+@receiver(post_delete, sender=LeaveRequest)
+def analytics_source_changed(sender, instance, **kwargs):
+    invalidate_snapshot()
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, **kwargs):
+    # A reassigned task also leaves its previous assignee's dashboard and counts
+    previous = getattr(instance, "_assigned_to_old", None)
+    for employee_id in {instance.assigned_to_id, previous} - {None}:
+        dashboard.bump_version(employee_id)
+    profiles.invalidate_profile(instance.assigned_to_id, previous)
+
+
+@receiver(post_save, sender=LeaveRequest)
+@receiver(post_delete, sender=LeaveRequest)
+def leave_changed(sender, instance, **kwargs):
+    old = getattr(instance, "_leave_old", None)
+    for employee_id in {instance.employee_id, old and old.employee_id} - {None}:
+        dashboard.bump_version(employee_id)
+    profiles.invalidate_profile(instance.employee_id, old and old.employee_id)
+
+
+# DepartmentStats bookkeeping. pre_save remembers what a row contributed before
+# the write so post_save can apply the difference.
+
+def _employee_department(employee_id):
+    return Employee.objects.filter(pk=employee_id).values_list("department", flat=True).first()
+
+
+@receiver(pre_save, sender=Employee)
+def remember_employee_stats(sender, instance, update_fields=None, **kwargs):
+    instance._stats_old = None
+    # Logins only touch last_login; don't pay for a lookup then
+    if instance.pk is None or (update_fields and not EMPLOYEE_STATS_FIELDS & set(update_fields)):
+        return
+    instance._stats_old = Employee.objects.filter(pk=instance.pk).values("department", "salary").first()
+
+
+@receiver(post_save, sender=Employee)
+def update_employee_stats(sender, instance, created, **kwargs):
+    old = getattr(instance, "_stats_old", None)
+    if not created and old is None:
+        return
+    new_contribution = department_stats.employee_contribution(instance.department, instance.salary)
+    if created:
+        department_stats.apply_change({}, new_contribution)
+        return
+    department_stats.apply_change(
+        department_stats.employee_contribution(old["department"], old["salary"]), new_contribution
+    )
+    if old["department"] != instance.department:
+        # The employee's tasks and leaves move with them
+        workload = department_stats.employee_workload(instance.pk, old["department"])
+        department_stats.apply_change(workload, {instance.department: workload[old["department"]]})
+
+
+@receiver(post_delete, sender=Employee)
+def remove_employee_stats(sender, instance, **kwargs):
+    # Tasks and leaves removed by the cascade send their own post_delete
+    department_stats.apply_change(department_stats.employee_contribution(instance.department, instance.salary), {})
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_stats(sender, instance, **kwargs):
+    instance._stats_old = instance._assignee_old = instance._assigned_to_old = None
+    if instance.pk is not None:
+        old = Task.objects.filter(pk=instance.pk).values_list(
+            "assigned_to__department", "complete", "assigned_to_id"
+        ).first()
+        if old:
+            instance._stats_old = old[:2]
+            instance._assignee_old = None if old[1] else old[2]
+            instance._assigned_to_old = old[2]
+
+
+@receiver(post_save, sender=Task)
+def update_task_stats(sender, instance, created, **kwargs):
+    old = getattr(instance, "_stats_old", None)
+    new_contribution = department_stats.task_contribution(instance.assigned_to.department, instance.complete)
+    department_stats.apply_change(department_stats.task_contribution(*old) if old else {}, new_contribution)
+
+
+@receiver(post_save, sender=Task)
+def update_active_task_count(sender, instance, **kwargs):
+    old_assignee = getattr(instance, "_assignee_old", None)
+    new_assignee = None if instance.complete else instance.assigned_to_id
+    if old_assignee != new_assignee:
+        if old_assignee is not None:
+            _adjust_active_tasks([old_assignee], -1)
+        if new_assignee is not None:
+            _adjust_active_tasks([new_assignee], 1)
+
+
+@receiver(post_delete, sender=Task)
+def remove_task_stats(sender, instance, **kwargs):
+    department = _employee_department(instance.assigned_to_id)
+    if department is not None:
+        department_stats.apply_change(department_stats.task_contribution(department, instance.complete), {})
+    if not instance.complete:
+        _adjust_active_tasks([instance.assigned_to_id], -1)
+
+
+def _adjust_active_tasks(employee_ids, amount):
+    # update() rather than save() so the Employee signals (report/analytics invalidation) don't fire
+    Employee.objects.filter(pk__in=employee_ids).update(active_task_count=F("active_task_count") + amount)
+
+
+@receiver(pre_save, sender=LeaveRequest)
+def remember_leave_stats(sender, instance, **kwargs):
+    instance._stats_old = instance._leave_old = None
+    if instance.pk is not None:
+        old = LeaveRequest.objects.filter(pk=instance.pk).values_list(
+            "employee__department", "status", "employee_id", "start_date", "end_date"
+        ).first()
+        if old:
+            instance._stats_old = old[:2]
+            instance._leave_old = LeaveRequest(
+                status=old[1], employee_id=old[2], start_date=old[3], end_date=old[4]
+            )
+
+
+@receiver(post_save, sender=LeaveRequest)
+def update_leave_stats(sender, instance, created, **kwargs):
+    old = getattr(instance, "_stats_old", None)
+    new_contribution = department_stats.leave_contribution(instance.employee.department, instance.status)
+    department_stats.apply_change(department_stats.leave_contribution(*old) if old else {}, new_contribution)
+
+
+@receiver(post_delete, sender=LeaveRequest)
+def remove_leave_stats(sender, instance, **kwargs):
+    department = _employee_department(instance.employee_id)
+    if department is not None:
+        department_stats.apply_change(department_stats.leave_contribution(department, instance.status), {})
+
+
+# Approved leave is mirrored into Attendance as 'On Leave' days
+
+@receiver(post_save, sender=LeaveRequest)
+def sync_leave_attendance(sender, instance, **kwargs):
+    old = getattr(instance, "_leave_old", None)
+    old_range = (old.employee_id, old.start_date, old.end_date) if old and old.status == "Approved" else None
+    new_range = (
+        (instance.employee_id, instance.start_date, instance.end_date) if instance.status == "Approved" else None
+    )
+    if old_range == new_range:
+        return
+    if old_range:
+        attendance.revoke_leave([old])
+    if new_range:
+        attendance.apply_leave([instance])
+
+
+@receiver(post_delete, sender=LeaveRequest)
+def remove_leave_attendance(sender, instance, **kwargs):
+    if instance.status == "Approved":
+        attendance.revoke_leave([instance])
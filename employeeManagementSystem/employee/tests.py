@@ -1,3 +1,804 @@
-from django.test import TestCase
+import io
+import os
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, transaction
+from django.http import Http404
+from django.test import TestCase, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from . import assignment, attendance, attendance_rollup, department_stats, importer, leaves, overdue, perfdata
+from .attendance import AttendanceWriter
+from .forms import BulkTaskAssignmentForm, TaskForm
+from .models import (
+    MAX_ACTIVE_TASKS, Attendance, AttendanceMonthlySummary, DepartmentStats, Employee, LeaveRequest, Task,
+)
+from .pagination import cursor_after, keyset_page, page_query
+from .querybudget import QueryBudgetExceeded, get_query_budget
+from .search import InMemorySearchBackend
+from .views import EmployeeListView
+
+
+@override_settings(QUERY_BUDGET_RAISE=True)
+class QueryBudgetTests(TestCase):
+    """Every view with a query_budget stays within it on a seeded dataset."""
+
+    @classmethod
+    def setUpTestData(cls):
+        perfdata.seed(employees=30, attendance_days=5)
+        cls.admin = Employee.objects.get(email=perfdata.PERF_ADMIN_EMAIL)
+        cls.employee = Employee.objects.filter(is_staff=False, assigned_tasks__isnull=False).first()
+
+    def setUp(self):
+        # Cold caches are the expensive case
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def budgeted_urls(self):
+        task = Task.objects.first()
+        leave = LeaveRequest.objects.first()
+        attendance = Attendance.objects.first()
+        return [
+            reverse("dashboard"),
+            reverse("create_task"),
+            reverse("employee_autocomplete") + "?q=a",
+            reverse("leave_approve"),
+            reverse("leave_approve") + "?status=Pending",
+            reverse("employee_detail", args=[self.employee.pk]),
+            reverse("employee_list"),
+            reverse("employee_list") + "?q=a&department=sales",
+            reverse("analytics"),
+            reverse("attendance_report"),
+            reverse("api_employee_list"),
+            reverse("api_employee_detail", args=[self.employee.pk]),
+            reverse("api_task_list") + "?fields=id,title,assigned_to_name",
+            reverse("api_task_detail", args=[task.pk]),
+            reverse("api_leave_list"),
+            reverse("api_leave_detail", args=[leave.pk]),
+            reverse("api_attendance_list"),
+            reverse("api_attendance_detail", args=[attendance.pk]),
+        ]
+
+    def test_views_stay_within_budget(self):
+        for url in self.budgeted_urls():
+            with self.subTest(url=url):
+                self.assertIsNotNone(get_query_budget(resolve(url.split("?")[0]).func))
+                cache.clear()
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_exceeding_budget_raises(self):
+        for url in self.budgeted_urls():
+            with self.subTest(url=url):
+                view_class = resolve(url.split("?")[0]).func.view_class
+                cache.clear()
+                with mock.patch.object(view_class, "query_budget", 0):
+                    with self.assertRaises(QueryBudgetExceeded):
+                        self.client.get(url)
+
+    @override_settings(QUERY_BUDGET_RAISE=False)
+    def test_exceeding_budget_only_logs_when_not_raising(self):
+        with mock.patch.object(resolve(reverse("employee_list")).func.view_class, "query_budget", 0):
+            with self.assertLogs("employee.querybudget", "WARNING"):
+                self.assertEqual(self.client.get(reverse("employee_list")).status_code, 200)
+
+
+def make_employee(email, department="sales", salary="1000.00", **extra):
+    extra.setdefault("full_name", email.split("@")[0].title())
+    return Employee.objects.create_user(
+        email=email, password="x", department=department, salary=Decimal(salary), **extra,
+    )
+
+
+def make_task(employee, days=7, **extra):
+    return Task.objects.create(
+        assigned_to=employee, title="Task", description="Do it",
+        deadline=timezone.localdate() + timedelta(days=days), **extra,
+    )
+
+
+class CounterBookkeepingTests(TestCase):
+    """The signal-maintained counters always equal a rebuild from the source tables."""
+
+    def setUp(self):
+        self.alice = make_employee("alice@example.com", "sales", "1000.00")
+        self.bob = make_employee("bob@example.com", "legal", "2500.50")
+
+    def counters(self):
+        stats = {
+            row.pop("department"): row
+            for row in DepartmentStats.objects.values("department", *department_stats.COUNTER_FIELDS)
+        }
+        # The incremental path can leave emptied rows behind; a rebuild doesn't create them
+        stats = {dept: row for dept, row in stats.items() if any(row.values())}
+        active = dict(Employee.objects.values_list("id", "active_task_count"))
+        return stats, active
+
+    def assertCountersMatchRebuild(self):
+        live = self.counters()
+        department_stats.rebuild()
+        assignment.rebuild_active_task_counts()
+        self.assertEqual(live, self.counters())
+
+    def test_create(self):
+        make_task(self.alice)
+        make_task(self.alice, complete=True)
+        make_task(self.bob)
+        self.assertEqual(Employee.objects.get(pk=self.alice.pk).active_task_count, 1)
+        self.assertCountersMatchRebuild()
+
+    def test_reassign(self):
+        task = make_task(self.alice)
+        task.assigned_to = self.bob
+        task.save()
+        self.assertEqual(Employee.objects.get(pk=self.alice.pk).active_task_count, 0)
+        self.assertEqual(Employee.objects.get(pk=self.bob.pk).active_task_count, 1)
+        self.assertCountersMatchRebuild()
+
+    def test_complete(self):
+        task = make_task(self.alice)
+        task.complete = True
+        task.save(update_fields=["complete", "updated_at"])
+        self.assertEqual(Employee.objects.get(pk=self.alice.pk).active_task_count, 0)
+        self.assertCountersMatchRebuild()
+
+    def test_delete(self):
+        make_task(self.alice)
+        make_task(self.bob).delete()
+        LeaveRequest.objects.create(
+            employee=self.alice, start_date=date(2026, 3, 2), end_date=date(2026, 3, 3), reason="r",
+        )
+        self.alice.delete()
+        self.assertCountersMatchRebuild()
+
+    def test_employee_edits_move_their_contribution(self):
+        make_task(self.alice)
+        make_task(self.alice, complete=True)
+        alice = Employee.objects.get(pk=self.alice.pk)
+        alice.department = "legal"
+        alice.salary = Decimal("4000.00")
+        alice.save()
+        self.assertEqual(Employee.objects.get(pk=alice.pk).active_task_count, 1)
+        self.assertCountersMatchRebuild()
+
+    def test_saving_a_stale_instance_keeps_the_counters(self):
+        make_task(self.alice)
+        self.alice.full_name = "Alice Renamed"
+        self.alice.save()
+        self.assertEqual(Employee.objects.get(pk=self.alice.pk).active_task_count, 1)
+        self.assertCountersMatchRebuild()
+
+    def test_leave_status_changes(self):
+        leave = LeaveRequest.objects.create(
+            employee=self.bob, start_date=date(2026, 3, 2), end_date=date(2026, 3, 3), reason="r",
+        )
+        leave.status = "Approved"
+        leave.save()
+        other = LeaveRequest.objects.create(
+            employee=self.bob, start_date=date(2026, 4, 6), end_date=date(2026, 4, 6), reason="r",
+        )
+        leaves.bulk_set_status([other.pk], "reject")
+        self.assertCountersMatchRebuild()
+
+    def test_bulk_assignment(self):
+        make_employee("carol@example.com", "sales")
+        assignment.assign_to_department("sales", "Task", "Do it", timezone.localdate() + timedelta(days=3))
+        assignment.schedule_tasks(
+            "legal", [Task(title="Task", description="Do it", deadline=timezone.localdate()) for _ in range(3)],
+        )
+        self.assertEqual(Employee.objects.get(pk=self.bob.pk).active_task_count, 3)
+        self.assertCountersMatchRebuild()
+
+
+class BulkLeaveStatusTests(TestCase):
+    """Bulk approve/reject through leaves.bulk_set_status and BulkLeaveStatusView."""
+
+    def setUp(self):
+        self.admin = Employee.objects.create_superuser(email="admin@example.com", password="x")
+        self.employee = make_employee("dana@example.com")
+        self.pending = LeaveRequest.objects.create(
+            employee=self.employee, start_date=date(2026, 3, 2), end_date=date(2026, 3, 4), reason="r",
+            leave_type="sick",
+        )
+        self.rejected = LeaveRequest.objects.create(
+            employee=self.employee, start_date=date(2026, 4, 6), end_date=date(2026, 4, 6), reason="r",
+            status="Rejected",
+        )
+        self.client.force_login(self.admin)
+
+    def post_json(self, payload):
+        return self.client.post(reverse("bulk-update-leave"), payload, content_type="application/json")
+
+    def test_outcome_per_id(self):
+        outcomes = leaves.bulk_set_status([self.pending.pk, self.rejected.pk, 999999], "approve")
+        self.assertEqual(outcomes, {self.pending.pk: "approved", self.rejected.pk: "not_pending", 999999: "not_found"})
+        self.pending.refresh_from_db()
+        self.assertEqual(self.pending.status, "Approved")
+
+    def test_json_results(self):
+        response = self.post_json({"ids": [self.pending.pk, 999999], "action": "reject"})
+        self.assertEqual(response.json(), {"results": {str(self.pending.pk): "rejected", "999999": "not_found"}})
+
+    def test_json_errors(self):
+        for payload in ({"ids": [1], "action": "nope"}, {"ids": ["x"], "action": "approve"}, [1, 2]):
+            with self.subTest(payload=payload):
+                response = self.post_json(payload)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.json())
+
+    def test_form_keeps_status_filter(self):
+        response = self.client.post(
+            reverse("bulk-update-leave"), {"ids": [self.pending.pk], "action": "approve", "status": "Pending"},
+        )
+        self.assertRedirects(response, reverse("leave_approve") + "?status=Pending", fetch_redirect_response=False)
+        response = self.client.get(response["Location"])
+        self.assertContains(response, "Approved 1 leave request(s).")
+
+    def test_form_errors_redirect_with_message(self):
+        response = self.client.post(
+            reverse("bulk-update-leave"), {"ids": ["x"], "action": "approve", "status": "Pending"},
+        )
+        self.assertRedirects(response, reverse("leave_approve") + "?status=Pending", fetch_redirect_response=False)
+        self.assertContains(self.client.get(response["Location"]), "ids must be a list of integers")
+        self.pending.refresh_from_db()
+        self.assertEqual(self.pending.status, "Pending")
+
+    def test_non_staff_forbidden(self):
+        self.client.force_login(self.employee)
+        response = self.post_json({"ids": [self.pending.pk], "action": "approve"})
+        self.assertEqual(response.status_code, 403)
+
+    def test_attendance_mirrors_approval(self):
+        self.post_json({"ids": [self.pending.pk], "action": "approve"})
+        days = Attendance.objects.filter(employee=self.employee).order_by("date")
+        self.assertEqual(
+            list(days.values_list("date", "status", "remarks")),
+            [(date(2026, 3, day), "On Leave", "Sick leave") for day in (2, 3, 4)],
+        )
+        self.client.get(reverse("update-leave", args=[self.pending.pk, "reject"]))
+        self.assertFalse(Attendance.objects.filter(employee=self.employee).exists())
+
+
+class TaskAssignmentTests(TestCase):
+    """Deadline validation and the per-employee active task limit."""
+
+    def setUp(self):
+        self.admin = Employee.objects.create_superuser(email="admin@example.com", password="x")
+        self.alice = make_employee("alice@example.com", "sales")
+        self.carol = make_employee("carol@example.com", "sales")
+        self.client.force_login(self.admin)
+
+    def test_past_deadline_rejected(self):
+        yesterday = timezone.localdate() - timedelta(days=1)
+        task_form = TaskForm(data={
+            "assigned_to": self.alice.pk, "title": "Task", "description": "Do it", "deadline": yesterday,
+        })
+        bulk_form = BulkTaskAssignmentForm(data={
+            "department": "sales", "title": "Task", "description": "Do it", "deadline": yesterday,
+        })
+        for form in (task_form, bulk_form):
+            with self.subTest(form=type(form).__name__):
+                self.assertEqual(form.errors["deadline"], ["The deadline can't be in the past."])
+
+        bulk_form = BulkTaskAssignmentForm(data={
+            "department": "sales", "title": "Task", "description": "Do it", "deadline": timezone.localdate(),
+        })
+        self.assertTrue(bulk_form.is_valid(), bulk_form.errors)
+
+    def test_bulk_view_rejects_past_deadline(self):
+        response = self.client.post(reverse("bulk_assign_task"), {
+            "department": "sales", "title": "Task", "description": "Do it",
+            "deadline": timezone.localdate() - timedelta(days=1),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(response.context["form"], "deadline", "The deadline can't be in the past.")
+        self.assertFalse(Task.objects.exists())
+
+    def test_capacity_rejection(self):
+        for _ in range(MAX_ACTIVE_TASKS):
+            make_task(self.alice)
+        with self.assertRaises(ValidationError):
+            make_task(self.alice)
+        self.assertEqual(Task.objects.filter(assigned_to=self.alice).count(), MAX_ACTIVE_TASKS)
+
+        # Completed tasks free a slot
+        task = Task.objects.filter(assigned_to=self.alice).first()
+        task.complete = True
+        task.save(update_fields=["complete", "updated_at"])
+        make_task(self.alice)
+
+        # So does reassigning, while moving onto a full assignee is refused
+        task = make_task(self.carol)
+        task.assigned_to = self.alice
+        with self.assertRaises(ValidationError):
+            task.save(update_fields=["assigned_to", "updated_at"])
+
+    def test_capacity_check_locks_the_assignee(self):
+        task = Task(assigned_to=self.alice, title="Task", description="Do it", deadline=timezone.localdate())
+        with transaction.atomic():
+            self.assertTrue(task._capacity_query().query.select_for_update)
+        with mock.patch.object(Task, "_capacity_query", wraps=task._capacity_query) as capacity_query:
+            task.save()
+        capacity_query.assert_called_once()
+
+    def test_bulk_view_skips_members_at_capacity(self):
+        for _ in range(MAX_ACTIVE_TASKS):
+            make_task(self.alice)
+        response = self.client.post(reverse("bulk_assign_task"), {
+            "department": "sales", "title": "Task", "description": "Do it", "deadline": timezone.localdate(),
+        })
+        result = response.context["result"]
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.at_capacity, [self.alice.employee_id])
+        self.assertEqual(Employee.objects.get(pk=self.carol.pk).active_task_count, 1)
+
+    def test_saving_a_loaded_employee_keeps_the_counters(self):
+        loaded = Employee.objects.get(pk=self.alice.pk)
+        partial = Employee.objects.only("id", "full_name", "employee_id").get(pk=self.alice.pk)
+        make_task(self.alice)
+        make_task(self.alice)
+
+        loaded.full_name = "Alice Renamed"
+        loaded.save()
+        partial.full_name = "Alice Again"
+        with self.assertNumQueries(1):
+            partial.save()
+
+        alice = Employee.objects.get(pk=self.alice.pk)
+        self.assertEqual((alice.full_name, alice.active_task_count), ("Alice Again", 2))
+        self.assertEqual(alice.department, "sales")
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor round trips, and cursors that don't belong to the queryset."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Duplicate names make the id tiebreaker matter
+        for i in range(7):
+            make_employee(f"e{i}@example.com", full_name=f"Name {i // 2}")
+
+    def setUp(self):
+        self.qs = Employee.objects.order_by("full_name", "id")
+        self.expected = list(self.qs.values_list("id", flat=True))
+
+    def ids(self, page):
+        return [employee.id for employee in page]
+
+    def test_next_and_previous_round_trip(self):
+        pages = [keyset_page(self.qs, 3)]
+        while pages[-1].has_next():
+            pages.append(keyset_page(self.qs, 3, pages[-1].next_cursor))
+        self.assertEqual([self.ids(page) for page in pages], [self.expected[:3], self.expected[3:6], self.expected[6:]])
+        self.assertFalse(pages[0].has_previous())
+
+        back = keyset_page(self.qs, 3, pages[-1].previous_cursor)
+        self.assertEqual(self.ids(back), self.expected[3:6])
+        back = keyset_page(self.qs, 3, back.previous_cursor)
+        self.assertEqual(self.ids(back), self.expected[:3])
+        self.assertFalse(back.has_previous())
+        self.assertEqual(self.ids(keyset_page(self.qs, 3, back.next_cursor)), self.expected[3:6])
+
+    def test_values_rows(self):
+        qs = self.qs.values("id", "full_name")
+        page = keyset_page(qs, 4)
+        self.assertEqual([row["id"] for row in keyset_page(qs, 4, page.next_cursor)], self.expected[4:])
+
+    def test_cursor_after_a_row(self):
+        third = self.qs.values_list("full_name", "id")[2]
+        cursor = cursor_after(self.qs, third)
+        self.assertEqual(self.ids(keyset_page(self.qs, 3, cursor)), self.expected[3:6])
+        self.assertEqual([employee.id for employee in page_query(self.qs, 3, cursor)], self.expected[3:7])
+
+    def test_cursor_for_another_ordering_rejected(self):
+        cursor = keyset_page(self.qs, 3).next_cursor
+        for other in (Employee.objects.order_by("employee_id", "id"), Employee.objects.order_by("-full_name", "-id")):
+            with self.subTest(ordering=other.query.order_by):
+                with self.assertRaises(Http404):
+                    keyset_page(other, 3, cursor)
+
+    def test_ordering_must_end_in_id(self):
+        with self.assertRaises(ValueError):
+            keyset_page(Employee.objects.order_by("full_name"), 3)
+
+    def test_view_rejects_tampered_cursor(self):
+        admin = Employee.objects.create_superuser(email="admin@example.com", password="x")
+        self.client.force_login(admin)
+        with mock.patch.object(EmployeeListView, "paginate_by", 3):
+            response = self.client.get(reverse("employee_list"))
+            cursor = response.context["page_obj"].next_cursor
+            self.assertEqual(self.client.get(reverse("employee_list"), {"cursor": cursor}).status_code, 200)
+
+            tampered = cursor[:-1] + ("A" if cursor[-1] != "A" else "B")
+            for bad in (tampered, "not-a-cursor"):
+                with self.subTest(cursor=bad):
+                    self.assertEqual(self.client.get(reverse("employee_list"), {"cursor": bad}).status_code, 404)
+
+
+class ApiTests(TestCase):
+    """Field selection, validation and conditional GET on the JSON API."""
+
+    def setUp(self):
+        self.admin = Employee.objects.create_superuser(email="admin@example.com", password="x")
+        self.alice = make_employee("alice@example.com")
+        self.task = make_task(self.alice)
+        self.client.force_login(self.admin)
+
+    def test_fields_and_paging(self):
+        response = self.client.get(reverse("api_employee_list"), {"fields": "id,full_name", "limit": 1})
+        data = response.json()
+        self.assertEqual(data["results"], [{"id": self.admin.pk, "full_name": self.admin.full_name}])
+        self.assertIsNone(data["previous"])
+        data = self.client.get(data["next"]).json()
+        self.assertEqual(data["results"], [{"id": self.alice.pk, "full_name": "Alice"}])
+        self.assertIsNone(data["next"])
+
+    def test_bad_parameters(self):
+        for params in ({"limit": "ten"}, {"limit": "1.5"}, {"fields": "id,password"}):
+            with self.subTest(params=params):
+                response = self.client.get(reverse("api_employee_list"), params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.json())
+
+    def test_if_none_match(self):
+        url = reverse("api_employee_list")
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        self.alice.full_name = "Alice Renamed"
+        self.alice.save()
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_if_none_match_follows_related_rows(self):
+        url = reverse("api_task_detail", args=[self.task.pk]) + "?fields=id,assigned_to_name"
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 304)
+        Employee.objects.filter(pk=self.alice.pk).update(updated_at=timezone.now() + timedelta(seconds=5))
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 200)
+
+    def test_if_modified_since(self):
+        url = reverse("api_employee_detail", args=[self.alice.pk])
+        last_modified = self.client.get(url)["Last-Modified"]
+        self.assertEqual(self.client.get(url, headers={"if-modified-since": last_modified}).status_code, 304)
+        Employee.objects.filter(pk=self.alice.pk).update(updated_at=timezone.now() + timedelta(seconds=5))
+        self.assertEqual(self.client.get(url, headers={"if-modified-since": last_modified}).status_code, 200)
+
+    def test_non_staff_see_only_their_rows(self):
+        self.client.force_login(self.alice)
+        data = self.client.get(reverse("api_employee_list"), {"fields": "id"}).json()
+        self.assertEqual(data["results"], [{"id": self.alice.pk}])
+        response = self.client.get(reverse("api_employee_detail", args=[self.admin.pk]))
+        self.assertEqual(response.status_code, 404)
+
+
+class AttendanceWriterTests(TestCase):
+    """The swipe buffer, flushed by hand rather than by its thread."""
+
+    def setUp(self):
+        self.alice = make_employee("alice@example.com")
+        self.writer = AttendanceWriter(max_attempts=2)
+        self.writer.threaded = False
+
+    def swipe(self, day, hour, minute, kind):
+        self.writer.record(self.alice.pk, datetime(2026, 3, day, hour, minute, 0, 250), kind)
+
+    def times(self):
+        return list(
+            Attendance.objects.filter(employee=self.alice).order_by("date").values_list("date", "check_in", "check_out")
+        )
+
+    def test_swipes_are_coalesced(self):
+        self.swipe(2, 9, 5, "check_in")
+        self.swipe(2, 8, 55, "check_in")
+        self.swipe(2, 17, 0, "check_out")
+        self.swipe(2, 16, 0, "check_out")
+        self.swipe(3, 9, 0, "check_in")
+        self.assertEqual(self.writer.pending(), 2)
+        self.assertEqual(self.writer.flush(), 2)
+        self.assertIsNone(self.writer._thread)
+        self.assertEqual(self.times(), [
+            (date(2026, 3, 2), time(8, 55), time(17, 0)),
+            (date(2026, 3, 3), time(9, 0), None),
+        ])
+
+    def test_later_flushes_merge_with_stored_times(self):
+        self.swipe(2, 8, 55, "check_in")
+        self.writer.flush()
+        self.swipe(2, 9, 30, "check_in")
+        self.swipe(2, 17, 0, "check_out")
+        self.writer.flush()
+        self.swipe(2, 12, 0, "check_out")
+        self.writer.flush()
+        self.assertEqual(self.times(), [(date(2026, 3, 2), time(8, 55), time(17, 0))])
+        self.assertEqual(Attendance.objects.get(employee=self.alice).status, "Present")
+
+    def test_failed_flush_is_retried(self):
+        self.swipe(2, 9, 0, "check_in")
+        with mock.patch("employee.attendance._upsert", side_effect=DatabaseError("down")):
+            with self.assertLogs("employee.attendance", "WARNING"):
+                self.assertEqual(self.writer.flush(), 0)
+        self.assertEqual(self.writer.pending(), 1)
+
+        # A swipe made meanwhile is merged with the one put back
+        self.swipe(2, 8, 45, "check_in")
+        self.assertEqual(self.writer.flush(), 1)
+        self.assertEqual(self.writer.pending(), 0)
+        self.assertEqual(self.times(), [(date(2026, 3, 2), time(8, 45), None)])
+
+    def test_swipe_dropped_after_max_attempts(self):
+        self.swipe(2, 9, 0, "check_in")
+        with mock.patch("employee.attendance._upsert", side_effect=DatabaseError("down")):
+            with self.assertLogs("employee.attendance", "WARNING"):
+                self.writer.flush()
+            self.assertEqual(self.writer.pending(), 1)
+            with self.assertLogs("employee.attendance", "ERROR"):
+                self.writer.flush()
+        self.assertEqual(self.writer.pending(), 0)
+        self.assertEqual(self.writer.flush(), 0)
+        self.assertFalse(Attendance.objects.exists())
+
+
+class AttendanceSwipeTests(TestCase):
+    """Swipes posted by staff on behalf of others."""
+
+    def setUp(self):
+        self.admin = Employee.objects.create_superuser(email="admin@example.com", password="x")
+        self.alice = make_employee("alice@example.com")
+        self.client.force_login(self.admin)
+        patcher = mock.patch.object(attendance.writer, "record")
+        self.record = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, swipes):
+        return self.client.post(reverse("attendance_check_in"), {"swipes": swipes}, content_type="application/json")
+
+    def test_swipes_queued(self):
+        response = self.post([
+            {"employee_id": self.alice.employee_id, "timestamp": "2026-03-02T08:55:00"},
+            {"employee_id": "NOBODY"},
+        ])
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {"accepted": 1, "unknown": ["NOBODY"]})
+        [(args, _)] = self.record.call_args_list
+        self.assertEqual(args[0], self.alice.pk)
+        self.assertEqual(args[1].replace(tzinfo=None), datetime(2026, 3, 2, 8, 55))
+
+    def test_bad_swipes_rejected(self):
+        for swipe in (
+            {"employee_id": self.alice.employee_id, "timestamp": "2025-02-30T10:00"},
+            {"employee_id": self.alice.employee_id, "timestamp": "yesterday"},
+            {"employee_id": ["EMP0001"]},
+            {"employee_id": {"id": 1}},
+            {},
+        ):
+            with self.subTest(swipe=swipe):
+                response = self.post([swipe])
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.json())
+        self.record.assert_not_called()
+
+
+class AttendanceRollupTests(TestCase):
+    """Monthly summaries; March 2026 starts on a Sunday."""
+
+    def setUp(self):
+        self.alice = make_employee("alice@example.com", employment_date=date(2026, 1, 5))
+        # Joins in the second week, so the first week isn't held against them
+        self.bob = make_employee("bob@example.com", employment_date=date(2026, 3, 9))
+        Attendance.objects.bulk_create([
+            Attendance(employee=self.alice, date=date(2026, 3, 2), check_in=time(8, 30), check_out=time(17, 0)),
+            # Late
+            Attendance(employee=self.alice, date=date(2026, 3, 3), check_in=time(9, 30), check_out=time(17, 30)),
+            # A Saturday: present, but it doesn't make up for a missed weekday
+            Attendance(employee=self.alice, date=date(2026, 3, 7), check_in=time(8, 50)),
+        ])
+        leave = LeaveRequest.objects.create(
+            employee=self.alice, start_date=date(2026, 3, 4), end_date=date(2026, 3, 5), reason="r",
+        )
+        leaves.bulk_set_status([leave.pk], "approve")
+
+    def summary(self, employee):
+        return AttendanceMonthlySummary.objects.values(
+            "days_present", "days_absent", "days_on_leave", "late_arrivals", "total_hours",
+        ).get(employee=employee, month=date(2026, 3, 1))
+
+    def test_rollup(self):
+        attendance_rollup.rollup(full=True, today=date(2026, 3, 11))
+        # Working days up to the 10th: 2-6, 9, 10; accounted for: 2, 3 and leave on 4, 5
+        self.assertEqual(self.summary(self.alice), {
+            "days_present": 3, "days_absent": 3, "days_on_leave": 2, "late_arrivals": 1,
+            "total_hours": Decimal("16.50"),
+        })
+        self.assertEqual(self.summary(self.bob), {
+            "days_present": 0, "days_absent": 2, "days_on_leave": 0, "late_arrivals": 0,
+            "total_hours": Decimal("0.00"),
+        })
+
+    def test_today_is_not_absent_yet(self):
+        month = date(2026, 3, 1)
+        alice, bob = attendance_rollup.summarize(month, [self.alice.pk, self.bob.pk], timezone.now(), date(2026, 3, 9))
+        self.assertEqual((alice.days_absent, bob.days_absent), (1, 0))
+
+    def test_working_days(self):
+        self.assertEqual(attendance_rollup.working_days(date(2026, 3, 1), date(2026, 3, 31)), 22)
+        self.assertEqual(attendance_rollup.working_days(date(2026, 3, 9), date(2026, 3, 8)), 0)
+
+
+class OverdueSweepTests(TestCase):
+    """overdue.sweep() flags late tasks and keeps Employee.overdue_task_count in step."""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.alice = make_employee("alice@example.com")
+        self.bob = make_employee("bob@example.com")
+        self.late = make_task(self.alice, days=1)
+        self.later = make_task(self.alice, days=10)
+        self.bobs = make_task(self.bob, days=1)
+
+    def sweep(self, days, **kwargs):
+        return overdue.sweep(self.today + timedelta(days=days), **kwargs)
+
+    def states(self):
+        return dict(Task.objects.values_list("id", "overdue_state"))
+
+    def overdue_counts(self):
+        return [Employee.objects.get(pk=employee.pk).overdue_task_count for employee in (self.alice, self.bob)]
+
+    def test_flags_follow_the_deadline(self):
+        self.assertEqual(self.sweep(1), {"escalated": 0, "overdue": 0, "cleared": 0})
+        self.assertEqual(self.sweep(2), {"escalated": 0, "overdue": 2, "cleared": 0})
+        self.assertEqual(self.states(), {self.late.pk: "overdue", self.later.pk: "", self.bobs.pk: "overdue"})
+        self.assertEqual(self.overdue_counts(), [1, 1])
+
+        # Past the grace period the same tasks escalate; a repeat sweep changes nothing
+        self.assertEqual(self.sweep(5, chunk_size=1), {"escalated": 2, "overdue": 0, "cleared": 0})
+        self.assertEqual(self.sweep(5), {"escalated": 0, "overdue": 0, "cleared": 0})
+        self.assertEqual(self.states()[self.late.pk], "escalated")
+        self.assertEqual(self.overdue_counts(), [1, 1])
+
+    def test_completion_clears_the_flag(self):
+        self.sweep(2)
+        self.late.complete = True
+        self.late.save(update_fields=["complete", "updated_at"])
+        self.assertEqual(self.sweep(2), {"escalated": 0, "overdue": 0, "cleared": 1})
+        self.assertEqual(self.states()[self.late.pk], "")
+        self.assertEqual(self.overdue_counts(), [0, 1])
+
+    def test_rescheduling_clears_the_flag(self):
+        self.sweep(2)
+        Task.objects.filter(pk=self.bobs.pk).update(deadline=self.today + timedelta(days=30))
+        self.assertEqual(self.sweep(2)["cleared"], 1)
+        self.assertEqual(self.overdue_counts(), [1, 0])
+
+    def test_reassignment_moves_the_count(self):
+        self.sweep(2)
+        task = Task.objects.get(pk=self.bobs.pk)
+        task.assigned_to = self.alice
+        task.save()
+        self.assertEqual(self.sweep(2), {"escalated": 0, "overdue": 0, "cleared": 0})
+        self.assertEqual(self.overdue_counts(), [2, 0])
+
+    def test_deleted_tasks_leave_the_count(self):
+        self.sweep(2)
+        self.bobs.delete()
+        self.sweep(2)
+        self.assertEqual(self.overdue_counts(), [1, 0])
+
+
+class EmployeeImportTests(TestCase):
+    """Bad rows are reported by line number; the good rows around them are still imported."""
+
+    def setUp(self):
+        make_employee("taken@example.com")
+
+    def test_csv(self):
+        stream = io.StringIO(
+            "full_name,email,gender,date_of_birth,department,position,password\n"
+            "Ann,ann@example.com,female,1990-01-01,sales,developer,secretpw1\n"
+            "Bad Email,not-an-email,male,1990-01-01,sales,developer,\n"
+            "Bad Date,date@example.com,Male,1990-13-01,sales,developer,\n"
+            "Ann Again,ANN@example.com,female,1990-01-01,sales,developer,\n"
+            "Taken,Taken@Example.com,male,1990-01-01,sales,developer,\n"
+            "Ben,ben@example.com,MALE,1991-02-03,Sales,Developer,\n"
+        )
+        result = importer.import_employees(stream, "csv", batch_size=2, hash_workers=0)
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual([line for line, _ in result.errors], [3, 4, 5, 6])
+        messages = dict(result.errors)
+        self.assertTrue(messages[3].startswith("email:"))
+        self.assertTrue(messages[4].startswith("date_of_birth:"))
+        self.assertEqual(messages[5], "email: duplicated earlier in the file")
+        self.assertEqual(messages[6], "email: an employee with this email already exists")
+
+        ann = Employee.objects.get(email="ann@example.com")
+        self.assertTrue(ann.check_password("secretpw1"))
+        self.assertFalse(Employee.objects.get(email="ben@example.com").has_usable_password())
+        self.assertEqual(DepartmentStats.objects.get(department="sales").headcount, 3)
+
+    def test_jsonl(self):
+        stream = io.StringIO(
+            '{"full_name": "Ann", "email": "ann@example.com", "gender": "female", "date_of_birth": "1990-01-01"}\n'
+            "{not json\n"
+            "\n"
+            '["a", "list"]\n'
+            '{"full_name": "Ben", "email": "ben@example.com", "gender": "male", "date_of_birth": "1991-02-03"}\n'
+        )
+        result = importer.import_employees(stream, "jsonl", hash_workers=0)
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual([line for line, _ in result.errors], [2, 4])
+        self.assertTrue(result.errors[0][1].startswith("invalid JSON"))
+        self.assertEqual(
+            set(Employee.objects.values_list("email", flat=True)),
+            {"taken@example.com", "ann@example.com", "ben@example.com"},
+        )
+
+
+class SeedPerfDataCommandTests(TestCase):
+    """seed_perf_data's production guard and account passwords."""
+
+    def seed(self, **options):
+        call_command("seed_perf_data", employees=3, attendance_days=1, stdout=io.StringIO(), **options)
+        return Employee.objects.get(email=perfdata.PERF_ADMIN_EMAIL)
+
+    def test_refuses_without_debug(self):
+        with self.assertRaisesMessage(CommandError, "--force"):
+            self.seed()
+        self.assertFalse(Employee.objects.exists())
+
+    @override_settings(DEBUG=True)
+    def test_password_from_option(self):
+        self.assertTrue(self.seed(password="from-option").check_password("from-option"))
+
+    def test_password_from_environment(self):
+        with mock.patch.dict(os.environ, {"PERF_PASSWORD": "from-env"}):
+            admin = self.seed(force=True)
+        self.assertTrue(admin.check_password("from-env"))
+
+    @override_settings(DEBUG=True)
+    def test_no_password_means_no_login(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop("PERF_PASSWORD", None)
+            self.assertFalse(self.seed().has_usable_password())
+
+
+class InMemorySearchTests(TestCase):
+    """Ranking and capping in the search backend used on SQLite."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.exact = make_employee("ann@example.com", full_name="Ann Smith")
+        cls.prefix = make_employee("anna@example.com", full_name="Annabel Jones", department="legal")
+        cls.substring = make_employee("joanne@example.com", full_name="Joanne Brown")
+        make_employee("bob@example.com", full_name="Bob Green")
+
+    def setUp(self):
+        self.backend = InMemorySearchBackend()
+
+    def ids(self, qs, q, limit=None):
+        return list(self.backend.search(qs, q, limit).values_list("id", flat=True))
+
+    def test_exact_words_rank_first(self):
+        self.assertEqual(self.ids(Employee.objects.all(), "ann"), [self.exact.pk, self.prefix.pk, self.substring.pk])
+        self.assertEqual(self.ids(Employee.objects.all(), "ann smi"), [self.exact.pk])
+        self.assertEqual(self.ids(Employee.objects.all(), "zed"), [])
+
+    def test_filters_apply_before_the_cap(self):
+        legal = Employee.objects.filter(department="legal")
+        self.assertEqual(self.ids(legal, "ann", limit=1), [self.prefix.pk])
+
+    def test_unfiltered_search_skips_the_prefilter(self):
+        self.ids(Employee.objects.all(), "ann")
+        # The data stamp, then the rows themselves
+        with self.assertNumQueries(2):
+            self.assertEqual(self.ids(Employee.objects.all(), "ann", limit=2), [self.exact.pk, self.prefix.pk])
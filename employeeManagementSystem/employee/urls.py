@@ -1,6 +1,6 @@
 from django.urls import path
 from . import views
-from .views import EmployeeLoginView, EmployeeLogoutView, RegisterEmployeeView, DashboardView, TaskCreate, LeaveRequestCreateView, ApproveLeaveRequestView, update_leave_status, CompleteTaskView, EmployeeDetailView, EmployeeListView, export_employees_csv, DeleteEmployeeView, UpdateEmployeeView, ExportEmployeesPDFView, AdminAnalyticsView
+from .views import EmployeeLoginView, EmployeeLogoutView, RegisterEmployeeView, DashboardView, TaskCreate, EmployeeAutocompleteView, BulkAssignTaskView, LeaveRequestCreateView, ApproveLeaveRequestView, update_leave_status, BulkLeaveStatusView, CompleteTaskView, EmployeeDetailView, EmployeeListView, export_employees_csv, ImportEmployeesView, DeleteEmployeeView, UpdateEmployeeView, ExportEmployeesPDFView, ExportEmployeesPDFStatusView, ExportEmployeesPDFDownloadView, AdminAnalyticsView, MetricsView, AttendanceSwipeView, AttendanceReportView, ApiListView, ApiDetailView
 
 urlpatterns = [
     path('', DashboardView.as_view(), name='dashboard'),
@@ -9,16 +9,35 @@ urlpatterns = [
     path('register/', RegisterEmployeeView.as_view(), name='register'),
     path('task/<int:task_id>/complete/', CompleteTaskView.as_view(), name='complete_task'),
     path('task-create/', TaskCreate.as_view(), name='create_task'),
+    path('task-assign/', BulkAssignTaskView.as_view(), name='bulk_assign_task'),
+    path('employees/autocomplete/', EmployeeAutocompleteView.as_view(), name='employee_autocomplete'),
     path('leave-request/', LeaveRequestCreateView.as_view(), name='leave_request'),
     path('leave-approval/', ApproveLeaveRequestView.as_view(), name='leave_approve'),
     path("leave/<int:pk>/<str:action>/", update_leave_status, name="update-leave"),
+    path("leave/bulk/", BulkLeaveStatusView.as_view(), name="bulk-update-leave"),
     path('employee/<int:pk>/', EmployeeDetailView.as_view(), name='employee_detail'),
     path('employees/', EmployeeListView.as_view(), name='employee_list'),
     path('export-employees/', views.export_employees_csv, name='export_employees_csv'),
+    path('import-employees/', ImportEmployeesView.as_view(), name='import_employees'),
     path('employee/<int:pk>/delete/', DeleteEmployeeView.as_view(), name='delete_employee'),
     path('employee/<int:pk>/update/', UpdateEmployeeView.as_view(), name='update_employee'),
     path("export/pdf/", ExportEmployeesPDFView.as_view(), name="export_pdf"),
+    path("export/pdf/<slug:job_id>/", ExportEmployeesPDFStatusView.as_view(), name="export_pdf_status"),
+    path("export/pdf/<slug:job_id>/download/", ExportEmployeesPDFDownloadView.as_view(), name="export_pdf_download"),
     path("analytics/", AdminAnalyticsView.as_view(), name="analytics"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    path("api/attendance/check-in/", AttendanceSwipeView.as_view(kind="check_in"), name="attendance_check_in"),
+    path("api/attendance/check-out/", AttendanceSwipeView.as_view(kind="check_out"), name="attendance_check_out"),
+    path("attendance/report/", AttendanceReportView.as_view(), name="attendance_report"),
+    path("attendance/report/csv/", views.export_attendance_report_csv, name="attendance_report_csv"),
+    path("api/employees/", ApiListView.as_view(resource="employees"), name="api_employee_list"),
+    path("api/employees/<int:pk>/", ApiDetailView.as_view(resource="employees"), name="api_employee_detail"),
+    path("api/tasks/", ApiListView.as_view(resource="tasks"), name="api_task_list"),
+    path("api/tasks/<int:pk>/", ApiDetailView.as_view(resource="tasks"), name="api_task_detail"),
+    path("api/leave-requests/", ApiListView.as_view(resource="leave-requests"), name="api_leave_list"),
+    path("api/leave-requests/<int:pk>/", ApiDetailView.as_view(resource="leave-requests"), name="api_leave_detail"),
+    path("api/attendance/", ApiListView.as_view(resource="attendance"), name="api_attendance_list"),
+    path("api/attendance/<int:pk>/", ApiDetailView.as_view(resource="attendance"), name="api_attendance_detail"),
 
 
 
@@ -1,26 +1,34 @@
 from django.shortcuts import render, redirect
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from .models import Employee, Task, LeaveRequest
+from .models import Employee, Task, LeaveRequest, DepartmentStats, AttendanceMonthlySummary
 from django.contrib.auth import login, logout
-from django.contrib.auth.views import LoginView
-from django.urls import reverse_lazy
+from django.contrib.auth.views import LoginView, redirect_to_login
+from django.urls import reverse, reverse_lazy
 from django.views.generic.edit import CreateView, UpdateView, DeleteView, FormView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.views.decorators.http import require_POST
 from django.shortcuts import get_object_or_404
 from django.views.generic.list import ListView
-from django.views.generic.detail import DetailView
-from .forms import EmployeeCreationForm, LeaveRequestForm, TaskForm
-from datetime import date, timedelta
+from .forms import BulkTaskAssignmentForm, EmployeeCreationForm, EmployeeImportForm, LeaveRequestForm, TaskForm
+from datetime import date, datetime, timedelta
 from django.views import View
-from django.http import HttpResponse, HttpResponseForbidden
-from django.db.models import Q
+from django.http import HttpResponse, HttpResponseForbidden, StreamingHttpResponse, FileResponse, JsonResponse, Http404
+from django.db.models import Q, Sum
 import csv
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from django.views.generic import TemplateView
-from django.db.models import Count
+import itertools
+from . import analytics, api, assignment, attendance, attendance_rollup, dashboard, importer, leaves, metrics, profiles, reports
+import json
+import io
+from .search import get_search_backend
+from .pagination import KeysetPaginationMixin, akeyset_page
+from django.views.generic.base import ContextMixin, TemplateResponseMixin
+from asgiref.sync import sync_to_async
+import asyncio
+from .aio import alist
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import urlencode
 
 
 # Create your views here.
@@ -36,6 +44,22 @@ class AdminOnlyMixin(UserPassesTestMixin):
         # Custom redirect or message
         return redirect('dashboard')
     
+class AsyncLoginRequiredMixin:
+    """LoginRequiredMixin for async views; with `admin_only`, also AdminOnlyMixin.
+
+    request.user would load the user synchronously, so it is resolved once with
+    auser() and pinned on the request for the templates.
+    """
+    admin_only = False
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        if self.admin_only and not user.is_superuser:
+            return redirect('dashboard')
+        return await super().dispatch(request, *args, **kwargs)
+
 class EmployeeLoginView(LoginView):
     template_name = 'employee/login.html'
     fields = '__all__'
@@ -79,68 +103,66 @@ class UpdateEmployeeView(LoginRequiredMixin, AdminOnlyMixin, UpdateView):
 
     
 
-class DashboardView(LoginRequiredMixin, ListView):
-    # Dashboard primarily lists Tasks; leave requests are added to context
-    model = Task
+class DashboardView(AsyncLoginRequiredMixin, TemplateResponseMixin, ContextMixin, View):
     template_name = 'employee/dashboard.html'
-    context_object_name = 'tasks'
-
-    def get_queryset(self):
-        today = timezone.now().date()
-        return Task.objects.filter(
-            assigned_to=self.request.user,
-            complete=False,
-            deadline__gte=today
-        ).order_by('deadline')
-        
-    def get_context_data(self, **kwargs):
-        today = timezone.now().date()
-        grace_period = today - timedelta(days=3)
-        expired_rejected_cutoff = timezone.now() - timedelta(days=3)
-        ctx = super().get_context_data(**kwargs)
-        ctx['leave_requests'] = LeaveRequest.objects.filter(
-            employee=self.request.user
-        )
-        ctx['overdue_tasks'] = Task.objects.filter(
-            assigned_to=self.request.user,
-            complete=False,
-            deadline__lt=today,
-            deadline__gte=grace_period
-        )
-        
-        # ctx['active_leaves'] = LeaveRequest.objects.filter(
-        #     employee=self.request.user,
-        #     status='Approved',
-        #     end_date__gte=today
-        # )
-
-        # All visible leaves (exclude expired rejected ones)
-        ctx['leave_requests'] = LeaveRequest.objects.filter(
-            employee=self.request.user
-        ).exclude(
-            Q(status='Rejected') & Q(updated_at__lt=expired_rejected_cutoff)
-        )
-
-        # Recently rejected (for alert banner)
-        ctx['recent_rejected_leaves'] = LeaveRequest.objects.filter(
-            employee=self.request.user,
-            status='Rejected',
-            updated_at__gte=expired_rejected_cutoff
-        )
+    query_budget = 4
 
-        return ctx
+    async def get(self, request):
+        # tasks, overdue_tasks, leave_requests and recent_rejected_leaves; see employee.dashboard
+        return self.render_to_response(self.get_context_data(**await dashboard.aload_dashboard(request.user)))
 
 
 class TaskCreate(AdminOnlyMixin, LoginRequiredMixin, CreateView):
     model = Task
     template_name = 'employee/task_create.html'
-    fields = ['title', 'description', 'deadline', 'assigned_to']
+    # The assignee picker loads employees on demand from EmployeeAutocompleteView
+    form_class = TaskForm
     success_url = reverse_lazy('dashboard')
+    query_budget = 12
 
-    def get_form(self, form_class=None):
-        form = super().get_form(form_class)
-        form.fields['assigned_to'].queryset = Employee.objects.all()
-        return form
+
+class EmployeeAutocompleteView(LoginRequiredMixin, AdminOnlyMixin, View):
+    """Small ranked pages of employees for the assignee picker: ?q=<text>&page=<n>."""
+    per_page = 10
+    max_page = 10
+    query_budget = 4
+
+    def get(self, request):
+        q = request.GET.get("q", "").strip()
+        try:
+            page = min(max(int(request.GET.get("page", 1)), 1), self.max_page)
+        except ValueError:
+            page = 1
+        end = page * self.per_page + 1  # one extra row tells us whether there is a next page
+        qs = Employee.objects.values("id", "full_name", "employee_id", "department")
+        if q:
+            rows = get_search_backend().search(qs, q, limit=end)
+        else:
+            rows = qs.order_by("full_name", "id")[:end]
+        rows = list(rows)
+        results = [
+            {key: row[key] for key in ("id", "full_name", "employee_id", "department")}
+            for row in rows[end - self.per_page - 1:end - 1]
+        ]
+        # Pages past max_page aren't served, so don't offer one
+        more = len(rows) == end and page < self.max_page
+        return JsonResponse({"results": results, "page": page, "more": more})
+
+
+class BulkAssignTaskView(LoginRequiredMixin, AdminOnlyMixin, FormView):
+    """Assign a task to every member of a department, or spread copies of it by load."""
+    template_name = 'employee/task_bulk_assign.html'
+    form_class = BulkTaskAssignmentForm
+
+    def form_valid(self, form):
+        data = dict(form.cleaned_data)
+        copies = data.pop('copies')
+        if copies:
+            department = data.pop('department')
+            result = assignment.schedule_tasks(department, [Task(**data) for _ in range(copies)])
+        else:
+            result = assignment.assign_to_department(**data)
+        return self.render_to_response(self.get_context_data(form=form, result=result))
 
 
 class CompleteTaskView(LoginRequiredMixin, View):
@@ -152,7 +174,8 @@ class CompleteTaskView(LoginRequiredMixin, View):
             return redirect('dashboard')   # or raise PermissionDenied
 
         task.complete = True
-        task.save()
+        # Completing never adds an active task, so skip full_clean and the capacity check
+        task.save(update_fields=['complete', 'updated_at'])
 
         return redirect('dashboard')
 
@@ -185,10 +208,24 @@ class LeaveRequestCreateView(LoginRequiredMixin, CreateView):
         form.instance.employee = self.request.user
         return super().form_valid(form)
 
-class ApproveLeaveRequestView(LoginRequiredMixin, AdminOnlyMixin, ListView):
+class ApproveLeaveRequestView(LoginRequiredMixin, AdminOnlyMixin, KeysetPaginationMixin, ListView):
     model = LeaveRequest
     template_name = 'employee/leave_approval.html'
     context_object_name = 'leave_requests'
+    paginate_by = 25
+    ordering = ['-applied_on', '-id']
+    query_budget = 4
+
+    def get_queryset(self):
+        # The template shows req.employee.full_name; join it instead of a query per row
+        qs = super().get_queryset().select_related('employee').only(
+            'id', 'leave_type', 'start_date', 'end_date', 'reason', 'status', 'applied_on',
+            'employee__id', 'employee__full_name',
+        )
+        status = self.request.GET.get('status')
+        if status in dict(LeaveRequest.STATUS_CHOICES):
+            qs = qs.filter(status=status)
+        return qs
 
 def update_leave_status(request, pk, action):
     leave_request = get_object_or_404(LeaveRequest, pk=pk)
@@ -205,112 +242,398 @@ def update_leave_status(request, pk, action):
     leave_request.save()
     return redirect("leave_approve")    
 
-class EmployeeDetailView(AdminOnlyMixin, DetailView):
-    model = Employee
+class BulkLeaveStatusView(LoginRequiredMixin, View):
+    """Approve or reject many leave requests at once.
+
+    Accepts the approval page's form (`ids` checkboxes plus `action`) or a JSON
+    body {"ids": [...], "action": "approve" | "reject"}; JSON callers get the
+    outcome for every ID back.
+    """
+    max_ids = 1000
+
+    def post(self, request):
+        if not (request.user.is_staff or request.user.is_superuser):
+            return HttpResponseForbidden()
+
+        is_json = request.content_type == "application/json"
+        if is_json:
+            try:
+                payload = json.loads(request.body or b"{}")
+                ids, action = payload.get("ids"), payload.get("action")
+            except (ValueError, AttributeError):
+                return JsonResponse({"error": "Body must be a JSON object"}, status=400)
+        else:
+            ids, action = request.POST.getlist("ids"), request.POST.get("action")
+
+        if action not in leaves.LEAVE_ACTIONS:
+            return self.error(request, is_json, "action must be 'approve' or 'reject'")
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            return self.error(request, is_json, "ids must be a list of integers")
+        if len(ids) > self.max_ids:
+            return self.error(request, is_json, f"At most {self.max_ids} ids per request")
+
+        outcomes = leaves.bulk_set_status(ids, action) if ids else {}
+        if not is_json:
+            done = sum(outcome == leaves.LEAVE_OUTCOMES[action] for outcome in outcomes.values())
+            if done:
+                messages.success(request, f"{leaves.LEAVE_OUTCOMES[action].capitalize()} {done} leave request(s).")
+            return self.back_to_list(request)
+        return JsonResponse({"results": {str(pk): outcome for pk, outcome in sorted(outcomes.items())}})
+
+    def error(self, request, is_json, message):
+        if is_json:
+            return JsonResponse({"error": message}, status=400)
+        messages.error(request, message)
+        return self.back_to_list(request)
+
+    def back_to_list(self, request):
+        # Back to the approval page with the status filter it was posted from
+        url = reverse("leave_approve")
+        status = request.POST.get("status")
+        if status in dict(LeaveRequest.STATUS_CHOICES):
+            url += "?" + urlencode({"status": status})
+        return redirect(url)
+
+class EmployeeDetailView(AsyncLoginRequiredMixin, TemplateResponseMixin, ContextMixin, View):
+    admin_only = True
     template_name = 'employee/employee_detail.html'
-    context_object_name = 'employee'
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        employee = self.get_object()
-
-        context['tasks'] = employee.assigned_tasks.all()
-        context['completed_tasks'] = employee.assigned_tasks.filter(complete=True).count()
-        context['leave_requests'] = employee.leave_requests.all()
-
-        return context
-
-class EmployeeListView(LoginRequiredMixin, AdminOnlyMixin, ListView):
-    model = Employee
+    tasks_per_page = 20
+    query_budget = 5
+
+    @staticmethod
+    def task_queryset(pk):
+        return Task.objects.filter(assigned_to_id=pk).order_by('complete', 'deadline', 'id')
+
+    async def get(self, request, pk):
+        # Profile fields, task counts and leaves come from the profile cache;
+        # only the current page of tasks is read live
+        tasks = self.task_queryset(pk)
+        profile, task_page = await asyncio.gather(
+            profiles.aload_profile(pk),
+            akeyset_page(tasks, self.tasks_per_page, request.GET.get('tasks_cursor')),
+        )
+        if profile is None:
+            raise Http404("No employee found matching the query")
+
+        return self.render_to_response(self.get_context_data(
+            employee=profile.employee,
+            object=profile.employee,
+            profile=profile,
+            task_page=task_page,
+            tasks=task_page.object_list,
+            task_count=profile.task_count,
+            completed_tasks=profile.completed_tasks,
+            leave_requests=profile.leave_requests,
+        ))
+
+class EmployeeListView(AsyncLoginRequiredMixin, TemplateResponseMixin, ContextMixin, View):
+    admin_only = True
     template_name = 'employee/employee_list.html'
-    context_object_name = 'employees'
-
-    def get_queryset(self):
-        qs = super().get_queryset()
-        q = self.request.GET.get("q")
-
-        if q:
-            qs = qs.filter(
-                Q(full_name__icontains=q) |
-                Q(email__icontains=q) |
-                Q(department__icontains=q)
-            )
-        department = self.request.GET.get("department")
-        if department and department != "all":
-            qs = qs.filter(department=department)
-
-        return qs
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        ctx["departments"] = Employee.objects.values_list("department", flat=True).distinct()
-        return ctx
+    paginate_by = 25
+    ordering = ['full_name', 'id']
+    query_budget = 6
+
+    async def get(self, request):
+        # The in-memory search backend may read the database while filtering
+        employees = await sync_to_async(filter_employees)(Employee.objects.order_by(*self.ordering), request.GET)
+        page, departments = await asyncio.gather(
+            akeyset_page(employees, self.paginate_by, request.GET.get('cursor')),
+            alist(DepartmentStats.objects.filter(headcount__gt=0).values_list("department", flat=True)),
+        )
+        return self.render_to_response(self.get_context_data(
+            employees=page.object_list,
+            object_list=page.object_list,
+            page_obj=page,
+            is_paginated=page.has_other_pages(),
+            departments=departments,
+        ))
+
+
+CSV_HEADER = ["Full Name", "Email", "Gender", "Date of Birth", "Employment date", "Phone number", "Address", "ID", "Department", "Position", "Salary", "Currency"]
+CSV_FIELDS = (
+    "full_name",
+    "email",
+    "gender",
+    "date_of_birth",
+    "employment_date",
+    "phone_number",
+    "address",
+    "employee_id",
+    "department",
+    "position",
+    "salary",
+    "salary_currency",
+)
+# Rows fetched per round trip; on Postgres this is the server-side cursor size.
+CSV_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose write() hands the value back instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def filter_employees(qs, params):
+    """Apply the `department` filter and ranked `q` search used by the employee list and exports."""
+    department = params.get("department")
+    if department and department != "all":
+        qs = qs.filter(department=department)
+    q = params.get("q", "").strip()
+    if q:
+        qs = get_search_backend().search(qs, q)
+    return qs
+
+
+def iter_employee_csv_rows(qs):
+    # Read plain tuples instead of model instances so memory stays flat
+    position_labels = dict(Employee.POSITION_CHOICES)
+    position_index = CSV_FIELDS.index("position")
+    salary_index = CSV_FIELDS.index("salary")
+
+    yield CSV_HEADER
+    rows = qs.order_by("id").values_list(*CSV_FIELDS).iterator(chunk_size=CSV_CHUNK_SIZE)
+    for row in rows:
+        row = list(row)
+        # Human-readable choice label, same as get_position_display()
+        row[position_index] = position_labels.get(row[position_index], row[position_index])
+        row[salary_index] = f"{row[salary_index]:,.2f}"
+        yield row
 
 
 def export_employees_csv(request):
     if not request.user.is_superuser:
         return redirect("dashboard")
-    response = HttpResponse(content_type="text/csv")
+    qs = filter_employees(Employee.objects.all(), request.GET)
+    writer = csv.writer(Echo())
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in iter_employee_csv_rows(qs)),
+        content_type="text/csv",
+    )
     response["Content-Disposition"] = 'attachment; filename="employees.csv"'
-    writer = csv.writer(response)
-    writer.writerow(["Full Name", "Email", "Gender", "Date of Birth", "Employment date", "Phone number", "Address", "ID", "Department", "Position", "Salary", "Currency"])
-    for emp in Employee.objects.all():
-        writer.writerow([
-            emp.full_name,
-            emp.email,
-            emp.gender,
-            emp.date_of_birth,
-            emp.employment_date,
-            emp.phone_number,
-            emp.address,
-            emp.employee_id,
-            emp.department,
-            emp.get_position_display(),  # Get human-readable choice label
-            f"{emp.salary:,.2f}",
-            emp.salary_currency,
-        ])
-
     return response
+
+class ImportEmployeesView(LoginRequiredMixin, AdminOnlyMixin, FormView):
+    template_name = 'employee/employee_import.html'
+    form_class = EmployeeImportForm
+
+    def form_valid(self, form):
+        upload = form.cleaned_data['file']
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        # Hash in-process: a web worker shouldn't fork a process pool per upload
+        result = importer.import_employees(stream, importer.detect_format(upload.name), hash_workers=0)
+        return self.render_to_response(self.get_context_data(form=EmployeeImportForm(), result=result))
+
+
 class ExportEmployeesPDFView(LoginRequiredMixin, AdminOnlyMixin, View):
+    """Start (or reuse) a background render of the employee report and point at its status."""
+
     def get(self, request):
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="employees.pdf"'
+        job_id = reports.request_employee_report()
+        return redirect("export_pdf_status", job_id=job_id)
+
+
+class ExportEmployeesPDFStatusView(LoginRequiredMixin, AdminOnlyMixin, View):
+    """JSON job status for pollers; browsers get a page that polls it and starts the download."""
+    template_name = "employee/export_pdf_status.html"
+
+    def get(self, request, job_id):
+        status = reports.job_status(job_id)
+        if status == "missing" and job_id == reports.request_employee_report():
+            # Job was started by another worker process; render it here too
+            status = reports.job_status(job_id)
+        if status == "missing":
+            raise Http404("Unknown report")
+        data = {"job": job_id, "status": status}
+        if status == "ready":
+            data["download_url"] = reverse("export_pdf_download", args=[job_id])
+        if request.get_preferred_type(["application/json", "text/html"]) == "text/html":
+            return render(request, self.template_name, data)
+        return JsonResponse(data, status=200 if status == "ready" else 202)
+
+
+class ExportEmployeesPDFDownloadView(LoginRequiredMixin, AdminOnlyMixin, View):
+    def get(self, request, job_id):
+        if reports.job_status(job_id) != "ready":
+            raise Http404("Report is not ready")
+        try:
+            report = open(reports.report_path(job_id), "rb")
+        except FileNotFoundError:
+            # Replaced by a newer report since the status check
+            raise Http404("Report has expired")
+        return FileResponse(report, as_attachment=True, filename="employees.pdf", content_type="application/pdf")
+
+class AdminAnalyticsView(AsyncLoginRequiredMixin, TemplateResponseMixin, ContextMixin, View):
+    admin_only = True
+    template_name = "employee/analytics.html"
+    query_budget = 7
 
-        p = canvas.Canvas(response, pagesize=letter)
-        y = 750
+    async def get(self, request):
+        # Counters and breakdowns come from one cached snapshot; see employee.analytics
+        return self.render_to_response(self.get_context_data(**await analytics.aget_snapshot()))
 
-        employees = Employee.objects.all()
 
-        p.setFont("Helvetica-Bold", 14)
-        p.drawString(50, 770, "Employee Report")
-        p.setFont("Helvetica", 10)
+class MetricsView(LoginRequiredMixin, AdminOnlyMixin, View):
+    """Request metrics for this worker process in Prometheus text format."""
 
-        for emp in employees:
-            p.drawString(50, y, f"{emp.full_name} | {emp.email} | {emp.department} | {emp.salary:,.2f} {emp.salary_currency}")
-            y -= 20
-            if y < 50:
-                p.showPage()
-                y = 750
+    def get(self, request):
+        return HttpResponse(metrics.render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+class AttendanceSwipeView(LoginRequiredMixin, View):
+    """JSON check-in/check-out endpoint.
+
+    Employees swipe for themselves with an empty body. Staff (e.g. the badge
+    reader account) can post {"swipes": [{"employee_id": "EMP0001", "timestamp": "..."}]}.
+    Swipes are queued for the batching writer, hence 202 Accepted.
+    """
+    kind = None  # 'check_in' or 'check_out'
+    max_swipes = 1000
+
+    def post(self, request):
+        try:
+            payload = json.loads(request.body or b"{}")
+            swipes = payload.get("swipes")
+        except (ValueError, AttributeError):
+            return JsonResponse({"error": "Body must be a JSON object"}, status=400)
+
+        if swipes is None:
+            attendance.writer.record(request.user.pk, timezone.localtime(), self.kind)
+            return JsonResponse({"accepted": 1, "unknown": []}, status=202)
+
+        if not request.user.is_staff:
+            return JsonResponse({"error": "Only staff can record swipes for others"}, status=403)
+        if not isinstance(swipes, list) or len(swipes) > self.max_swipes:
+            return JsonResponse({"error": f"swipes must be a list of at most {self.max_swipes} items"}, status=400)
+
+        parsed = []
+        for swipe in swipes:
+            if not isinstance(swipe, dict) or not swipe.get("employee_id") or not isinstance(swipe["employee_id"], str):
+                return JsonResponse({"error": "Each swipe needs an employee_id"}, status=400)
+            when = timezone.now()
+            if swipe.get("timestamp"):
+                try:
+                    # None if malformed; ValueError if well-formed but not a real date
+                    when = parse_datetime(str(swipe["timestamp"]))
+                except ValueError:
+                    when = None
+                if when is None:
+                    return JsonResponse({"error": f"Bad timestamp: {swipe['timestamp']}"}, status=400)
+                if timezone.is_naive(when):
+                    when = timezone.make_aware(when)
+            parsed.append((swipe["employee_id"], timezone.localtime(when)))
+
+        # Resolve badge IDs to primary keys in one query
+        ids = dict(Employee.objects.filter(
+            employee_id__in={employee_id for employee_id, _ in parsed}
+        ).values_list("employee_id", "id"))
+        unknown = []
+        for employee_id, when in parsed:
+            if employee_id in ids:
+                attendance.writer.record(ids[employee_id], when, self.kind)
+            else:
+                unknown.append(employee_id)
+        return JsonResponse({"accepted": len(parsed) - len(unknown), "unknown": unknown}, status=202)
+
+
+class ApiListView(LoginRequiredMixin, View):
+    """Read-only JSON collection from employee.api: ?fields=, filters, ?cursor= and conditional GET."""
+    resource = None
+    query_budget = 4
 
-        p.save()
-        return response
+    def get(self, request):
+        try:
+            return api.list_response(request, api.RESOURCES[self.resource])
+        except api.ApiError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+
+
+class ApiDetailView(LoginRequiredMixin, View):
+    resource = None
+    query_budget = 4
+
+    def get(self, request, pk):
+        try:
+            return api.detail_response(request, api.RESOURCES[self.resource], pk)
+        except api.ApiError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+
+
+ATTENDANCE_CSV_HEADER = ["Employee ID", "Full Name", "Department", "Month", "Days Present", "Days Absent", "Days On Leave", "Late Arrivals", "Total Hours"]
+ATTENDANCE_CSV_FIELDS = (
+    "employee__employee_id",
+    "employee__full_name",
+    "employee__department",
+    "month",
+    "days_present",
+    "days_absent",
+    "days_on_leave",
+    "late_arrivals",
+    "total_hours",
+)
+
+
+def report_month(params):
+    """First day of the `month` (YYYY-MM) request parameter, defaulting to the current month."""
+    try:
+        return datetime.strptime(params.get("month", ""), "%Y-%m").date()
+    except ValueError:
+        return attendance_rollup.month_start(timezone.localdate())
+
+
+def filter_attendance_summaries(qs, params):
+    qs = qs.filter(month=report_month(params))
+    department = params.get("department")
+    if department and department != "all":
+        qs = qs.filter(employee__department=department)
+    return qs
+
+
+class AttendanceReportView(LoginRequiredMixin, AdminOnlyMixin, KeysetPaginationMixin, ListView):
+    """Monthly attendance per employee, read from the precomputed AttendanceMonthlySummary rows."""
+    model = AttendanceMonthlySummary
+    template_name = 'employee/attendance_report.html'
+    context_object_name = 'summaries'
+    paginate_by = 50
+    ordering = ['employee__full_name', 'id']
+    query_budget = 6
 
-class AdminAnalyticsView(LoginRequiredMixin, AdminOnlyMixin, TemplateView):
-    template_name = "employee/analytics.html"
+    def get_queryset(self):
+        qs = super().get_queryset().select_related('employee').only(
+            'month', 'days_present', 'days_absent', 'days_on_leave', 'late_arrivals', 'total_hours',
+            'employee__employee_id', 'employee__full_name', 'employee__department',
+        )
+        return filter_attendance_summaries(qs, self.request.GET)
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-
-        ctx["employee_count"] = Employee.objects.count()
-        ctx["active_tasks"] = Task.objects.filter(complete=False).count()
-        ctx["completed_tasks"] = Task.objects.filter(complete=True).count()
-        ctx["pending_leave"] = LeaveRequest.objects.filter(status="Pending").count()
-        ctx["approved_leave"] = LeaveRequest.objects.filter(status="Approved").count()
-
-        # For charts later:
-        ctx["department_distribution"] = (
-            Employee.objects.values("department")
-            .annotate(count=Count("id"))
-            .order_by("-count")
+        ctx["month"] = report_month(self.request.GET)
+        ctx["departments"] = (
+            DepartmentStats.objects.filter(headcount__gt=0).values_list("department", flat=True)
+        )
+        ctx["totals"] = filter_attendance_summaries(AttendanceMonthlySummary.objects.all(), self.request.GET).aggregate(
+            days_present=Sum("days_present"),
+            days_absent=Sum("days_absent"),
+            days_on_leave=Sum("days_on_leave"),
+            late_arrivals=Sum("late_arrivals"),
+            total_hours=Sum("total_hours"),
         )
-
         return ctx
+
+
+def export_attendance_report_csv(request):
+    if not request.user.is_superuser:
+        return redirect("dashboard")
+    month = report_month(request.GET)
+    qs = filter_attendance_summaries(AttendanceMonthlySummary.objects.all(), request.GET)
+    rows = qs.order_by("employee__full_name", "id").values_list(*ATTENDANCE_CSV_FIELDS).iterator(chunk_size=CSV_CHUNK_SIZE)
+    writer = csv.writer(Echo())
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in itertools.chain([ATTENDANCE_CSV_HEADER], rows)),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = f'attachment; filename="attendance-{month:%Y-%m}.csv"'
+    return response
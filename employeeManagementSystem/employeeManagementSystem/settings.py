@@ -63,8 +63,19 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'employee.querybudget.QueryBudgetMiddleware',
+    'employee.metrics.RequestMetricsMiddleware',
 ]
 
+# Views declare a `query_budget`; exceeding it raises when True (set it in tests),
+# otherwise it is logged. Defaults to DEBUG.
+QUERY_BUDGET_RAISE = DEBUG
+
+# Per-view request metrics, exposed to admins at /metrics/. Requests slower than
+# METRICS_SLOW_REQUEST_MS (None disables) are logged with their slowest SQL.
+METRICS_ENABLED = True
+METRICS_SLOW_REQUEST_MS = None
+
 ROOT_URLCONF = 'employeeManagementSystem.urls'
 
 TEMPLATES = [
@@ -152,9 +163,13 @@ MEDIA_ROOT = BASE_DIR / 'static/images'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Authentication configuration
+# ModelBackend with request.user served from the cache (see employee/backends.py)
 AUTHENTICATION_BACKENDS = [
-    'django.contrib.auth.backends.ModelBackend',
+    'employee.backends.CachedModelBackend',
 ]
+# Sessions live in a signed cookie, so reading one needs neither the database
+# nor a cache shared between workers. They only hold the login keys.
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
 
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = "/"